@@ -15,7 +15,11 @@ COVERS_DIR = Path("/config/temp/covers")
 LYRICS_DIR = Path("/config/temp/lyrics_raw")
 CACHE_DIR = Path("/config/cache")  # Cache directory 
 THUMBNAIL_CACHE_DIR = Path("/config/cache/thumbnails")  # Thumbnail cache
+YTDLP_META_CACHE_DIR = Path("/config/cache/ytdlp_meta")  # Per-video yt-dlp metadata
+DOWNLOAD_INDEX_DIR = Path("/config/cache/downloaded")  # video_id -> library file it was saved as
+COVER_CACHE_DIR = Path("/config/cache/covers")  # Downloaded covers by URL
 DB_PATH = Path("/config/db.sqlite")
+JOBS_WAKE_FIFO = Path("/config/jobs.wake")  # Named pipe written on enqueue to wake worker processes
 LOG_DIR = Path("/config/logs")
 MUSIC_DIR = Path("/data")
 
@@ -23,6 +27,9 @@ MUSIC_DIR = Path("/data")
 VITE_API_BASE = "http://localhost:8000/api"
 SEARCH_CACHE_TTL = 900
 THUMBNAIL_CACHE_TTL = 7 * 24 * 60 * 60  # 7 days for thumbnails
+YTDLP_META_CACHE_TTL = 24 * 60 * 60  # 1 day for yt-dlp metadata
+COVER_CACHE_TTL = 7 * 24 * 60 * 60  # 7 days before a cached cover is revalidated
+COVER_CACHE_MAX_BYTES = 256 * 1024 * 1024  # least recently used covers evicted beyond this
 YTM_MAX_CONC = 5
 YTM_BACKOFF_BASE = 0.5
 YTM_BACKOFF_MAX = 8.0
@@ -36,6 +43,7 @@ try:
 except Exception:
     # Fallback for initial import (before secrets module loads)
     JWT_SECRET_KEY = "TEMPORARY_KEY_WILL_BE_REPLACED"
+JWT_SECRET_BYTES = JWT_SECRET_KEY.encode("utf-8")
 JWT_ALGORITHM = "HS256"
 JWT_ACCESS_TOKEN_EXPIRE_MINUTES = 15
 JWT_REFRESH_TOKEN_EXPIRE_DAYS = 7
@@ -54,21 +62,39 @@ ROLE_MEMBER = "member"
 ROLE_VISITOR = "visitor"
 
 VALID_ROLES = [ROLE_ADMINISTRATOR, ROLE_MEMBER, ROLE_VISITOR]
+# Hashable sets for membership checks on the request path
+VALID_ROLES_SET = frozenset(VALID_ROLES)
+WRITE_ROLES = frozenset({ROLE_ADMINISTRATOR, ROLE_MEMBER})
 
 # yt-dlp
 YDL_FORMAT = "m4a/bestaudio/best"
 YDL_PREFERRED_CODEC = "m4a"
 YDL_COOKIEFILE = Path("/config/ytcookies.txt")
+YDL_CONCURRENT_FRAGMENTS = int(os.environ.get("YDL_CONCURRENT_FRAGMENTS", 8))
+YDL_HTTP_CHUNK_SIZE = int(os.environ.get("YDL_HTTP_CHUNK_SIZE", 10 * 1024 * 1024))  # bytes
+
+# Covers larger than this (px, longest side) are downscaled before embedding
+MAX_COVER_DIM = int(os.environ.get("YTMDL_MAX_COVER_DIM", "720"))
 
 # Server / docker
 PORT = int(os.environ.get("PORT", 8000))
 HOST = os.environ.get("HOST", "0.0.0.0")
 
 # Helper: ensure directories exist (call from startup)
+_DIRS_READY = False
+
+
 def ensure_dirs() -> None:
-    for p in (CONFIG_DIR, TEMP_DIR, DOWNLOAD_DIR, COVERS_DIR, LYRICS_DIR, LOG_DIR, MUSIC_DIR, CACHE_DIR, THUMBNAIL_CACHE_DIR):
+    """Create data directories once per process; later calls are no-ops."""
+    global _DIRS_READY
+    if _DIRS_READY:
+        return
+    ok = True
+    for p in (CONFIG_DIR, TEMP_DIR, DOWNLOAD_DIR, COVERS_DIR, LYRICS_DIR, LOG_DIR, MUSIC_DIR, CACHE_DIR, THUMBNAIL_CACHE_DIR, YTDLP_META_CACHE_DIR, COVER_CACHE_DIR):
         try:
             Path(p).mkdir(parents=True, exist_ok=True)
-        except Exception:
+        except OSError:
             # ignore failures here; callers should log if needed
-            pass
\ No newline at end of file
+            ok = False
+    # Only memoise a fully successful run so a later call can retry failures
+    _DIRS_READY = ok
\ No newline at end of file
@@ -4,15 +4,41 @@ SQLAlchemy engine & session management for the application.
 """
 
 from __future__ import annotations
+import json
+import logging
 import os
-from typing import Generator, Optional
+from typing import Any, Generator, List, Optional, Tuple, Union
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import Select, create_engine, event, func, select
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from .config import DB_PATH, ensure_dirs
-from .models import Base  # requires backend/models.py to define Base
+from .models import Base, SCHEMA_VERSION, index_ddl  # requires backend/models.py to define Base
+
+logger = logging.getLogger("db")
+
+# JSON columns (Job.payload/result, thumbnails, ...) go through orjson when
+# it is installed; the stdlib json module is the fallback
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    _HAS_ORJSON = False
+
+
+def _json_dumps(value: Any) -> str:
+    if _HAS_ORJSON:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits: let json decide
+    return json.dumps(value)
+
+
+def _json_loads(value: Union[str, bytes]) -> Any:
+    return orjson.loads(value) if _HAS_ORJSON else json.loads(value)
 
 # Ensure parent directory exists before creating sqlite file
 ensure_dirs()
@@ -27,21 +53,33 @@ engine = create_engine(
         "check_same_thread": False,
         "timeout": 30.0,  # 30 second timeout for lock acquisition
     },
-    poolclass=StaticPool,  # Single connection pool (optimal for SQLite)
-    pool_pre_ping=True,    # Verify connections before using
+    # Single persistent in-process connection: nothing can drop it remotely,
+    # so pool_pre_ping would only add a SELECT 1 per checkout. pool_use_lifo
+    # is a QueuePool option and does not apply here.
+    poolclass=StaticPool,
+    json_serializer=_json_dumps,
+    json_deserializer=_json_loads,
     future=True,
 )
 
+# Per-connection PRAGMAs, sent as a single script
+_CONNECT_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA cache_size=-64000;
+PRAGMA busy_timeout=30000;
+PRAGMA wal_autocheckpoint=1000;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+"""
+# WAL (persistent), faster-but-safe writes, 64MB cache, 30s lock wait,
+# checkpoint every 1000 WAL pages, in-memory temp tables, 256MB memory-mapped I/O
+
+
 @event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_conn, connection_record):
     cursor = dbapi_conn.cursor()
-    cursor.execute("PRAGMA journal_mode=WAL")          # Enable WAL mode
-    cursor.execute("PRAGMA synchronous=NORMAL")        # Faster writes, still safe
-    cursor.execute("PRAGMA cache_size=-64000")         # 64MB cache
-    cursor.execute("PRAGMA busy_timeout=30000")        # 30 seconds in milliseconds
-    cursor.execute("PRAGMA temp_store=MEMORY")         # Store temp tables in memory
-    cursor.execute("PRAGMA mmap_size=268435456")       # 256MB memory-mapped I/O
-    cursor.execute("PRAGMA page_size=4096")            # 4KB pages
+    cursor.executescript(_CONNECT_PRAGMAS)
     cursor.close()
 
 # Session factory
@@ -53,22 +91,69 @@ SessionLocal = sessionmaker(
     class_=Session
 )
 
+# Short-lived connections of their own, for the few writes that must not go
+# through the shared StaticPool connection (e.g. from the worker's signal
+# handler, while a task may have a transaction open on it). The short lock
+# wait stays well inside supervisord's stop window.
+side_engine = create_engine(
+    sqlite_url,
+    connect_args={"check_same_thread": False, "timeout": 2.0},
+    poolclass=NullPool,
+    json_serializer=_json_dumps,
+    json_deserializer=_json_loads,
+    future=True,
+)
+
+SideSessionLocal = sessionmaker(
+    bind=side_engine,
+    autoflush=False,
+    autocommit=False,
+    expire_on_commit=False,
+    class_=Session
+)
+
+# Indexes dropped from the models; removed from existing databases on upgrade
+_RETIRED_INDEXES = (
+    "ix_job_status_priority_created",  # replaced by the partial ix_job_ready
+)
+
+
 def init_db() -> None:
     """
     Create all tables, ensure first admin, and initialize default settings.
     """
-    # Create tables
-    Base.metadata.create_all(bind=engine)
+    # Create tables, unless user_version says this schema is already in place
+    with engine.begin() as conn:
+        current = conn.exec_driver_sql("PRAGMA user_version").scalar()
+        if current != SCHEMA_VERSION:
+            Base.metadata.create_all(bind=conn)
+            
+            # create_all skips existing tables entirely, so indexes added to the
+            # models later are created here for databases from older versions;
+            # an index redefined under the same name is dropped and rebuilt
+            stored = dict(conn.exec_driver_sql(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+            ).all())
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    ddl = stored.get(index.name)
+                    if ddl is not None and " ".join(ddl.split()) != " ".join(index_ddl(index).split()):
+                        index.drop(bind=conn)
+                        ddl = None
+                    if ddl is None:
+                        index.create(bind=conn, checkfirst=True)
+            for name in _RETIRED_INDEXES:
+                conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+            
+            conn.exec_driver_sql(f"PRAGMA user_version = {int(SCHEMA_VERSION)}")
+            logger.info(f"Database schema updated (user_version {current} -> {SCHEMA_VERSION})")
     
-    # Create first admin user if needed
+    # First admin and default settings share one session and one commit
     from .services import auth as auth_svc
-    with SessionLocal() as session:
-        auth_svc.ensure_first_admin(session)
-    
-    # Initialize default settings
     from . import settings as settings_module
-    with SessionLocal() as session:
-        settings_module.ensure_defaults(session)
+    with SessionLocal.begin() as session:
+        auth_svc.ensure_first_admin(session, commit=False)
+        settings_module.ensure_defaults(session, commit=False)
 
 def get_engine():
     return engine
@@ -84,18 +169,41 @@ def get_session() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+def list_with_count(
+    session: Session,
+    stmt: Select,
+    limit: int,
+    offset: int = 0,
+) -> Tuple[List[Any], int]:
+    """
+    Run a paginated SELECT and return (rows, total) in one round-trip.
+
+    `stmt` must select a single entity (e.g. select(Track).where(...)) and
+    should already carry its ORDER BY. The total is computed with a
+    count(*) OVER () window column; a separate COUNT is only issued when
+    the requested page is empty (offset past the end).
+    """
+    windowed = stmt.add_columns(func.count().over().label("__total")).limit(limit).offset(offset)
+    result = session.execute(windowed).all()
+    if result:
+        return [r[0] for r in result], int(result[0][1])
+    if offset <= 0:
+        return [], 0
+    total = session.execute(
+        select(func.count()).select_from(stmt.order_by(None).subquery())
+    ).scalar() or 0
+    return [], int(total)
+
+
 def cleanup_expired_tokens_job() -> None:
     """
     Background job to clean up expired refresh tokens.
     Should be called periodically (e.g., daily via scheduler).
     """
-    import logging
-    logger = logging.getLogger("db")
-    
     try:
         from .services import auth as auth_svc
         with SessionLocal() as session:
-            count = auth_svc.cleanup_expired_tokens(session)
+            count = auth_svc.cleanup_expired_tokens_bulk(session)
             if count > 0:
                 logger.info(f"Token cleanup: removed {count} expired tokens")
     except Exception as e:
@@ -3,33 +3,64 @@
 FastAPI dependency functions for authentication and authorization.
 """
 from __future__ import annotations
+import functools
 import logging
 from typing import Optional
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
 from .db import get_session
+from .deps import get_db
 from .services import auth as auth_svc
-from .models import User
+from .models import Track, User
 from . import config
 
 logger = logging.getLogger("dependencies")
 
-security = HTTPBearer()
 
+def _parse_bearer(header: Optional[str]) -> Optional[str]:
+    """Return the token from an 'Authorization: Bearer <token>' header value, else None."""
+    if not header:
+        return None
+    scheme, _, token = header.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return token.strip() or None
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: Session = Depends(get_session),
-) -> User:
+
+def bearer_token(request: Request) -> str:
     """
-    Extract and validate JWT token from Authorization header.
-    Returns current user or raises 401.
+    Read the bearer token straight from the Authorization header.
+    Raises 401 if the header is missing or not a Bearer credential.
+    """
+    header = request.headers.get("authorization")
+    if not header:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    token = _parse_bearer(header)
+    if token is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return token
+
+
+def bearer_token_optional(request: Request) -> Optional[str]:
+    """Like bearer_token, but returns None instead of raising."""
+    return _parse_bearer(request.headers.get("authorization"))
+
+
+def _user_id_from_token(token: str) -> int:
+    """
+    Verify the JWT from the Authorization header and return its user ID.
+    Raises 401 if the token or its payload is invalid.
     """
-    token = credentials.credentials
-    
     # Verify token
     payload = auth_svc.verify_access_token(token)
     if not payload:
@@ -39,7 +70,6 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Get user from database
     user_id = payload.get("user_id")
     if user_id is None:
         raise HTTPException(
@@ -49,14 +79,26 @@ def get_current_user(
         )
     
     try:
-        user_id_int = int(user_id)
+        return int(user_id)
     except (ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid user ID in token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+def get_current_user(
+    token: str = Depends(bearer_token),
+    session: Session = Depends(get_session),
+) -> User:
+    """
+    Extract and validate JWT token from Authorization header.
+    Returns current user (attached ORM instance) or raises 401.
+    """
+    user_id_int = _user_id_from_token(token)
     
+    # Get user from database
     user = auth_svc.get_user_by_id(session, user_id_int)
     
     if not user or not user.is_active:
@@ -69,29 +111,56 @@ def get_current_user(
     return user
 
 
+def get_current_user_cached(
+    token: str = Depends(bearer_token),
+    session: Session = Depends(get_session),
+) -> auth_svc.CachedUser:
+    """
+    Same checks as get_current_user, but returns a short-lived CachedUser
+    snapshot (id, username, role, is_active) so most requests skip the
+    user lookup. Use get_current_user when the ORM instance is needed.
+    """
+    user_id_int = _user_id_from_token(token)
+    
+    user = auth_svc.get_cached_user(session, user_id_int)
+    
+    if not user or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found or inactive",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return user
+
+
 def get_current_user_optional(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    token: Optional[str] = Depends(bearer_token_optional),
     session: Session = Depends(get_session),
 ) -> Optional[User]:
     """
     Optional authentication - returns user if token provided, None otherwise.
     """
-    if not credentials:
+    if not token:
         return None
     
     try:
-        return get_current_user(credentials, session)
+        return get_current_user(token, session)
     except HTTPException:
         return None
 
 
-# Alias for consistency
-require_auth = get_current_user
+# Alias for consistency (role/ID checks only need the cached snapshot)
+require_auth = get_current_user_cached
 
 
+@functools.lru_cache(maxsize=8)
 def require_role(required_role: str):
-    """Factory function to create role-based dependencies."""
-    def role_checker(current_user: User = Depends(get_current_user)) -> User:
+    """
+    Factory function to create role-based dependencies.
+    Cached so repeated calls return the same callable and FastAPI can dedupe it.
+    """
+    def role_checker(current_user: auth_svc.CachedUser = Depends(require_auth)) -> auth_svc.CachedUser:
         if current_user.role != required_role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -102,7 +171,7 @@ def require_role(required_role: str):
     return role_checker
 
 
-def require_admin(current_user: User = Depends(get_current_user)) -> User:
+def require_admin(current_user: auth_svc.CachedUser = Depends(require_auth)) -> auth_svc.CachedUser:
     """Require administrator role"""
     if current_user.role != config.ROLE_ADMINISTRATOR:
         raise HTTPException(
@@ -112,9 +181,9 @@ def require_admin(current_user: User = Depends(get_current_user)) -> User:
     return current_user
 
 
-def require_member_or_admin(current_user: User = Depends(get_current_user)) -> User:
+def require_member_or_admin(current_user: auth_svc.CachedUser = Depends(require_auth)) -> auth_svc.CachedUser:
     """Require member or administrator role (blocks visitors)"""
-    if current_user.role not in [config.ROLE_MEMBER, config.ROLE_ADMINISTRATOR]:
+    if current_user.role not in config.WRITE_ROLES:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Member or Administrator access required",
@@ -138,4 +207,29 @@ def check_user_modification_permission(
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only modify your own account",
-        )
\ No newline at end of file
+        )
+
+
+# ============================================================================
+# REQUEST-SCOPED LOOKUPS
+# ============================================================================
+
+def get_track_by_path(
+    track_id: str,
+    request: Request,
+    db: Session = Depends(get_db),
+) -> Optional[Track]:
+    """
+    Resolve the {track_id} path parameter to a Track (or None).
+    
+    The result is memoised on request.state, so several dependencies or
+    handlers that need the same track share one lookup. It shares the
+    request's get_db session, so later session.get() calls hit the identity map.
+    """
+    cache = getattr(request.state, "track_cache", None)
+    if cache is None:
+        cache = {}
+        request.state.track_cache = cache
+    if track_id not in cache:
+        cache[track_id] = db.get(Track, track_id)
+    return cache[track_id]
@@ -6,26 +6,26 @@ import time
 from typing import Generator, Any, Optional
 
 from sqlalchemy.orm import Session
-from .db import SessionLocal
+from .db import SessionLocal, get_session
 
 logger = logging.getLogger("backend.deps")
 
+# Memoised module lookups; _MISSING marks an import that already failed
+_MISSING = object()
+_SETTINGS: Any = None
+_JOBQUEUE: Any = None
+_YTM_ADAPTER: Any = None
+_YTM_CLIENT_MOD: Any = None
+
 
 def get_db() -> Generator[Session, None, None]:
     """
     FastAPI dependency that yields a SQLAlchemy Session.
 
     Implementation:
-      - Delegates to backend.db.get_session() (lazily imported) to avoid import cycles.
+      - Delegates to backend.db.get_session().
       - Yields the session and ensures it is closed.
     """
-    try:
-        # import lazily to avoid import-time cycles
-        from .db import get_session  # type: ignore
-    except Exception as e:
-        logger.exception("Failed to import backend.db.get_session")
-        raise RuntimeError("Database session factory not available") from e
-
     # get_session is itself a generator that yields a Session
     yield from get_session()  # type: ignore[func-returns-value]
 
@@ -87,9 +87,12 @@ def get_settings() -> Any:
     Currently we expose the module object; if later you want a Pydantic Settings
     object, replace this to return an instance (e.g. ConfigSettings()).
     """
+    global _SETTINGS
+    if _SETTINGS is not None:
+        return _SETTINGS
     try:
-        cfg = importlib.import_module("backend.config")
-        return cfg
+        _SETTINGS = importlib.import_module("backend.config")
+        return _SETTINGS
     except Exception:
         logger.exception("Failed to import backend.config")
         raise RuntimeError("Settings/config not available")
@@ -97,24 +100,37 @@ def get_settings() -> Any:
 
 def get_ytm_adapter() -> Optional[Any]:
     """Return the ytm_service.adapter module."""
-    try:
-        from backend.ytm_service import adapter
-        return adapter
-    except Exception:
-        logger.debug("ytm_service.adapter not available", exc_info=True)
-        return None
+    global _YTM_ADAPTER
+    if _YTM_ADAPTER is None:
+        try:
+            from backend.ytm_service import adapter
+            _YTM_ADAPTER = adapter
+        except Exception:
+            logger.debug("ytm_service.adapter not available", exc_info=True)
+            _YTM_ADAPTER = _MISSING
+    return None if _YTM_ADAPTER is _MISSING else _YTM_ADAPTER
 
 
 def get_ytm_client() -> Optional[Any]:
     """Return the YTMusic client instance."""
+    global _YTM_CLIENT_MOD
+    if _YTM_CLIENT_MOD is None:
+        try:
+            from backend.ytm_service import client as _client_mod
+            _YTM_CLIENT_MOD = _client_mod
+        except Exception:
+            logger.debug("ytm_service.client not available", exc_info=True)
+            _YTM_CLIENT_MOD = _MISSING
+    if _YTM_CLIENT_MOD is _MISSING:
+        return None
+    client = _YTM_CLIENT_MOD
     try:
-        from backend.ytm_service import client
         if hasattr(client, "get_client"):
             return client.get_client()
         logger.debug("ytm_service.client has no get_client()/get_ytm()")
         return None
     except Exception:
-        logger.debug("ytm_service.client not available", exc_info=True)
+        logger.debug("ytm_service.client.get_client() failed", exc_info=True)
         return None
 
 
@@ -124,12 +140,14 @@ def get_jobqueue() -> Optional[Any]:
 
     Useful to call jobqueue.enqueue_job(...) from routers/services without importing at module level.
     """
-    try:
-        jq = importlib.import_module("backend.jobs.jobqueue")
-        return jq
-    except Exception:
-        logger.debug("backend.jobs.jobqueue not available", exc_info=True)
-        return None
+    global _JOBQUEUE
+    if _JOBQUEUE is None:
+        try:
+            _JOBQUEUE = importlib.import_module("backend.jobs.jobqueue")
+        except Exception:
+            logger.debug("backend.jobs.jobqueue not available", exc_info=True)
+            _JOBQUEUE = _MISSING
+    return None if _JOBQUEUE is _MISSING else _JOBQUEUE
 
 
 def get_logger(name: Optional[str] = None) -> logging.Logger:
@@ -9,23 +9,41 @@ to allow access like:
     downloader.core.download_track_by_videoid(...)
     downloader.lyrics.get_synced_lyrics(...)
 
-Reexport common functions (package level) is optional but practical.
+Submodules are imported lazily on first attribute access (PEP 562) so that
+importing the package does not pull in yt-dlp, mutagen, Pillow or requests.
 """
 
-# submodules import (make accessible via `downloader.core`, etc.)
-from . import core
-from . import cover
-from . import metadata
-from . import embed
+import importlib
+from typing import Any
 
-# commonly used utilities functions — expose at package level
-# (optional but practical for tasks.py and others)
-download_track_by_videoid = core.download_track_by_videoid
+# submodules resolved on demand (accessible via `downloader.core`, etc.)
+_LAZY_SUBMODULES = {"core", "cover", "metadata", "embed"}
+
+# commonly used utilities functions — exposed at package level
+# name -> (submodule, attribute)
+_LAZY_ATTRS = {
+    "download_track_by_videoid": ("core", "download_track_by_videoid"),
+    "download_tracks_pipelined": ("core", "download_tracks_pipelined"),
+    "select_best_thumbnail_url": ("cover", "select_best_thumbnail_url"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_SUBMODULES:
+        mod = importlib.import_module(f"{__name__}.{name}")
+        globals()[name] = mod
+        return mod
+    if name in _LAZY_ATTRS:
+        mod_name, attr = _LAZY_ATTRS[name]
+        value = getattr(__getattr__(mod_name), attr, None)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | _LAZY_SUBMODULES | set(_LAZY_ATTRS))
 
-try:
-    select_best_thumbnail_url = cover.select_best_thumbnail_url
-except Exception:
-    select_best_thumbnail_url = None
 
 # public package control
 __all__ = [
@@ -34,5 +52,6 @@ __all__ = [
     "metadata",
     "embed",
     "download_track_by_videoid",
+    "download_tracks_pipelined",
     "select_best_thumbnail_url",
-]
\ No newline at end of file
+]
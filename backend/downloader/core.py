@@ -1,134 +1,501 @@
 # backend/downloader/core.py
 from __future__ import annotations
+import atexit
+import functools
+import json
 import logging
 import os
 import time
-import shutil
-from typing import Any, Dict, List, Optional, Union, cast
+import queue
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
 from pathlib import Path
 
 from yt_dlp import YoutubeDL
+from yt_dlp.cookies import YoutubeDLCookieJar
+from yt_dlp.postprocessor import FFmpegExtractAudioPP
 
-from ..config import DOWNLOAD_DIR, COVERS_DIR, MUSIC_DIR, LYRICS_DIR, YDL_FORMAT, YDL_PREFERRED_CODEC, YDL_COOKIEFILE
+from ..config import (
+    DOWNLOAD_DIR, COVERS_DIR, MUSIC_DIR, LYRICS_DIR, YDL_FORMAT, YDL_PREFERRED_CODEC, YDL_COOKIEFILE,
+    YDL_CONCURRENT_FRAGMENTS, YDL_HTTP_CHUNK_SIZE,
+    YTDLP_META_CACHE_DIR, YTDLP_META_CACHE_TTL, DOWNLOAD_INDEX_DIR,
+)
 
 # relative package imports (downloader.cover, downloader.embed expected)
 from . import cover as cover_mod  # type: ignore
 from . import embed as embed_mod  # type: ignore
 
+# capability lookups resolved once (the helper modules don't change at runtime)
+_select_thumb = getattr(cover_mod, "select_best_thumbnail_url", None)
+_cover_saver = getattr(cover_mod, "save_cover_from_url", None) or getattr(cover_mod, "save_and_convert_cover", None)
+_move_cover = getattr(cover_mod, "move_cover_if_exists", None) or getattr(cover_mod, "move_if_exists", None)
+_move_lyrics = getattr(cover_mod, "move_if_exists", None)
+_embed_tags = getattr(embed_mod, "embed_tags", None)
+
 # optional lyrics helper (may not exist in new layout)
 try:
     from ..lyrics import fetch_lyrics  # type: ignore
 except Exception:
     fetch_lyrics = None  # type: ignore
 
+# config paths as Path objects, converted once
+_DOWNLOAD_DIR = Path(DOWNLOAD_DIR)
+_COVERS_DIR = Path(COVERS_DIR)
+_MUSIC_DIR = Path(MUSIC_DIR)
+_META_CACHE_DIR = Path(YTDLP_META_CACHE_DIR)
+_DOWNLOAD_INDEX_DIR = Path(DOWNLOAD_INDEX_DIR)
+_COOKIEFILE = os.fspath(YDL_COOKIEFILE)
+
 logger = logging.getLogger("downloader.core")
 if not logging.getLogger().handlers:
     logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
 
-def _cleanup_partial_files(directory: Union[str, Path]) -> None:
-    d = Path(str(directory))
-    if not d.exists() or not d.is_dir():
+def _cleanup_partial_files(directory: Union[str, Path], prefix: str = "") -> None:
+    """Remove leftover *.part files; with `prefix`, only those of one download."""
+    try:
+        it = os.scandir(directory)
+    except OSError:
         return
-    for f in d.iterdir():
-        try:
-            if f.name.endswith(".part"):
-                f.unlink(missing_ok=True)
-        except Exception:
-            logger.debug("Ignoring leftover partial file %s", f, exc_info=True)
+    with it:
+        for entry in it:
+            name = entry.name
+            if name.startswith(prefix) and name.endswith(".part"):
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    logger.debug("Ignoring leftover partial file %s", entry.path, exc_info=True)
+
+
+# Anything that is not alphanumeric (Unicode-aware, same as str.isalnum) or " .-_()"
+_UNSAFE_NAME_RE = re.compile(r"[^\w .\-()]")
 
 
+# artist/album names repeat across a batch, so results are memoised
+@functools.lru_cache(maxsize=4096)
 def _safe_name(s: Optional[str]) -> str:
     if not s:
         return "Unknown"
-    return "".join(c for c in s if c.isalnum() or c in " .-_()").strip() or "Unknown"
+    return _UNSAFE_NAME_RE.sub("", s).strip() or "Unknown"
 
 
 def _find_downloaded_file(download_dir: Union[str, Path], prefix: str = "song.") -> Optional[Path]:
     try:
-        d = Path(str(download_dir))
-        for f in d.iterdir():
-            if f.name.startswith(prefix) and not f.name.endswith(".part"):
-                return f
-    except Exception:
+        with os.scandir(download_dir) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith(prefix) and not name.endswith(".part"):
+                    return Path(entry.path)
+    except OSError:
         logger.exception("Failed scanning download dir %s", download_dir)
     return None
 
 
-# --- main public function ---
-def download_track_by_videoid(
-    video_id: str,
-    artist_name: Optional[str] = None,
-    album_name: Optional[str] = None,
-    track_title: Optional[str] = None,
-    track_number: Optional[int] = None,
-    year: Optional[Union[str, int]] = None,
-    cover_path_override: Optional[Union[str, Path]] = None,
-    skip_metadata: bool = True,  # NEW: Skip metadata extraction
-) -> tuple[str, Optional[str]]:
-    """
-    Downloads track (yt-dlp), puts final file under MUSIC_DIR/{artist}/{album}/
-    and returns (file_path, cover_path).
+# --- metadata cache ---
+# Only the fields used downstream are kept, so entries stay a few hundred bytes
+_META_KEYS = ("title", "uploader", "album", "duration")
 
-    Args:
-        video_id: YouTube video ID
-        artist_name: Artist name for metadata
-        album_name: Album name for metadata
-        track_title: Track title for metadata
-        track_number: Track number for metadata
-        year: Release year for metadata
-        cover_path_override: Path to already existing cover (used if valid)
-        skip_metadata: If True, skip metadata extraction (faster, fewer requests)
 
-    Returns:
-        tuple: (final_track_path, final_cover_path or None)
-    """
-    _cleanup_partial_files(DOWNLOAD_DIR)
+def _meta_cache_path(video_id: str) -> Path:
+    return _META_CACHE_DIR / f"{_safe_name(video_id)}.json"
 
-    url = f"https://www.youtube.com/watch?v={video_id}"
-    outtmpl = str(Path(str(DOWNLOAD_DIR)) / "song.%(ext)s")
-    ydl_opts: Dict[str, Any] = {
+
+def _load_cached_info(video_id: str) -> Optional[Dict[str, Any]]:
+    """Return cached metadata subset for video_id if present and not expired."""
+    path = _meta_cache_path(video_id)
+    try:
+        if time.time() - path.stat().st_mtime >= YTDLP_META_CACHE_TTL:
+            return None
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else None
+    except (OSError, ValueError):
+        return None
+
+
+def _store_cached_info(video_id: str, info: Dict[str, Any]) -> Dict[str, Any]:
+    """Persist the small subset of a yt-dlp info_dict we use; returns that subset."""
+    subset: Dict[str, Any] = {k: info.get(k) for k in _META_KEYS if info.get(k) is not None}
+    thumbs = info.get("thumbnails")
+    if isinstance(thumbs, list):
+        subset["thumbnails"] = [
+            {k: t.get(k) for k in ("url", "width", "height") if t.get(k) is not None}
+            for t in thumbs if isinstance(t, dict) and t.get("url")
+        ]
+    elif info.get("thumbnail"):
+        subset["thumbnail"] = info.get("thumbnail")
+    try:
+        path = _meta_cache_path(video_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(subset), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        logger.debug("Could not write metadata cache for %s", video_id, exc_info=True)
+    return subset
+
+
+# --- pooled yt-dlp instances ---
+# One YoutubeDL per thread (and per postprocessing mode): construction
+# (extractor setup, cookie parsing, handler chain) is paid once and extractor
+# caches survive between tracks.
+_ydl_local = threading.local()
+
+
+def _ydl_base_opts(extract_audio: bool = True) -> Dict[str, Any]:
+    return {
         "format": YDL_FORMAT or "bestaudio/best",
-        'cookiefile': YDL_COOKIEFILE,
-        "outtmpl": outtmpl,
+        'cookiefile': _COOKIEFILE,
+        "outtmpl": os.fspath(_DOWNLOAD_DIR / "song.%(ext)s"),  # replaced per call
         "quiet": False,
         "no_warnings": True,
         "noplaylist": True,
+        # the batch pipeline leaves the raw stream on disk and runs the same
+        # postprocessor itself (see _extract_audio)
         "postprocessors": [
             {"key": "FFmpegExtractAudio", "preferredcodec": YDL_PREFERRED_CODEC or "m4a"}
-        ],
+        ] if extract_audio else [],
         "retries": 3,
         "continuedl": True,
+        # parallel fragment fetches for DASH/HLS audio, ranged chunks for
+        # progressive streams (works around per-connection throttling)
+        "concurrent_fragment_downloads": YDL_CONCURRENT_FRAGMENTS,
+        "http_chunk_size": YDL_HTTP_CHUNK_SIZE,
     }
 
+
+def _cookie_mtime() -> Optional[float]:
+    try:
+        return os.stat(_COOKIEFILE).st_mtime
+    except OSError:
+        return None
+
+
+# One cookie jar shared by every pooled instance: the cookie file is parsed
+# once (again only if it changes on disk) and Set-Cookie updates from any
+# thread accumulate in the same jar.
+_cookie_lock = threading.Lock()
+_cookiejar: Optional[YoutubeDLCookieJar] = None
+_cookiejar_mtime: Optional[float] = None
+
+
+def _shared_cookiejar() -> YoutubeDLCookieJar:
+    """Return the shared cookie jar, reloading it if the cookie file changed."""
+    global _cookiejar, _cookiejar_mtime
+    with _cookie_lock:
+        mtime = _cookie_mtime()
+        if _cookiejar is None or mtime != _cookiejar_mtime:
+            jar = YoutubeDLCookieJar(_COOKIEFILE)
+            if mtime is not None and os.access(_COOKIEFILE, os.R_OK):
+                jar.load()
+            _cookiejar, _cookiejar_mtime = jar, mtime
+        return _cookiejar
+
+
+def _get_ydl(outtmpl: str, extract_audio: bool = True) -> YoutubeDL:
+    """Return this thread's YoutubeDL, rebuilt if the shared cookie jar was reloaded."""
+    jar = _shared_cookiejar()
+    attr = "ydl" if extract_audio else "ydl_raw"
+    ydl = getattr(_ydl_local, attr, None)
+    if ydl is None or ydl.__dict__.get("cookiejar") is not jar:
+        _drop_ydl()
+        ydl = YoutubeDL(_ydl_base_opts(extract_audio))  # type: ignore
+        # seed yt-dlp's cached `cookiejar` property so it never parses the file itself
+        ydl.__dict__["cookiejar"] = jar
+        setattr(_ydl_local, attr, ydl)
+    ydl.params["outtmpl"] = {"default": outtmpl}
+    return ydl
+
+
+def _after_ydl_call(ydl: YoutubeDL) -> None:
+    """Persist refreshed cookies (as the context manager used to) without a reload."""
+    global _cookiejar_mtime
+    with _cookie_lock:
+        try:
+            ydl.save_cookies()
+        except Exception:
+            logger.debug("Saving yt-dlp cookies failed", exc_info=True)
+        if ydl.__dict__.get("cookiejar") is _cookiejar:
+            _cookiejar_mtime = _cookie_mtime()
+
+
+def _drop_ydl() -> None:
+    """Close and forget this thread's YoutubeDLs (after errors or cookie changes)."""
+    for attr in ("ydl", "ydl_raw"):
+        ydl = getattr(_ydl_local, attr, None)
+        setattr(_ydl_local, attr, None)
+        if ydl is not None:
+            try:
+                ydl.close()
+            except Exception:
+                logger.debug("Closing yt-dlp instance failed", exc_info=True)
+
+
+# --- cover prefetch ---
+# Cover fetches run here so they overlap with the audio download
+_COVER_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ytdl-cover")
+# video_id -> Future of the cover Path, consumed by _finalize_download
+_pending_covers: Dict[str, "Future[Optional[Path]]"] = {}
+
+
+def _thumbnail_url(info_dict: Dict[str, Any]) -> Optional[str]:
+    """Pick the best thumbnail URL from a yt-dlp info dict."""
+    thumb_candidates: List[Union[str, Dict[str, Any]]] = []
+    t = info_dict.get("thumbnails")
+    if isinstance(t, list):
+        thumb_candidates = [x for x in t if x is not None]
+    elif isinstance(t, dict):
+        inner = t.get("thumbnails")
+        if isinstance(inner, list):
+            thumb_candidates = [x for x in inner if x is not None]
+    else:
+        th = info_dict.get("thumbnail")
+        if isinstance(th, list):
+            thumb_candidates = [x for x in th if x is not None]
+        elif isinstance(th, (str, dict)):
+            thumb_candidates = [th]
+
+    thumb_url: Optional[str] = None
+    try:
+        if _select_thumb is not None:
+            thumb_url = _select_thumb(thumb_candidates)
+        else:
+            for item in reversed(thumb_candidates):
+                if isinstance(item, dict) and item.get("url"):
+                    thumb_url = item.get("url")
+                    break
+                if isinstance(item, str):
+                    thumb_url = item
+                    break
+    except Exception:
+        logger.debug("Thumbnail selection failed", exc_info=True)
+    return thumb_url
+
+
+def _save_cover(video_id: str, thumb_url: str) -> Optional[Path]:
+    dest_cover = _COVERS_DIR / f"{video_id}.jpg"
+    # already fetched (e.g. an earlier attempt that failed after the download)
+    try:
+        if dest_cover.stat().st_size > 0:
+            return dest_cover
+    except OSError:
+        pass
+    if _cover_saver is not None:
+        return _cover_saver(thumb_url, dest_cover)
+    return None
+
+
+def _prefetch_cover(video_id: str, info_dict: Dict[str, Any]) -> None:
+    if video_id in _pending_covers:
+        return
+    thumb_url = _thumbnail_url(info_dict)
+    if thumb_url:
+        _pending_covers[video_id] = _COVER_POOL.submit(_save_cover, video_id, thumb_url)
+
+
+# --- download stages ---
+def _download_audio(
+    video_id: str,
+    skip_metadata: bool = True,
+    prefetch_cover: bool = False,
+    extract_audio: bool = True,
+) -> Tuple[Path, Dict[str, Any], Optional[int]]:
+    """
+    Network stage: fetch the best audio stream with yt-dlp and, unless
+    extract_audio is False, run FFmpegExtractAudio on it. Returns
+    (audio_file, info_dict, duration_sec); without extraction audio_file is
+    the raw stream, to be passed through _extract_audio later.
+
+    With prefetch_cover (and metadata), the thumbnail is fetched on
+    _COVER_POOL while the audio downloads; _finalize_download awaits it.
+    """
+    # per-video temp names so concurrent downloads never touch each other's files
+    file_prefix = f"song_{video_id}."
+    _cleanup_partial_files(_DOWNLOAD_DIR, prefix=file_prefix)
+
+    url = f"https://www.youtube.com/watch?v={video_id}"
+    outtmpl = os.fspath(_DOWNLOAD_DIR / f"song_{video_id}.%(ext)s")
     info_dict: Dict[str, Any] = {}
     duration_sec: Optional[int] = None
 
     # Download with or without metadata extraction
     try:
-        with YoutubeDL(ydl_opts) as ydl:  # type: ignore
+        ydl = _get_ydl(outtmpl, extract_audio=extract_audio)
+        try:
             if skip_metadata:
                 # FAST MODE: Download directly without metadata extraction
                 logger.info(f"Downloading {video_id} (no metadata)")
                 ydl.download([url])
             else:
-                # SLOW MODE: Extract metadata first (original behavior)
-                logger.info(f"Downloading {video_id} (with metadata)")
-                tmp_info = ydl.extract_info(url, download=False)
-                if isinstance(tmp_info, dict):
-                    info_dict = cast(Dict[str, Any], tmp_info)
-                    dval = info_dict.get("duration") or info_dict.get("duration_seconds") or info_dict.get("lengthSeconds")
-                    try:
-                        duration_sec = int(dval) if dval is not None else None
-                    except Exception:
-                        duration_sec = None
-                ydl.download([url])
+                # SLOW MODE: metadata needed; reuse the cached subset if we have one
+                cached = _load_cached_info(video_id)
+                if cached is not None:
+                    logger.info(f"Downloading {video_id} (cached metadata)")
+                    info_dict = cached
+                    if prefetch_cover:
+                        _prefetch_cover(video_id, info_dict)
+                    ydl.download([url])
+                else:
+                    # single extraction; the download is processed from the same
+                    # info dict so the cover can be fetched while audio streams
+                    logger.info(f"Downloading {video_id} (with metadata)")
+                    tmp_info = ydl.extract_info(url, download=False)
+                    if isinstance(tmp_info, dict):
+                        if prefetch_cover:
+                            _prefetch_cover(video_id, cast(Dict[str, Any], tmp_info))
+                        tmp_info = ydl.process_ie_result(tmp_info, download=True)
+                    if isinstance(tmp_info, dict):
+                        info_dict = _store_cached_info(video_id, cast(Dict[str, Any], tmp_info))
+                dval = info_dict.get("duration") or info_dict.get("duration_seconds") or info_dict.get("lengthSeconds")
+                try:
+                    duration_sec = int(dval) if dval is not None else None
+                except Exception:
+                    duration_sec = None
+        finally:
+            _after_ydl_call(ydl)
     except Exception:
         logger.exception("yt-dlp failed for %s", url)
+        _pending_covers.pop(video_id, None)
+        _drop_ydl()
         raise
 
-    downloaded_file = _find_downloaded_file(DOWNLOAD_DIR)
+    downloaded_file = _find_downloaded_file(_DOWNLOAD_DIR, prefix=file_prefix)
     if not downloaded_file:
         raise FileNotFoundError("Downloaded file not found in downloads directory")
+    return downloaded_file, info_dict, duration_sec
+
+
+def _extract_audio(raw_file: Path, codec: Optional[str] = None) -> Path:
+    """
+    CPU stage for raw streams from _download_audio(extract_audio=False): runs
+    yt-dlp's own FFmpegExtractAudio postprocessor, so the result is identical
+    to the single-track path (stream copy when the codec already matches).
+    """
+    pp = FFmpegExtractAudioPP(None, preferredcodec=codec or YDL_PREFERRED_CODEC or "m4a")
+    info = {"filepath": os.fspath(raw_file), "ext": raw_file.suffix.lstrip(".")}
+    try:
+        files_to_delete, info = pp.run(info)
+    except Exception as e:
+        raise RuntimeError(f"ffmpeg audio extraction failed for {raw_file.name}: {e}") from e
+    for leftover in files_to_delete:
+        try:
+            os.unlink(leftover)
+        except OSError:
+            pass
+    return Path(info["filepath"])
+
+
+# (artist, album) as given by the caller -> album folder already created
+# under MUSIC_DIR; tracks of the same album skip sanitising, Path building
+# and mkdir entirely
+_album_dirs: Dict[Tuple[str, str], Path] = {}
+
+
+def _album_dir(artist: str, album: str) -> Path:
+    """Return MUSIC_DIR/{safe artist}/{safe album}, creating it only the first time it is seen."""
+    key = (artist, album)
+    dest_dir = _album_dirs.get(key)
+    if dest_dir is None:
+        dest_dir = _MUSIC_DIR / _safe_name(artist) / _safe_name(album)
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        _album_dirs[key] = dest_dir
+    return dest_dir
+
+
+def _track_filename(title: str, track_number: Optional[int]) -> str:
+    safe_title = _safe_name(title)
+    try:
+        if track_number and int(track_number) > 0:
+            return f"{int(track_number):02d} - {safe_title}"
+    except Exception:
+        pass
+    return safe_title
+
+
+# video_id -> path of the library file it produced, kept under /config so
+# nothing extra is written into the user's music folders
+def _download_record_path(video_id: str) -> Path:
+    return _DOWNLOAD_INDEX_DIR / _safe_name(video_id)
+
+
+def _record_download(video_id: str, dest_path: Path) -> None:
+    try:
+        path = _download_record_path(video_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(os.fspath(dest_path), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        logger.debug("Could not record download of %s", video_id, exc_info=True)
+
+
+def _already_downloaded(
+    video_id: str,
+    artist_name: Optional[str] = None,
+    album_name: Optional[str] = None,
+    track_title: Optional[str] = None,
+    track_number: Optional[int] = None,
+    **_ignored: Any,
+) -> Optional[tuple[str, Optional[str]]]:
+    """
+    Return (file_path, cover_path) if this video was already downloaded to the
+    path it would get now, else None. The download index must name that path
+    for this video_id (a same-named file from another video does not count)
+    and the file must be non-empty.
+    """
+    dest_dir = _MUSIC_DIR / _safe_name(artist_name or "Unknown") / _safe_name(album_name or "Unknown Album")
+    filename = _track_filename(track_title or f"track_{video_id}", track_number)
+    expected = dest_dir / f"{filename}.{(YDL_PREFERRED_CODEC or 'm4a').lower()}"
+    try:
+        if _download_record_path(video_id).read_text(encoding="utf-8").strip() != os.fspath(expected):
+            return None
+        if expected.stat().st_size <= 0:
+            return None
+    except OSError:
+        return None
+    cover = dest_dir / "cover.jpg"
+    logger.info(f"Already downloaded {video_id}: {expected}")
+    return str(expected), (str(cover) if cover.is_file() else None)
+
+
+# Post-download chmods run here, off the caller's path; drained at exit so
+# no queued chmod is lost when the worker process stops
+_POST_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ytdl-post")
+
+
+def shutdown_post_pool(wait: bool = True) -> None:
+    """Drain pending post-download work (registered with atexit)."""
+    _POST_POOL.shutdown(wait=wait)
+
+
+atexit.register(shutdown_post_pool)
+
+
+def _batch_chmod(paths: List[str], mode: int) -> None:
+    for p in paths:
+        try:
+            os.chmod(p, mode)
+        except OSError:
+            pass
+
+
+def _finalize_download(
+    video_id: str,
+    downloaded_file: Path,
+    info_dict: Dict[str, Any],
+    duration_sec: Optional[int],
+    artist_name: Optional[str] = None,
+    album_name: Optional[str] = None,
+    track_title: Optional[str] = None,
+    track_number: Optional[int] = None,
+    year: Optional[Union[str, int]] = None,
+    cover_path_override: Optional[Union[str, Path]] = None,
+    skip_metadata: bool = True,
+) -> tuple[str, Optional[str]]:
+    """
+    Library stage: cover, move under MUSIC_DIR/{artist}/{album}/, lyrics,
+    tag embedding. Returns (file_path, cover_path).
+    """
 
     # metadata fallback - use provided metadata since we skipped extraction
     final_title = track_title or f"track_{video_id}"
@@ -140,72 +507,36 @@ def download_track_by_videoid(
     cover_path_file: Optional[Path] = None
     if cover_path_override:
         try:
-            cand = Path(str(cover_path_override))
-            if cand.is_file() and os.access(str(cand), os.R_OK):
+            cand = Path(cover_path_override)
+            if cand.is_file() and os.access(cand, os.R_OK):
                 cover_path_file = cand
         except Exception:
             cover_path_file = None
 
-    # If no cover provided and we didn't skip metadata, try to get thumbnail
-    if not cover_path_file and not skip_metadata and info_dict:
-        thumb_candidates: List[Union[str, Dict[str, Any]]] = []
-        t = info_dict.get("thumbnails")
-        if isinstance(t, list):
-            thumb_candidates = [x for x in t if x is not None]
-        elif isinstance(t, dict):
-            inner = t.get("thumbnails")
-            if isinstance(inner, list):
-                thumb_candidates = [x for x in inner if x is not None]
-        else:
-            th = info_dict.get("thumbnail")
-            if isinstance(th, list):
-                thumb_candidates = [x for x in th if x is not None]
-            elif isinstance(th, (str, dict)):
-                thumb_candidates = [th]
-        
-        thumb_url: Optional[str] = None
+    # Cover prefetched in parallel with the audio download (see _download_audio)
+    pending_cover = _pending_covers.pop(video_id, None)
+    if pending_cover is not None:
         try:
-            if hasattr(cover_mod, "select_best_thumbnail_url"):
-                thumb_url = cover_mod.select_best_thumbnail_url(thumb_candidates)
-            else:
-                for item in reversed(thumb_candidates):
-                    if isinstance(item, dict) and item.get("url"):
-                        thumb_url = item.get("url")
-                        break
-                    if isinstance(item, str):
-                        thumb_url = item
-                        break
+            got = pending_cover.result()
+            if not cover_path_file and isinstance(got, Path):
+                cover_path_file = got
         except Exception:
-            logger.debug("Thumbnail selection failed", exc_info=True)
+            logger.exception("Failed saving cover for %s", video_id)
 
+    # If no cover provided and we didn't skip metadata, try to get thumbnail
+    if not cover_path_file and not skip_metadata and info_dict:
+        thumb_url = _thumbnail_url(info_dict)
         if thumb_url:
             try:
-                dest_cover = Path(str(COVERS_DIR)) / f"{video_id}.jpg"
-                if hasattr(cover_mod, "save_cover_from_url"):
-                    got = cover_mod.save_cover_from_url(thumb_url, dest_cover)
-                elif hasattr(cover_mod, "save_and_convert_cover"):
-                    got = cover_mod.save_and_convert_cover(thumb_url, dest_cover)
-                else:
-                    got = None
+                got = _save_cover(video_id, thumb_url)
                 if isinstance(got, Path):
                     cover_path_file = got
             except Exception:
                 logger.exception("Failed saving cover for %s", video_id)
 
     # prepare destination path
-    safe_artist = _safe_name(final_artist)
-    safe_album = _safe_name(final_album)
-    safe_title = _safe_name(final_title)
-    dest_dir = Path(str(MUSIC_DIR)) / safe_artist / safe_album
-    dest_dir.mkdir(parents=True, exist_ok=True)
-
-    try:
-        if track_number and int(track_number) > 0:
-            filename = f"{int(track_number):02d} - {safe_title}"
-        else:
-            filename = safe_title
-    except Exception:
-        filename = safe_title
+    dest_dir = _album_dir(final_artist, final_album)
+    filename = _track_filename(final_title, track_number)
 
     ext = downloaded_file.suffix.lstrip(".") if downloaded_file else (YDL_PREFERRED_CODEC or "m4a")
     dest_path = dest_dir / f"{filename}.{ext}"
@@ -214,16 +545,20 @@ def download_track_by_videoid(
 
     # move/copy downloaded file
     try:
-        moved = shutil.move(str(downloaded_file), str(dest_path))
-        dest_path = Path(str(moved))
+        dest_path = cover_mod.fast_move(downloaded_file, dest_path)
     except Exception:
         logger.exception("Move failed, trying copy fallback")
-        shutil.copyfile(str(downloaded_file), str(dest_path))
+        # the album folder may have been removed since it was cached
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        cover_mod.copy_file_fast(downloaded_file, dest_path)
         try:
             downloaded_file.unlink(missing_ok=True)
         except Exception:
             pass
 
+    # remember which file this video produced (see _already_downloaded)
+    _record_download(video_id, dest_path)
+
     # lyrics - skip if we don't have duration (which we won't in skip_metadata mode)
     lyrics_lrc_path: Optional[Path] = None
     if not skip_metadata:  # Only try lyrics if we have metadata
@@ -231,14 +566,13 @@ def download_track_by_videoid(
             if fetch_lyrics and artists_list and final_title and final_album and isinstance(duration_sec, int) and duration_sec > 0:
                 temp_lrc = fetch_lyrics(artists_list, final_title, final_album, duration_sec)
                 if temp_lrc:
-                    dest_lyrics = dest_dir / Path(str(temp_lrc)).name
+                    dest_lyrics = dest_dir / os.path.basename(temp_lrc)
                     try:
                         moved = None
-                        if hasattr(cover_mod, "move_if_exists"):
-                            moved = cover_mod.move_if_exists(temp_lrc, dest_lyrics)
+                        if _move_lyrics is not None:
+                            moved = _move_lyrics(temp_lrc, dest_lyrics)
                         else:
-                            moved = shutil.move(str(temp_lrc), str(dest_lyrics))
-                            moved = Path(str(moved))
+                            moved = cover_mod.fast_move(temp_lrc, dest_lyrics)
                         if isinstance(moved, Path):
                             lyrics_lrc_path = moved
                     except Exception:
@@ -253,13 +587,10 @@ def download_track_by_videoid(
             album_cover = dest_dir / "cover.jpg"
             try:
                 moved_cover = None
-                if hasattr(cover_mod, "move_cover_if_exists"):
-                    moved_cover = cover_mod.move_cover_if_exists(cover_path_file, album_cover)
-                elif hasattr(cover_mod, "move_if_exists"):
-                    moved_cover = cover_mod.move_if_exists(cover_path_file, album_cover)
+                if _move_cover is not None:
+                    moved_cover = _move_cover(cover_path_file, album_cover)
                 else:
-                    moved_cover = shutil.move(str(cover_path_file), str(album_cover))
-                    moved_cover = Path(str(moved_cover))
+                    moved_cover = cover_mod.fast_move(cover_path_file, album_cover)
                 if isinstance(moved_cover, Path) and moved_cover.exists():
                     cover_path_file = moved_cover
                     final_cover_path = str(moved_cover)
@@ -271,8 +602,8 @@ def download_track_by_videoid(
 
     # embed tags
     try:
-        if hasattr(embed_mod, "embed_tags"):
-            embed_mod.embed_tags(
+        if _embed_tags is not None:
+            _embed_tags(
                 str(dest_path),
                 title=str(final_title),
                 album=str(final_album),
@@ -288,14 +619,161 @@ def download_track_by_videoid(
     except Exception:
         logger.exception("Failed embedding tags for %s", dest_path)
 
-    # set permissions
+    # set permissions off the caller's path
+    chmod_paths = [os.fspath(p) for p in (dest_path, cover_path_file, lyrics_lrc_path) if p]
     try:
-        dest_path.chmod(0o644)
-        if cover_path_file and cover_path_file.exists():
-            cover_path_file.chmod(0o644)
-        if lyrics_lrc_path and lyrics_lrc_path.exists():
-            lyrics_lrc_path.chmod(0o644)
+        _POST_POOL.submit(_batch_chmod, chmod_paths, 0o644)
+    except RuntimeError:
+        # pool already shut down
+        _batch_chmod(chmod_paths, 0o644)
+
+    return str(dest_path), final_cover_path
+
+
+def _probe_needed(skip_metadata: bool, cover_path_override: Optional[Union[str, Path]] = None) -> bool:
+    """
+    Whether the download stage has to extract yt-dlp metadata. Titles and
+    tags come from the caller, so the info dict only feeds the thumbnail and
+    the lyrics duration: with a usable cover override and no lyrics helper
+    the probe is skipped even if the caller asked for metadata.
+    """
+    if skip_metadata:
+        return False
+    if fetch_lyrics is not None or not cover_path_override:
+        return True
+    try:
+        cand = Path(cover_path_override)
+        return not (cand.is_file() and os.access(cand, os.R_OK))
     except Exception:
-        pass
+        return True
+
+
+# --- main public function ---
+def download_track_by_videoid(
+    video_id: str,
+    artist_name: Optional[str] = None,
+    album_name: Optional[str] = None,
+    track_title: Optional[str] = None,
+    track_number: Optional[int] = None,
+    year: Optional[Union[str, int]] = None,
+    cover_path_override: Optional[Union[str, Path]] = None,
+    skip_metadata: bool = True,  # NEW: Skip metadata extraction
+) -> tuple[str, Optional[str]]:
+    """
+    Downloads track (yt-dlp), puts final file under MUSIC_DIR/{artist}/{album}/
+    and returns (file_path, cover_path).
+
+    Args:
+        video_id: YouTube video ID
+        artist_name: Artist name for metadata
+        album_name: Album name for metadata
+        track_title: Track title for metadata
+        track_number: Track number for metadata
+        year: Release year for metadata
+        cover_path_override: Path to already existing cover (used if valid)
+        skip_metadata: If True, skip metadata extraction (faster, fewer requests)
+
+    Returns:
+        tuple: (final_track_path, final_cover_path or None)
+    """
+    existing = _already_downloaded(video_id, artist_name, album_name, track_title, track_number)
+    if existing is not None:
+        return existing
+
+    audio_file, info_dict, duration_sec = _download_audio(
+        video_id,
+        skip_metadata=not _probe_needed(skip_metadata, cover_path_override),
+        prefetch_cover=not cover_path_override,
+    )
+    return _finalize_download(
+        video_id, audio_file, info_dict, duration_sec,
+        artist_name=artist_name,
+        album_name=album_name,
+        track_title=track_title,
+        track_number=track_number,
+        year=year,
+        cover_path_override=cover_path_override,
+        skip_metadata=skip_metadata,
+    )
+
+
+def download_tracks_pipelined(
+    items: List[Dict[str, Any]],
+    transcode_workers: int = 1,
+    max_pending: int = 2,
+) -> List[Dict[str, Any]]:
+    """
+    Download several tracks with network and ffmpeg work overlapped.
+
+    The calling thread fetches raw streams one after another and hands each one
+    to `transcode_workers` threads that run audio extraction and the library
+    stage, so the next download starts while the previous file is converted.
+    At most `max_pending` raw files wait for conversion at any time.
+
+    Args:
+        items: list of keyword-argument dicts for download_track_by_videoid
+               (each must contain "video_id")
+
+    Returns:
+        One dict per item, in input order:
+        {"video_id", "ok", "file_path", "cover_path", "error"}
+    """
+    results: List[Dict[str, Any]] = [
+        {"video_id": item.get("video_id"), "ok": False, "file_path": None, "cover_path": None, "error": None}
+        for item in items
+    ]
+    if not items:
+        return results
+
+    pending: "queue.Queue[Optional[Tuple[int, Dict[str, Any], Path, Dict[str, Any], Optional[int]]]]" = queue.Queue(
+        maxsize=max(1, int(max_pending))
+    )
+
+    def _consumer() -> None:
+        while True:
+            job = pending.get()
+            if job is None:
+                return
+            idx, item, raw_file, info_dict, duration_sec = job
+            res = results[idx]
+            try:
+                audio_file = _extract_audio(raw_file)
+                opts = {k: v for k, v in item.items() if k != "video_id"}
+                file_path, cover_path = _finalize_download(item["video_id"], audio_file, info_dict, duration_sec, **opts)
+                res.update(ok=True, file_path=file_path, cover_path=cover_path)
+            except Exception as e:
+                logger.exception("Pipelined processing failed for %s", res["video_id"])
+                res["error"] = str(e)
+
+    workers = [
+        threading.Thread(target=_consumer, name=f"ffmpeg-{i}", daemon=True)
+        for i in range(max(1, int(transcode_workers)))
+    ]
+    for w in workers:
+        w.start()
+
+    try:
+        for idx, item in enumerate(items):
+            existing = _already_downloaded(**item)
+            if existing is not None:
+                results[idx].update(ok=True, file_path=existing[0], cover_path=existing[1])
+                continue
+            try:
+                raw_file, info_dict, duration_sec = _download_audio(
+                    item["video_id"],
+                    skip_metadata=not _probe_needed(item.get("skip_metadata", True), item.get("cover_path_override")),
+                    prefetch_cover=not item.get("cover_path_override"),
+                    extract_audio=False,
+                )
+            except Exception as e:
+                logger.exception("Pipelined download failed for %s", results[idx]["video_id"])
+                results[idx]["error"] = str(e)
+                continue
+            pending.put((idx, item, raw_file, info_dict, duration_sec))
+    finally:
+        for _ in workers:
+            pending.put(None)
+        for w in workers:
+            w.join()
 
-    return str(dest_path), final_cover_path
\ No newline at end of file
+    return results
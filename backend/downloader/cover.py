@@ -1,182 +1,566 @@
 # downloader/cover.py
 from __future__ import annotations
+import atexit
+import errno
+import hashlib
+import io
 import logging
 import os
 import shutil
 import subprocess
+import sys
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Union
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union, cast
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ..config import COVER_CACHE_DIR, COVER_CACHE_MAX_BYTES, COVER_CACHE_TTL, MAX_COVER_DIM
 
 logger = logging.getLogger("downloader.cover")
 if not logging.getLogger().handlers:
-    import sys, logging as _logging
+    import logging as _logging
     _logging.basicConfig(stream=sys.stderr, level=os.environ.get("LOG_LEVEL", "INFO"))
 
+# Shared HTTP session: keeps connections to the thumbnail hosts alive across
+# covers (sized for the downloader's cover prefetch pool)
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) YTMusicDownloader",
+    "Accept": "image/*",
+    "Accept-Encoding": "identity",
+})
+for _scheme in ("https://", "http://"):
+    _SESSION.mount(_scheme, HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504]),
+    ))
+
+
+def close_session() -> None:
+    """Close pooled HTTP connections (registered with atexit)."""
+    try:
+        _SESSION.close()
+    except Exception:
+        pass
+
+
+atexit.register(close_session)
+
 # Try import Pillow
 try:
     from PIL import Image  # type: ignore
     _HAS_PIL = True
+    # refuse decompression-bomb sized covers early
+    Image.MAX_IMAGE_PIXELS = 100_000_000
 except Exception:
     _HAS_PIL = False
 
+# Optional AVIF support for older Pillow (registers itself on import)
+try:
+    import pillow_avif  # type: ignore  # noqa: F401
+except Exception:
+    pass
+
+# Optional PyTurboJPEG for encoding (Pillow wheels already bundle
+# libjpeg-turbo, this skips Pillow's encoder setup); handle created once
+try:
+    import numpy as _np  # type: ignore
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_420  # type: ignore
+    _TURBO: Any = TurboJPEG()
+except Exception:
+    _TURBO = None
+
+JPEG_QUALITY = 85
+
+
+def _encode_jpeg(img: Any, dest: Path, quality: int = JPEG_QUALITY) -> Path:
+    """Write an RGB Pillow image to dest as JPEG (TurboJPEG when available)."""
+    if _TURBO is not None:
+        try:
+            data = _TURBO.encode(
+                _np.asarray(img), quality=quality, pixel_format=TJPF_RGB, jpeg_subsample=TJSAMP_420
+            )
+            with open(dest, "wb") as fh:
+                fh.write(data)
+            return dest
+        except Exception:
+            logger.debug("TurboJPEG encode failed, using Pillow", exc_info=True)
+    img.save(dest, format="JPEG", quality=quality, optimize=True, progressive=True)
+    return dest
+
+
+def _fit_cover(img: Any) -> Any:
+    """Downscale img in place so its longest side is at most MAX_COVER_DIM."""
+    if MAX_COVER_DIM > 0 and max(img.size) > MAX_COVER_DIM:
+        img.thumbnail((MAX_COVER_DIM, MAX_COVER_DIM), Image.LANCZOS)
+    return img
+
+
+def _shrink_jpeg_file(path: Path) -> None:
+    """Re-encode an oversized JPEG on disk; only the header is read if it already fits."""
+    if not _HAS_PIL or MAX_COVER_DIM <= 0:
+        return
+    try:
+        with Image.open(path) as img:
+            if max(img.size) <= MAX_COVER_DIM:
+                return
+            # let libjpeg decode at 1/2, 1/4 or 1/8 scale (DCT scaling) first
+            img.draft("RGB", (MAX_COVER_DIM, MAX_COVER_DIM))
+            small = _fit_cover(img.convert("RGB"))
+        _encode_jpeg(small, path)
+    except Exception:
+        logger.debug("Could not downscale cover %s", path, exc_info=True)
+
 
 def select_best_thumbnail_url(candidates: Iterable[Union[str, Dict[str, Any]]]) -> Optional[str]:
     """
     Picks the "best" URL from candidates.
     candidates: iterable of str or dict with 'url' key or 'thumbnail' or nested thumbnail).
     Strategy:
-      - if dicts with width/height, pick biggest width
+      - if dicts with width, pick biggest width
       - else, return last plausible url found
     """
-    thumbs: List[Dict[str, Optional[Any]]] = []
+    best_url: Optional[str] = None
+    best_w = -1
     last_url: Optional[str] = None
 
-    for it in candidates or []:
-        if it is None:
-            continue
-
+    # single pass: track the widest candidate and the last plausible url
+    for it in candidates or ():
         # simple case : string
         if isinstance(it, str):
             last_url = it
-            thumbs.append({"url": it, "width": None, "height": None})
+            continue
+        if not isinstance(it, dict):
             continue
 
-        # dict case : try to extract url,width,height
-        if isinstance(it, dict):
-            url = it.get("url") or it.get("thumbnail") or None
-            if isinstance(url, dict):
-                # nested thumbnail object
-                url = url.get("url") or None
-
-            width: Optional[int] = None
-            height: Optional[int] = None
+        url = it.get("url") or it.get("thumbnail")
+        if isinstance(url, dict):
+            # nested thumbnail object
+            url = url.get("url")
+        if not isinstance(url, str):
+            continue
+        last_url = url
 
-            w = it.get("width") or it.get("w")
-            if w is not None:
-                try:
-                    width = int(w)
-                except Exception:
-                    width = None
+        w = it.get("width") or it.get("w")
+        if w is not None and not isinstance(w, int):
+            try:
+                w = int(w)
+            except Exception:
+                continue
+        if isinstance(w, int) and w > best_w:
+            best_w, best_url = w, url
 
-            h = it.get("height") or it.get("h")
-            if h is not None:
-                try:
-                    height = int(h)
-                except Exception:
-                    height = None
+    return best_url or last_url
 
-            if isinstance(url, str):
-                last_url = url
-                thumbs.append({"url": url, "width": width, "height": height})
 
-    # prefer biggest known width
-    best: Optional[str] = None
-    best_w = -1
-    for t in thumbs:
-        w = t.get("width")
-        if isinstance(w, int) and w > best_w:
-            candidate_url = t.get("url")
-            if isinstance(candidate_url, str):
-                best = candidate_url
-                best_w = w
-
-    if best is not None:
-        return best
-    return last_url
+def _as_path(x: Union[str, Path]) -> Path:
+    return x if isinstance(x, Path) else Path(x)
 
 
 def _write_bytes_to_path(content: bytes, dest: Union[str, Path]) -> Path:
-    p = Path(str(dest))
+    p = _as_path(dest)
     p.parent.mkdir(parents=True, exist_ok=True)
-    with open(p, "wb") as fh:
+    with p.open("wb") as fh:
         fh.write(content)
     return p
 
 
-def save_cover_from_url(url: str, dest: Union[str, Path], timeout: float = 12.0) -> Optional[Path]:
+def _sniff_image_format(b: bytes) -> str:
+    """Identify an image from its first 12 bytes: 'jpeg', 'png', 'webp' or 'unknown'."""
+    if b[:3] == b"\xff\xd8\xff":
+        return "jpeg"
+    if b[:8] == b"\x89PNG\r\n\x1a\n":
+        return "png"
+    if b[:4] == b"RIFF" and b[8:12] == b"WEBP":
+        return "webp"
+    return "unknown"
+
+
+# Bodies up to this size are buffered in memory, larger ones spill to a temp file
+_SPOOL_THRESHOLD = 4 * 1024 * 1024
+# never preallocate more than this from an (untrusted) Content-Length
+_PREALLOC_CAP = 8 * 1024 * 1024
+
+
+def _read_body(r: requests.Response, head: bytes = b"") -> IO[bytes]:
     """
-    Downloads image from URL and converts to JPEG if necessary.
-    Returns Path to created file or None if fail.
+    Read a streamed response (whose first bytes, `head`, were already
+    consumed) into a rewound file object: an in-memory buffer preallocated
+    from Content-Length, or a spooled temp file for large bodies.
     """
     try:
-        r = requests.get(url, timeout=timeout)
-        r.raise_for_status()
-        content = r.content
-    except Exception:
-        logger.exception("Failed to download cover %s", url)
-        return None
+        length = int(r.headers.get("content-length") or 0)
+    except ValueError:
+        length = 0
 
-    destp = Path(str(dest))
-    destp.parent.mkdir(parents=True, exist_ok=True)
+    if length > _SPOOL_THRESHOLD:
+        spool = tempfile.SpooledTemporaryFile(max_size=_SPOOL_THRESHOLD)
+        spool.write(head)
+        shutil.copyfileobj(r.raw, spool, 65536)
+        spool.seek(0)
+        return cast(IO[bytes], spool)
 
-    # Attempt to write directly if content-type claims jpeg/png
-    ctype = ""
-    try:
-        ctype = (r.headers.get("content-type") or "").lower()
-    except Exception:
-        pass
+    buf = bytearray(max(min(length, _PREALLOC_CAP), len(head)))
+    n = len(head)
+    buf[:n] = head
+    view = memoryview(buf)
+    while n < len(buf):
+        got = r.raw.readinto(view[n:])
+        if not got:
+            break
+        n += got
+    view.release()
+    del buf[n:]
+    # length unknown or larger than announced: read the rest
+    buf += r.raw.read()
+    return io.BytesIO(buf)
 
-    # If JPEG/PNG, write as-is but ensure .jpg extension
+
+def _fetch_cover(
+    url: str,
+    destp: Path,
+    timeout: float,
+    etag: Optional[str] = None,
+) -> Tuple[Optional[Path], Optional[str], bool]:
+    """
+    Download (and convert if needed) the image at url to destp as JPEG.
+    Returns (saved path or None, response ETag, not_modified); with `etag`
+    a conditional GET is made and a 304 returns (None, etag, True).
+    """
+    headers = {"If-None-Match": etag} if etag else None
     try:
-        if "jpeg" in ctype or "jpg" in ctype or "png" in ctype:
-            # ensure extension .jpg
-            final = destp.with_suffix(".jpg")
-            with open(final, "wb") as fh:
-                fh.write(content)
-            return final
+        with _SESSION.get(url, timeout=timeout, stream=True, headers=headers) as r:
+            if r.status_code == 304:
+                return None, etag, True
+            r.raise_for_status()
+            r.raw.decode_content = True
+            resp_etag = r.headers.get("etag")
+            destp.parent.mkdir(parents=True, exist_ok=True)
+
+            # Already JPEG (by magic bytes, CDNs mislabel content-type):
+            # stream straight to disk with a .jpg extension
+            head = r.raw.read(12)
+            if _sniff_image_format(head) == "jpeg":
+                final = destp.with_suffix(".jpg")
+                # stream under a temp name in the same directory, so a dropped
+                # connection never leaves a truncated cover at the final path
+                tmp = final.with_suffix(".tmp")
+                try:
+                    with open(tmp, "wb") as fh:
+                        fh.write(head)
+                        shutil.copyfileobj(r.raw, fh, 65536)
+                    _shrink_jpeg_file(tmp)
+                    os.replace(tmp, final)
+                except BaseException:
+                    try:
+                        os.unlink(tmp)
+                    except OSError:
+                        pass
+                    raise
+                return final, resp_etag, False
+
+            # PNG/WebP/unknown needs conversion
+            body = _read_body(r, head)
     except Exception:
-        logger.debug("Direct write failed, will try conversion", exc_info=True)
+        logger.exception("Failed to download cover %s", url)
+        return None, None, False
 
-    # Try Pillow conversion to JPEG
+    # Pillow conversion to JPEG (WebP built in, AVIF via Pillow or pillow_avif)
     if _HAS_PIL:
         try:
-            bio = tempfile.SpooledTemporaryFile()
-            bio.write(content)
-            bio.seek(0)
-            img = Image.open(bio).convert("RGB")
-            final = destp.with_suffix(".jpg")
-            img.save(final, format="JPEG", quality=85)
-            return final
+            img = _fit_cover(Image.open(body).convert("RGB"))
+            return _encode_jpeg(img, destp.with_suffix(".jpg")), resp_etag, False
         except Exception:
-            logger.debug("Pillow conversion failed", exc_info=True)
+            logger.exception("Pillow conversion failed for cover %s", url)
+            return None, None, False
+        finally:
+            body.close()
 
-    # Last resort: use ffmpeg to convert
+    # Last resort without Pillow: use ffmpeg to convert
+    tmpname: Optional[str] = None
+    final = destp.with_suffix(".jpg")
     try:
+        body.seek(0)
         with tempfile.NamedTemporaryFile(delete=False, suffix=".bin") as tmpf:
-            tmpf.write(content)
             tmpname = tmpf.name
-        final = destp.with_suffix(".jpg")
-        cmd = ["ffmpeg", "-y", "-i", tmpname, str(final)]
+            shutil.copyfileobj(body, tmpf)
+        cmd = ["ffmpeg", "-y", "-i", tmpname]
+        if MAX_COVER_DIM > 0:
+            d = MAX_COVER_DIM
+            cmd += ["-vf", f"scale='min(iw,{d})':'min(ih,{d})':force_original_aspect_ratio=decrease"]
+        cmd.append(os.fspath(final))
         subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        try:
-            os.unlink(tmpname)
-        except Exception:
-            pass
-        return final
+        return final, resp_etag, False
     except Exception:
         logger.exception("ffmpeg conversion failed for cover %s", url)
+        # a failed ffmpeg run can leave a partial output behind
+        final.unlink(missing_ok=True)
+        return None, None, False
+    finally:
+        body.close()
+        if tmpname is not None:
+            try:
+                os.unlink(tmpname)
+            except OSError:
+                pass
+
+# --- on-disk cover cache ---
+# COVER_CACHE_DIR/<blake2b(url)>.jpg holds the converted cover, .etag the
+# validator. The .etag mtime is when the entry was last validated (freshness),
+# the .jpg mtime when it was last used (LRU eviction).
+def _cover_cache_paths(url: str) -> Tuple[Path, Path]:
+    key = hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+    base = Path(COVER_CACHE_DIR)
+    return base / f"{key}.jpg", base / f"{key}.etag"
+
+
+def _copy_from_cache(cached: Path, destp: Path) -> Optional[Path]:
+    final = destp.with_suffix(".jpg")
+    try:
+        final.parent.mkdir(parents=True, exist_ok=True)
+        # a copy, not a hardlink: the album cover.jpg may be rewritten later
+        copy_file_fast(cached, final)
+        os.utime(cached)
+        return final
+    except OSError:
+        logger.debug("Cover cache copy failed for %s", cached, exc_info=True)
         return None
 
 
+# running size of the cache in this process; None until the first scan.
+# Other processes also write here, so it is re-synced by every full scan.
+_cache_bytes: Optional[int] = None
+_cache_lock = threading.Lock()
+
+
+def _store_in_cache(saved: Path, cached: Path, etag_file: Path, etag: Optional[str]) -> None:
+    global _cache_bytes
+    tmp: Optional[str] = None
+    try:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        # unique temp name: concurrent fetches of the same URL must not share one
+        fd, tmp = tempfile.mkstemp(dir=COVER_CACHE_DIR, suffix=".tmp")
+        os.close(fd)
+        copy_file_fast(saved, Path(tmp))
+        size = os.path.getsize(tmp)
+        os.replace(tmp, cached)
+        tmp = None
+        etag_file.write_text(etag or "", encoding="utf-8")
+    except OSError:
+        logger.debug("Could not cache cover %s", cached, exc_info=True)
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+        return
+    with _cache_lock:
+        if _cache_bytes is not None:
+            _cache_bytes += size
+            if _cache_bytes <= COVER_CACHE_MAX_BYTES:
+                return
+        _evict_cover_cache()
+
+
+def _evict_cover_cache() -> None:
+    """
+    Drop least recently used covers until the cache fits COVER_CACHE_MAX_BYTES.
+    Only runs (with the full directory scan) once the running size says the
+    cache may be over budget; caller holds _cache_lock.
+    """
+    global _cache_bytes
+    entries = []
+    total = 0
+    try:
+        with os.scandir(COVER_CACHE_DIR) as it:
+            for entry in it:
+                if entry.name.endswith(".jpg"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+    except OSError:
+        return
+    if total > COVER_CACHE_MAX_BYTES:
+        for _mtime, size, path in sorted(entries):
+            for p in (path, path[:-4] + ".etag"):
+                try:
+                    os.unlink(p)
+                except OSError:
+                    pass
+            total -= size
+            if total <= COVER_CACHE_MAX_BYTES:
+                break
+    _cache_bytes = total
+
+
+def save_cover_from_url(url: str, dest: Union[str, Path], timeout: float = 12.0) -> Optional[Path]:
+    """
+    Downloads image from URL and converts to JPEG if necessary.
+    Returns Path to created file or None if fail.
+    Covers are cached on disk by URL and revalidated with If-None-Match
+    once older than COVER_CACHE_TTL.
+    """
+    destp = _as_path(dest)
+    cached, etag_file = _cover_cache_paths(url)
+    etag: Optional[str] = None
+    try:
+        if cached.is_file():
+            validated_at = etag_file.stat().st_mtime
+            if time.time() - validated_at < COVER_CACHE_TTL:
+                hit = _copy_from_cache(cached, destp)
+                if hit is not None:
+                    return hit
+            etag = etag_file.read_text(encoding="utf-8").strip() or None
+    except OSError:
+        etag = None
+
+    saved, resp_etag, not_modified = _fetch_cover(url, destp, timeout, etag)
+    if not_modified:
+        try:
+            os.utime(etag_file)
+        except OSError:
+            pass
+        hit = _copy_from_cache(cached, destp)
+        if hit is not None:
+            return hit
+        # cache vanished meanwhile: fetch unconditionally
+        saved, resp_etag, _ = _fetch_cover(url, destp, timeout)
+    if saved is not None:
+        _store_in_cache(saved, cached, etag_file, resp_etag)
+    return saved
+
+
 # alias kept for compatibility
 save_and_convert_cover = save_cover_from_url
 
 
+def iter_save_covers(
+    items: Iterable[Tuple[str, Union[str, Path]]],
+    max_workers: int = 8,
+) -> Iterator[Tuple[Path, Optional[Path]]]:
+    """
+    Fetch several covers concurrently over the shared session.
+    items: (url, dest) pairs. Yields (dest, saved path or None) as each
+    download completes, so callers can start on finished covers early.
+    """
+    pairs = [(url, _as_path(dest)) for url, dest in items]
+    if not pairs:
+        return
+    # the session pool (pool_maxsize=32) bounds useful concurrency
+    workers = max(1, min(int(max_workers), len(pairs), 32))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cover") as executor:
+        futures = {executor.submit(save_cover_from_url, url, dest): dest for url, dest in pairs}
+        for fut in as_completed(futures):
+            try:
+                yield futures[fut], fut.result()
+            except Exception:
+                logger.exception("Bulk cover download failed for %s", futures[fut])
+                yield futures[fut], None
+
+
+def save_covers_bulk(
+    items: Iterable[Tuple[str, Union[str, Path]]],
+    max_workers: int = 8,
+) -> Dict[Path, Optional[Path]]:
+    """Like iter_save_covers, but waits for all and returns {dest: saved path or None}."""
+    return dict(iter_save_covers(items, max_workers=max_workers))
+
+
+# errors meaning "this kernel copy primitive can't handle these files"
+_COPY_UNSUPPORTED = {errno.EINVAL, errno.ENOSYS, errno.EXDEV, errno.EOPNOTSUPP, errno.EBADF, errno.ENOTSOCK}
+
+
+def _copy_range(in_fd: int, out_fd: int, size: int) -> int:
+    """copy_file_range loop (reflink on Btrfs/XFS); returns bytes copied."""
+    copied = 0
+    while copied < size:
+        n = os.copy_file_range(in_fd, out_fd, size - copied)
+        if n == 0:
+            break
+        copied += n
+    return copied
+
+
+def _sendfile_range(in_fd: int, out_fd: int, size: int) -> int:
+    """sendfile loop (in-kernel page copy); returns bytes copied."""
+    copied = 0
+    while copied < size:
+        n = os.sendfile(out_fd, in_fd, copied, size - copied)
+        if n == 0:
+            break
+        copied += n
+    return copied
+
+
+def copy_file_fast(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """
+    Copy src to dst without moving the data through Python: copy_file_range
+    first, then sendfile, then shutil.copyfileobj when neither is supported.
+    """
+    if sys.platform == "darwin":
+        # shutil.copyfile uses fcopyfile(3) there, sendfile only targets sockets
+        shutil.copyfile(src, dst)
+        shutil.copymode(src, dst)
+        return
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        in_fd, out_fd = fin.fileno(), fout.fileno()
+        size = os.fstat(in_fd).st_size
+        copied = False
+        for name, func in (("copy_file_range", _copy_range), ("sendfile", _sendfile_range)):
+            if not hasattr(os, name):
+                continue
+            try:
+                func(in_fd, out_fd, size)
+                copied = True
+                break
+            except OSError as e:
+                if e.errno not in _COPY_UNSUPPORTED:
+                    raise
+                # nothing usable written; rewind both sides for the next method
+                os.lseek(in_fd, 0, os.SEEK_SET)
+                os.lseek(out_fd, 0, os.SEEK_SET)
+                os.ftruncate(out_fd, 0)
+        if not copied:
+            shutil.copyfileobj(fin, fout)
+    shutil.copymode(src, dst)
+
+
+def fast_move(src: Union[str, Path], dst: Union[str, Path]) -> Path:
+    """
+    Move src to dst: a single rename on the same filesystem, a kernel-side
+    copy (copy_file_fast) followed by unlink across devices. Raises OSError
+    on failure.
+    """
+    s = _as_path(src)
+    d = _as_path(dst)
+    try:
+        s.replace(d)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        copy_file_fast(s, d)
+        s.unlink(missing_ok=True)
+    return d
+
+
 def _move_file(src: Union[str, Path], dst: Union[str, Path]) -> Optional[Path]:
-    s = Path(str(src))
-    d = Path(str(dst))
+    s = _as_path(src)
+    d = _as_path(dst)
     if not s.exists():
         return None
     d.parent.mkdir(parents=True, exist_ok=True)
     try:
-        moved = shutil.move(str(s), str(d))
-        return Path(str(moved))
+        return fast_move(s, d)
     except Exception:
         try:
-            shutil.copyfile(str(s), str(d))
+            copy_file_fast(s, d)
             try:
                 s.unlink(missing_ok=True)
             except Exception:
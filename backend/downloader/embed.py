@@ -1,9 +1,12 @@
 # downloader/embed.py
 from __future__ import annotations
+import functools
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 logger = logging.getLogger("downloader.embed")
 if not logging.getLogger().handlers:
@@ -14,75 +17,114 @@ if not logging.getLogger().handlers:
 try:
     from mutagen import File as MutagenFile  # type: ignore
     from mutagen.mp4 import MP4, MP4Cover  # type: ignore
-    from mutagen.id3 import ID3, TIT2, TALB, TPE1, TPE2, TRCK, APIC, USLT  # type: ignore
+    from mutagen.id3 import ID3, TIT2, TALB, TPE1, TPE2, TRCK, TDRC, APIC, USLT  # type: ignore
     _HAS_MUTAGEN = True
 except Exception:
     _HAS_MUTAGEN = False
 
 
+# cover mime type by file extension
+_COVER_MIME = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg"}
+
+
 def _read_bytes(p: Union[str, Path]) -> Optional[bytes]:
     try:
-        return Path(str(p)).read_bytes()
+        return (p if isinstance(p, Path) else Path(p)).read_bytes()
+    except Exception:
+        return None
+
+
+# (data, mime, MP4Cover image format)
+CoverPayload = Tuple[bytes, str, int]
+
+
+@functools.lru_cache(maxsize=8)
+def _cover_payload(path: str, mtime_ns: int, size: int) -> Optional[CoverPayload]:
+    # mtime/size are part of the key so a replaced cover is re-read
+    data = _read_bytes(path)
+    if not data:
+        return None
+    mime = _COVER_MIME.get(os.path.splitext(path)[1].lower(), "image/jpeg")
+    fmt = MP4Cover.FORMAT_PNG if mime == "image/png" else MP4Cover.FORMAT_JPEG
+    return data, mime, fmt
+
+
+@functools.lru_cache(maxsize=64)
+def _lyrics_text(path: str, mtime_ns: int, size: int) -> Optional[str]:
+    try:
+        return Path(path).read_text(encoding="utf-8", errors="ignore") or None
     except Exception:
         return None
 
 
+def _load_lyrics(lyrics_path: Optional[Union[str, Path]]) -> Optional[str]:
+    """Decoded lyrics text, read once per file version."""
+    if not lyrics_path:
+        return None
+    path = os.fspath(lyrics_path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return _lyrics_text(path, st.st_mtime_ns, st.st_size)
+
+
+def _load_cover(cover_path: Optional[Union[str, Path]]) -> Optional[CoverPayload]:
+    """Cover bytes + mime, read once per album while tracks are tagged in a row."""
+    if not cover_path:
+        return None
+    path = os.fspath(cover_path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return _cover_payload(path, st.st_mtime_ns, st.st_size)
+
+
+# MP4 atom -> (embed field, value -> atom list or None to skip); None fields are skipped
+_MP4_FIELDS: Tuple[Tuple[str, str, Callable[[Any], Any]], ...] = (
+    ("\xa9nam", "title", lambda v: [str(v)]),
+    ("\xa9alb", "album", lambda v: [str(v)]),
+    ("\xa9ART", "artists", lambda v: [str(a) for a in v] if v else None),
+    ("aART", "album_artist", lambda v: [str(v)] if v else None),
+    ("trkn", "track_number", lambda v: [(int(v), 0)] if v else None),
+    ("\xa9day", "year", lambda v: [str(v)] if v else None),
+    ("\xa9lyr", "lyrics", lambda v: [v] if v else None),
+    ("covr", "cover", lambda c: [MP4Cover(c[0], imageformat=c[2])]),
+)
+
+
 def _embed_mp4_tags(path: Path,
                     title: Optional[str],
                     album: Optional[str],
                     artists: Optional[Iterable[str]],
                     album_artist: Optional[str],
-                    lyrics_path: Optional[Union[str, Path]],
-                    cover_path: Optional[Union[str, Path]],
+                    lyrics: Optional[str],
+                    cover: Optional[CoverPayload],
                     track_number: Optional[int],
                     year: Optional[str]) -> None:
     """
     Embed tags into M4A/MP4 file using mutagen.mp4.MP4.
     """
     try:
-        mp4 = MP4(str(path))
-        if title is not None:
-            mp4["\xa9nam"] = [str(title)]
-        if album is not None:
-            mp4["\xa9alb"] = [str(album)]
-        if artists:
-            mp4["\xa9ART"] = [str(a) for a in artists]
-        if album_artist:
-            mp4["aART"] = [str(album_artist)]
-        if track_number:
+        mp4 = MP4(path)
+        values = {
+            "title": title, "album": album, "artists": artists, "album_artist": album_artist,
+            "track_number": track_number, "year": year, "lyrics": lyrics, "cover": cover,
+        }
+        atoms: Dict[str, Any] = {}
+        for key, field, convert in _MP4_FIELDS:
+            v = values[field]
+            if v is None:
+                continue
             try:
-                mp4["trkn"] = [(int(track_number), 0)]
+                atom = convert(v)
             except Exception:
-                pass
-        if year:
-            try:
-                mp4["\xa9day"] = [str(year)]
-            except Exception:
-                pass
-        # lyrics
-        if lyrics_path:
-            lyrics_bytes = _read_bytes(lyrics_path)
-            if lyrics_bytes:
-                try:
-                    # MP4 lyric tag key often ©lyr
-                    mp4["©lyr"] = [lyrics_bytes.decode("utf-8", errors="ignore")]
-                except Exception:
-                    try:
-                        mp4["\xa9lyr"] = [lyrics_bytes.decode("utf-8", errors="ignore")]
-                    except Exception:
-                        logger.debug("Could not set MP4 lyric tag, skipping")
-        # cover
-        if cover_path:
-            cover_bytes = _read_bytes(cover_path)
-            if cover_bytes:
-                # choose format by extension
-                fmt = None
-                ext = str(cover_path).lower()
-                if ext.endswith(".png"):
-                    fmt = MP4Cover.FORMAT_PNG
-                else:
-                    fmt = MP4Cover.FORMAT_JPEG
-                mp4["covr"] = [MP4Cover(cover_bytes, imageformat=fmt)]
+                logger.debug("Could not set MP4 %s tag, skipping", field)
+                continue
+            if atom is not None:
+                atoms[key] = atom
+        mp4.update(atoms)
         mp4.save()
     except Exception:
         logger.exception("MP4 embedding failed for %s", path)
@@ -92,55 +134,38 @@ def _embed_mp3_tags(path: Path,
                     album: Optional[str],
                     artists: Optional[Iterable[str]],
                     album_artist: Optional[str],
-                    lyrics_path: Optional[Union[str, Path]],
-                    cover_path: Optional[Union[str, Path]],
+                    lyrics: Optional[str],
+                    cover: Optional[CoverPayload],
                     track_number: Optional[int],
                     year: Optional[str]) -> None:
     """
     Embed tags into MP3 file using ID3 frames.
     """
     try:
-        try:
-            id3 = ID3(str(path))
-        except Exception:
-            id3 = ID3()
+        # full tag set is rewritten: start empty instead of parsing the old tag
+        id3 = ID3()
         if title is not None:
-            id3.delall("TIT2")
-            id3.add(TIT2(encoding=3, text=[str(title)]))
+            id3.setall("TIT2", [TIT2(encoding=3, text=[str(title)])])
         if album is not None:
-            id3.delall("TALB")
-            id3.add(TALB(encoding=3, text=[str(album)]))
+            id3.setall("TALB", [TALB(encoding=3, text=[str(album)])])
         if artists:
-            id3.delall("TPE1")
-            id3.add(TPE1(encoding=3, text=[", ".join(str(a) for a in artists)]))
+            id3.setall("TPE1", [TPE1(encoding=3, text=[", ".join(str(a) for a in artists)])])
         if album_artist:
-            id3.delall("TPE2")
-            id3.add(TPE2(encoding=3, text=[str(album_artist)]))
+            id3.setall("TPE2", [TPE2(encoding=3, text=[str(album_artist)])])
         if track_number:
-            id3.delall("TRCK")
-            id3.add(TRCK(encoding=3, text=[str(track_number)]))
+            id3.setall("TRCK", [TRCK(encoding=3, text=[str(track_number)])])
         if year:
-            id3.add(TALB(encoding=3, text=[str(year)]))  # not ideal but keep
+            id3.setall("TDRC", [TDRC(encoding=3, text=[str(year)])])
         # lyrics
-        if lyrics_path:
-            lyrics_bytes = _read_bytes(lyrics_path)
-            if lyrics_bytes:
-                try:
-                    txt = lyrics_bytes.decode("utf-8", errors="ignore")
-                    id3.delall("USLT")
-                    id3.add(USLT(encoding=3, lang="eng", desc="", text=txt))
-                except Exception:
-                    logger.debug("Could not add USLT lyrics")
+        if lyrics:
+            try:
+                id3.setall("USLT", [USLT(encoding=3, lang="eng", desc="", text=lyrics)])
+            except Exception:
+                logger.debug("Could not add USLT lyrics")
         # cover
-        if cover_path:
-            cover_bytes = _read_bytes(cover_path)
-            if cover_bytes:
-                # try to detect mime
-                mime = "image/jpeg"
-                if str(cover_path).lower().endswith(".png"):
-                    mime = "image/png"
-                id3.delall("APIC")
-                id3.add(APIC(encoding=3, mime=mime, type=3, desc="cover", data=cover_bytes))
+        if cover:
+            cover_bytes, mime, _fmt = cover
+            id3.setall("APIC", [APIC(encoding=3, mime=mime, type=3, desc="cover", data=cover_bytes)])
         id3.save(str(path))
     except Exception:
         logger.exception("MP3 embedding failed for %s", path)
@@ -163,7 +188,7 @@ def embed_tags(file_path: str,
         logger.debug("mutagen not available, skipping embedding for %s", file_path)
         return
 
-    p = Path(str(file_path))
+    p = file_path if isinstance(file_path, Path) else Path(file_path)
     if not p.exists():
         logger.warning("embed_tags: file does not exist %s", file_path)
         return
@@ -172,12 +197,40 @@ def embed_tags(file_path: str,
     artists_list = list(artists) if artists else []
 
     try:
+        cover = _load_cover(cover_path)
+        lyrics = _load_lyrics(lyrics_path)
         # autodetect container
-        mf = MutagenFile(str(p))
+        mf = MutagenFile(p)
         if isinstance(mf, MP4) or p.suffix.lower() in (".m4a", ".mp4", ".aac", ".m4b"):
-            _embed_mp4_tags(p, title, album, artists_list, album_artist, lyrics_path, cover_path, track_number, year)
+            _embed_mp4_tags(p, title, album, artists_list, album_artist, lyrics, cover, track_number, year)
         else:
             # fallback to MP3 ID3 embedding where possible
-            _embed_mp3_tags(p, title, album, artists_list, album_artist, lyrics_path, cover_path, track_number, year)
+            _embed_mp3_tags(p, title, album, artists_list, album_artist, lyrics, cover, track_number, year)
     except Exception:
-        logger.exception("Embedding metadata failed for %s", file_path)
\ No newline at end of file
+        logger.exception("Embedding metadata failed for %s", file_path)
+
+
+def _embed_locked(item: Dict[str, Any], lock: threading.Lock) -> None:
+    with lock:
+        embed_tags(**item)
+
+
+def embed_tags_batch(items: List[Dict[str, Any]], max_workers: Optional[int] = None) -> None:
+    """
+    Embed tags for several files concurrently (mutagen file I/O releases the
+    GIL). Each item holds the keyword arguments of embed_tags.
+    """
+    if not items:
+        return
+    # realpath -> lock, scoped to this batch so two items never write the
+    # same file at once
+    keys = [os.path.realpath(os.fspath(item["file_path"])) for item in items]
+    locks: Dict[str, threading.Lock] = {key: threading.Lock() for key in keys}
+    workers = max_workers or min(8, os.cpu_count() or 1, len(items))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embed") as executor:
+        futures = [executor.submit(_embed_locked, item, locks[key]) for item, key in zip(items, keys)]
+        for fut in futures:
+            try:
+                fut.result()
+            except Exception:
+                logger.exception("Batch embedding failed")
@@ -1,8 +1,9 @@
 # backend/downloader/metadata.py
 from __future__ import annotations
+import functools
 import os
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+import stat
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..config import LYRICS_DIR
 
@@ -20,33 +21,37 @@ def normalize_artists(artists: Optional[List[Dict[str, Optional[str]]]]) -> List
     """
     Convert a list of artist refs (dicts or strings) into a cleaned list of artist names.
     """
-    out: List[str] = []
     if not artists:
-        return out
+        return []
 
+    out: List[str] = []
+    ap = out.append
     for a in artists:
         if not a:
             continue
 
-        if isinstance(a, dict):
+        # exact type checks first (common case), isinstance for subclasses
+        t = type(a)
+        if t is dict or (t is not str and isinstance(a, dict)):
             # prefer name/title, fallback to id if present
-            n = a.get("name") or a.get("title") or a.get("id") or None
+            n = a.get("name") or a.get("title") or a.get("id")
         elif isinstance(a, str):
             n = a
         else:
-            n = None
-
-        if n is None:
             continue
 
-        # ensure we operate on a str before calling strip()
-        try:
-            st = str(n).strip()
-        except Exception:
+        if not n:
             continue
-
+        if type(n) is str:
+            st = n.strip()
+        else:
+            # ensure we operate on a str before calling strip()
+            try:
+                st = str(n).strip()
+            except Exception:
+                continue
         if st:
-            out.append(st)
+            ap(st)
 
     return out
 
@@ -55,15 +60,57 @@ def _validate_file(path: Optional[str]) -> Optional[str]:
     """Return the string path if file exists & readable, else None."""
     if not path:
         return None
+    # single stat: regular file with any read bit set
     try:
-        p = Path(path)
-        if p.is_file() and os.access(str(p), os.R_OK):
-            return str(p)
-    except Exception:
-        pass
+        st = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    if stat.S_ISREG(st.st_mode) and st.st_mode & 0o444:
+        return path if isinstance(path, str) else os.fspath(path)
     return None
 
 
+def _artists_key(artists: Optional[List[Any]]) -> Tuple[Any, ...]:
+    """Hashable stand-in for an artists list (dict refs reduced to the fields normalize_artists reads)."""
+    if not artists:
+        return ()
+    return tuple(
+        (a.get("name"), a.get("title"), a.get("id")) if isinstance(a, dict) else a
+        for a in artists
+    )
+
+
+def _artist_from_key(k: Any) -> Any:
+    if isinstance(k, tuple):
+        name, title, ident = k
+        return {"name": name, "title": title, "id": ident}
+    return k
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_static(
+    title: Optional[Any],
+    album: Optional[Any],
+    artists_key: Tuple[Any, ...],
+    album_artist: Optional[Any],
+    track_number: Optional[Any],
+    year: Optional[Any],
+) -> Dict[str, Any]:
+    """Path-independent part of build_metadata_tags (memoised; callers copy it)."""
+    artists_list = normalize_artists([_artist_from_key(k) for k in artists_key])
+    album_artist_safe = _safe_str(album_artist) if album_artist else (artists_list[0] if artists_list else None)
+    return {
+        "title": _safe_str(title),
+        "album": _safe_str(album),
+        "artists": tuple(artists_list),
+        "album_artist": _safe_str(album_artist_safe),
+        "lyrics_path": None,
+        "cover_path": None,
+        "track_number": int(track_number) if track_number is not None else None,
+        "year": _safe_str(year) if year is not None else None,
+    }
+
+
 def build_metadata_tags(
     title: Optional[str],
     album: Optional[str],
@@ -86,19 +133,14 @@ def build_metadata_tags(
       - title, album, artists (list[str]), album_artist, lyrics_path, cover_path,
         track_number, year
     """
-    artists_list = normalize_artists(artists or [])
-    album_artist_safe = _safe_str(album_artist) if album_artist else (artists_list[0] if artists_list else None)
-
-    tags: Dict[str, Any] = {
-        "title": _safe_str(title),
-        "album": _safe_str(album),
-        "artists": artists_list,
-        "album_artist": _safe_str(album_artist_safe),
-        "lyrics_path": None,
-        "cover_path": None,
-        "track_number": int(track_number) if track_number is not None else None,
-        "year": _safe_str(year) if year is not None else None,
-    }
+    try:
+        static = _build_static(title, album, _artists_key(artists), album_artist, track_number, year)
+    except TypeError:
+        # unhashable input: build without the cache
+        static = _build_static.__wrapped__(
+            title, album, tuple(artists or ()), album_artist, track_number, year
+        )
+    tags: Dict[str, Any] = dict(static, artists=list(static["artists"]))
 
     # Validate explicit lyrics_path if given
     validated = _validate_file(lyrics_path)
@@ -113,10 +155,9 @@ def build_metadata_tags(
     # If dest_audio_path provided and there's an existing same-name .lrc, prefer it.
     if dest_audio_path:
         try:
-            p = Path(dest_audio_path)
-            lrc_candidate = p.with_suffix(".lrc")
-            if lrc_candidate.is_file() and os.access(str(lrc_candidate), os.R_OK):
-                tags["lyrics_path"] = str(lrc_candidate)
+            lrc_candidate = _validate_file(os.path.splitext(dest_audio_path)[0] + ".lrc")
+            if lrc_candidate:
+                tags["lyrics_path"] = lrc_candidate
         except Exception:
             pass
 
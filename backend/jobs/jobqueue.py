@@ -4,9 +4,15 @@ Simple job queue helpers for SQLite-compatible job processing.
 
 Functions:
 - enqueue_job() - Create a new job and commit
+- enqueue_jobs_bulk() - Create many jobs with one INSERT
 - reserve_job() - Atomically reserve next job for processing
+- reserve_jobs() - Reserve up to N jobs in one round-trip
+- release_jobs() - Hand unstarted reserved jobs back to the queue
+- still_reserved() - Which locally held jobs are still ours to run
 - mark_job_done() - Mark job as successfully completed
 - mark_job_failed() - Mark job as failed (with optional retry)
+- JobCompletionBatcher - Coalesce done/failed updates into one transaction
+- wait_for_jobs() - Block until a job is enqueued (or timeout) instead of polling
 
 Notes:
 - All functions commit the session to make changes visible to worker processes
@@ -15,17 +21,110 @@ Notes:
 """
 from __future__ import annotations
 import logging
+import os
+import select as _select  # sqlalchemy.select is imported below
+import stat
+import time
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
 
-from sqlalchemy import select, and_
+from sqlalchemy import bindparam, delete, event, insert, select, and_, literal_column, text, update
 from sqlalchemy.orm import Session
 
+from ..config import JOBS_WAKE_FIFO
 from ..models import Job
 from ..time_utils import now_utc
 
 logger = logging.getLogger("jobs.jobqueue")
 
+# Inlined rather than bound so SQLite can match the partial index ix_job_ready
+# (a `status = ?` parameter never implies the index's WHERE clause)
+_QUEUED = literal_column("'queued'")
+
+# Enqueue wakeups: workers block in select() on a named pipe and every
+# process that commits an enqueue writes one byte to it. Web and worker are
+# separate processes, so the pipe is the shared channel; nothing polls.
+_wake_fd: Optional[int] = None
+
+
+def _notify_enqueued() -> None:
+    try:
+        fd = os.open(JOBS_WAKE_FIFO, os.O_WRONLY | os.O_NONBLOCK)
+    except OSError:
+        # no pipe yet, or no worker has it open (ENXIO): nobody to wake
+        return
+    try:
+        os.write(fd, b"\0")
+    except OSError:
+        pass  # pipe full: wakeups are already pending
+    finally:
+        os.close(fd)
+
+
+def _wake_reader() -> Optional[int]:
+    """Open (creating if needed) the wakeup pipe for reading, once per process."""
+    global _wake_fd
+    if _wake_fd is None:
+        try:
+            try:
+                if not stat.S_ISFIFO(os.stat(JOBS_WAKE_FIFO).st_mode):
+                    os.unlink(JOBS_WAKE_FIFO)
+            except FileNotFoundError:
+                pass
+            try:
+                os.mkfifo(JOBS_WAKE_FIFO, 0o600)
+            except FileExistsError:
+                pass
+            # O_RDWR: this process also counts as a writer, so the pipe never
+            # reads as EOF (which select() would report as always ready)
+            _wake_fd = os.open(JOBS_WAKE_FIFO, os.O_RDWR | os.O_NONBLOCK)
+        except (OSError, AttributeError):
+            logger.warning(f"Job wakeup pipe {JOBS_WAKE_FIFO} unavailable, falling back to polling", exc_info=True)
+            return None
+    return _wake_fd
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    # enqueue_job(commit=False) flags the session; wake workers once it lands
+    # (a released SAVEPOINT is not the commit that lands it)
+    if session.in_nested_transaction():
+        return
+    if session.info.pop("jobs_enqueued", False):
+        _notify_enqueued()
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    if session.in_nested_transaction():
+        return
+    session.info.pop("jobs_enqueued", None)
+
+
+def wait_for_jobs(timeout: float) -> bool:
+    """
+    Sleep until a job is enqueued (by this or another process) or `timeout`
+    seconds pass. Issues no queries; the caller reserves afterwards either way.
+    
+    Returns:
+        True if woken by an enqueue, False on timeout
+    """
+    timeout = max(0.0, float(timeout))
+    fd = _wake_reader()
+    if fd is None:
+        time.sleep(timeout)
+        return False
+    ready, _, _ = _select.select([fd], [], [], timeout)
+    if not ready:
+        return False
+    # drain every pending wakeup; one reserve pass covers them all
+    try:
+        while os.read(fd, 4096):
+            pass
+    except BlockingIOError:
+        pass
+    return True
+
 
 def enqueue_job(
     session: Session,
@@ -56,27 +155,112 @@ def enqueue_job(
     if not job_type:
         raise ValueError("job_type is required")
     
-    job = Job(
-        type=str(job_type),
-        payload=payload or {},
-        status="queued",
-        attempts=0,
-        max_attempts=max_attempts,
-        priority=priority,
-        scheduled_at=scheduled_at,
-        created_at=now_utc(),
-        user_id=user_id,  # NEW: Store user_id on Job model
-    )
-    session.add(job)
+    # INSERT ... RETURNING hydrates the Job (id and defaults) in one round trip,
+    # so there is no flush + refresh SELECT after the commit
+    job = session.execute(
+        insert(Job)
+        .values(
+            type=str(job_type),
+            payload=payload or {},
+            status="queued",
+            attempts=0,
+            max_attempts=max_attempts,
+            priority=priority,
+            scheduled_at=scheduled_at,
+            created_at=now_utc(),
+            user_id=user_id,  # NEW: Store user_id on Job model
+        )
+        .returning(Job)
+    ).scalar_one()
+    session.info["jobs_enqueued"] = True
     
     if commit:
         session.commit()
-        session.refresh(job)
     
     logger.debug(f"Enqueued job (commit={commit}): type={job_type}, priority={priority}, user_id={user_id}")
     return job
 
 
+def enqueue_jobs_bulk(
+    session: Session,
+    specs: Iterable[Dict[str, Any]],
+    commit: bool = True,
+) -> int:
+    """
+    Create many jobs in one round-trip (a single executemany INSERT).
+    
+    Each spec is a dict with "type" and optionally "payload", "priority",
+    "max_attempts", "scheduled_at" and "user_id" (same defaults as
+    enqueue_job). Job instances are not returned; use enqueue_job when the
+    caller needs the new ids.
+    
+    Args:
+        session: SQLAlchemy session
+        specs: Job specifications
+        commit: Whether to commit immediately (default True)
+    
+    Returns:
+        Number of jobs created
+    """
+    now = now_utc()
+    rows = []
+    for spec in specs:
+        job_type = spec.get("type")
+        if not job_type:
+            raise ValueError("job_type is required")
+        rows.append({
+            "type": str(job_type),
+            "payload": spec.get("payload") or {},
+            "status": "queued",
+            "attempts": 0,
+            "max_attempts": spec.get("max_attempts", 5),
+            "priority": spec.get("priority", 0),
+            "scheduled_at": spec.get("scheduled_at"),
+            "created_at": now,
+            "user_id": spec.get("user_id"),
+        })
+    if not rows:
+        return 0
+    
+    session.execute(insert(Job), rows)
+    session.info["jobs_enqueued"] = True
+    if commit:
+        session.commit()
+    logger.debug(f"Enqueued {len(rows)} jobs in bulk (commit={commit})")
+    return len(rows)
+
+
+# reserve_jobs' statement, built once: only the bound values change per call,
+# so each reservation skips constructing the Core objects and goes straight
+# to the compiled-SQL cache
+_RESERVE_CANDIDATES = (
+    # Candidate jobs (highest priority first, then oldest)
+    select(Job.id)
+    .where(
+        and_(
+            Job.status == _QUEUED,
+            Job.attempts < Job.max_attempts,
+            (Job.scheduled_at == None) | (Job.scheduled_at <= bindparam("reserve_now")),
+        )
+    )
+    .order_by(Job.priority.desc(), Job.created_at.asc())
+    .limit(bindparam("reserve_limit"))
+)
+
+_RESERVE_STMT = (
+    update(Job)
+    .where(Job.id.in_(_RESERVE_CANDIDATES))
+    .values(
+        status="reserved",
+        reserved_by=bindparam("reserve_worker"),
+        started_at=bindparam("reserve_now"),
+        attempts=Job.attempts + 1,
+    )
+    .returning(Job)
+    .execution_options(populate_existing=True)
+)
+
+
 def reserve_job(session: Session, worker_name: str) -> Optional[Job]:
     """
     Reserve the next available job for processing.
@@ -99,46 +283,85 @@ def reserve_job(session: Session, worker_name: str) -> Optional[Job]:
     Returns:
         Reserved Job instance, or None if no jobs available
     """
-    now = now_utc()
+    jobs = reserve_jobs(session, worker_name, limit=1)
+    return jobs[0] if jobs else None
+
+
+def reserve_jobs(session: Session, worker_name: str, limit: int = 1) -> List[Job]:
+    """
+    Reserve up to `limit` jobs with a single UPDATE ... RETURNING and one commit.
     
-    # Find candidate job (highest priority first, then oldest)
-    stmt = (
-        select(Job)
-        .where(
-            and_(
-                Job.status == "queued",
-                Job.attempts < Job.max_attempts,
-                (Job.scheduled_at == None) | (Job.scheduled_at <= now),
-            )
-        )
-        .order_by(Job.priority.desc(), Job.created_at.asc())
-        .limit(1)
-    )
+    Same selection rules and ordering as reserve_job. Candidate selection
+    happens in a subquery of the UPDATE itself, so SQLite performs the pick
+    and the claim atomically under its write lock: no other worker can slip
+    in between, and there is no separate SELECT round-trip.
     
-    job = session.execute(stmt).scalars().first()
-    if not job:
-        return None
+    Args:
+        session: SQLAlchemy session
+        worker_name: Worker identifier (e.g., "worker-12345")
+        limit: Maximum number of jobs to reserve
+    
+    Returns:
+        Reserved Job instances in dispatch order (may be empty)
+    """
+    params = {
+        "reserve_now": now_utc(),
+        "reserve_worker": worker_name,
+        "reserve_limit": max(1, int(limit)),
+    }
     
-    # Atomically update the job
     try:
-        job.attempts = (job.attempts or 0) + 1
-        job.status = "reserved"
-        job.reserved_by = worker_name
-        job.started_at = now
-        session.add(job)
+        jobs = list(session.execute(_RESERVE_STMT, params).scalars())
         session.commit()
-        session.refresh(job)
-        
+    except Exception as e:
+        logger.exception(f"Failed to reserve jobs: {e}")
+        session.rollback()
+        return []
+    
+    # RETURNING order is unspecified; restore dispatch order
+    jobs.sort(key=lambda j: (-j.priority, j.created_at))
+    for job in jobs:
         logger.debug(
             f"Reserved job {job.id}: type={job.type}, "
             f"attempt={job.attempts}/{job.max_attempts}, "
             f"worker={worker_name}"
         )
-        return job
-    except Exception as e:
-        logger.exception(f"Failed to reserve job {job.id}: {e}")
-        session.rollback()
-        return None
+    return jobs
+
+
+def release_jobs(session: Session, job_ids: Sequence[int], worker_name: str) -> int:
+    """
+    Return reserved-but-unstarted jobs to the queue (e.g. a worker's local
+    batch on shutdown). The reservation attempt is not counted. Commits.
+    
+    Returns:
+        Number of jobs released
+    """
+    if not job_ids:
+        return 0
+    res = session.execute(
+        update(Job)
+        .where(Job.id.in_(list(job_ids)), Job.status == "reserved", Job.reserved_by == worker_name)
+        .values(status="queued", reserved_by=None, started_at=None, attempts=Job.attempts - 1)
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+    count = res.rowcount or 0
+    logger.info(f"Released {count} reserved jobs back to the queue (worker={worker_name})")
+    return count
+
+
+def still_reserved(session: Session, job_ids: Sequence[int], worker_name: str) -> Set[int]:
+    """
+    Return the subset of job_ids still reserved by worker_name. Jobs held in
+    a worker's local batch can be cancelled before they are started.
+    """
+    if not job_ids:
+        return set()
+    return set(session.scalars(
+        select(Job.id)
+        .where(Job.id.in_(list(job_ids)), Job.status == "reserved", Job.reserved_by == worker_name)
+    ))
 
 
 def mark_job_done(
@@ -227,6 +450,170 @@ def mark_job_failed(
         )
 
 
+class JobCompletionBatcher:
+    """
+    Buffers job completions and writes them in one transaction.
+    
+    done()/failed() only append to a local buffer. The owner calls
+    maybe_flush() between jobs (on its own thread, with no other session
+    open), which writes once `max_batch` entries are waiting or the oldest
+    one is `delay_ms` old; flush() writes unconditionally. A burst of K quick
+    completions therefore costs about K / max_batch commits instead of K.
+    Retry/failure decisions follow mark_job_failed exactly.
+    
+    The batcher is deliberately not thread-safe and runs no thread of its
+    own: the engine hands every session the same SQLite connection, so a
+    flush racing a task's open transaction would either fail to BEGIN or
+    roll back the task's writes.
+    
+    Entries whose flush fails stay buffered and are retried on the next
+    flush, so a transient lock error never loses a completion.
+    """
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        delay_ms: float = 10.0,
+        max_batch: int = 32,
+    ) -> None:
+        self._session_factory = session_factory
+        self._delay = max(0.0, float(delay_ms)) / 1000.0
+        self._max_batch = max(1, int(max_batch))
+        self._pending: List[Dict[str, Any]] = []
+        self._first_at: Optional[float] = None
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def done(self, job_id: int, result: Optional[dict] = None) -> None:
+        self._add({"id": job_id, "ok": True, "result": result})
+    
+    def failed(
+        self,
+        job_id: int,
+        error_message: Optional[str] = None,
+        retry_delay_seconds: Optional[int] = None,
+    ) -> None:
+        self._add({
+            "id": job_id,
+            "ok": False,
+            "error": error_message,
+            "retry_delay": retry_delay_seconds,
+        })
+    
+    def maybe_flush(self) -> int:
+        """Flush if the batch is full or its oldest entry has waited `delay_ms`."""
+        if not self._pending:
+            return 0
+        if (
+            len(self._pending) >= self._max_batch
+            or time.monotonic() - (self._first_at or 0.0) >= self._delay
+        ):
+            return self.flush()
+        return 0
+    
+    def flush(self) -> int:
+        """Write everything buffered; on failure keep it for the next call."""
+        if not self._pending:
+            return 0
+        entries = self._pending
+        self._pending = []
+        self._first_at = None
+        try:
+            return self._flush(entries)
+        except Exception as e:
+            logger.exception(f"Failed to flush {len(entries)} job completions, will retry: {e}")
+            # put them back ahead of anything added meanwhile
+            self._pending[:0] = entries
+            self._first_at = time.monotonic()
+            return 0
+    
+    def close(self) -> None:
+        """Flush what is left."""
+        self.flush()
+        if self._pending:
+            logger.error(
+                f"Dropping {len(self._pending)} unflushed job completions on close: "
+                f"{[e['id'] for e in self._pending]}"
+            )
+    
+    def _add(self, entry: Dict[str, Any]) -> None:
+        if not self._pending:
+            self._first_at = time.monotonic()
+        self._pending.append(entry)
+    
+    def _flush(self, entries: List[Dict[str, Any]]) -> int:
+        if not entries:
+            return 0
+        
+        # last write wins if the same job shows up twice
+        by_id = {e["id"]: e for e in entries}
+        now = now_utc()
+        
+        session = self._session_factory()
+        try:
+            session.execute(text("BEGIN IMMEDIATE"))
+            rows = session.execute(
+                select(Job.id, Job.type, Job.attempts, Job.max_attempts, Job.priority)
+                .where(Job.id.in_(list(by_id)), Job.status == "reserved")
+            ).all()
+            
+            mappings = []
+            for job_id, job_type, attempts, max_attempts, priority in rows:
+                e = by_id[job_id]
+                if e["ok"]:
+                    mappings.append({
+                        "id": job_id,
+                        "status": "done",
+                        "finished_at": now,
+                        "result": e["result"] or {},
+                        "last_error": None,
+                    })
+                    logger.info(f"Job {job_id} completed: type={job_type}")
+                    continue
+                    
+                err = e["error"]
+                delay = e["retry_delay"]
+                values = {"id": job_id, "last_error": str(err) if err else None}
+                if delay and (attempts or 0) < (max_attempts or 1):
+                    values.update(
+                        status="queued",
+                        priority=priority - attempts,
+                        scheduled_at=now + timedelta(seconds=delay),
+                        reserved_by=None,
+                    )
+                    logger.warning(
+                        f"Job {job_id} failed (attempt {attempts}/{max_attempts}), "
+                        f"retrying in {delay}s: {err}"
+                    )
+                else:
+                    values.update(status="failed", finished_at=now)
+                    logger.error(
+                        f"Job {job_id} permanently failed after {attempts} attempts: {err}"
+                    )
+                mappings.append(values)
+            
+            # cancelled (or otherwise settled) while running: leave it as is
+            missing = set(by_id) - {r[0] for r in rows}
+            for job_id in missing:
+                logger.warning(f"Cannot complete job {job_id}: not found or no longer reserved")
+            
+            if mappings:
+                session.execute(
+                    update(Job)
+                    .where(Job.status == "reserved")
+                    .execution_options(synchronize_session=None),
+                    mappings,
+                )
+            session.commit()
+            return len(mappings)
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+
 def get_job_stats(session: Session) -> dict:
     """
     Get statistics about jobs in the queue.
@@ -235,22 +622,26 @@ def get_job_stats(session: Session) -> dict:
     Returns:
         Dict with counts by status
     """
-    from sqlalchemy import func
+    from sqlalchemy import case, func
     
     stats = {}
     
-    # Count by status
-    result = session.query(Job.status, func.count(Job.id)).group_by(Job.status).all()
-    for status, count in result:
-        stats[status] = count
-    
-    # Count pending (queued but scheduled in future)
+    # Count by status, and jobs scheduled in the future, in one pass
     now = now_utc()
-    pending = (
-        session.query(func.count(Job.id))
-        .filter(Job.status == "queued", Job.scheduled_at > now)
-        .scalar()
+    stmt = (
+        select(
+            Job.status,
+            func.count(Job.id),
+            func.sum(case((Job.scheduled_at > now, 1), else_=0)),
+        )
+        .group_by(Job.status)
     )
+    pending = 0
+    for status, count, scheduled in session.execute(stmt):
+        stats[status] = count
+        if status == "queued":
+            # Count pending (queued but scheduled in future)
+            pending = scheduled
     stats["pending_scheduled"] = pending or 0
     
     return stats
@@ -287,6 +678,10 @@ def cancel_job(session: Session, job_id: int, reason: Optional[str] = None) -> b
     return True
 
 
+CLEANUP_CHUNK_SIZE = 500
+CLEANUP_CHUNK_PAUSE = 0.005  # seconds between chunks
+
+
 def cleanup_old_jobs(
     session: Session,
     days_old: int = 7,
@@ -305,23 +700,33 @@ def cleanup_old_jobs(
     """
     cutoff = now_utc() - timedelta(days=days_old)
     
-    query = session.query(Job).filter(
-        Job.finished_at != None,
-        Job.finished_at < cutoff,
-    )
-    
-    if keep_failed:
-        query = query.filter(Job.status == "done")
-    else:
-        query = query.filter(Job.status.in_(["done", "failed", "cancelled"]))
-    
-    jobs_to_delete = query.all()
-    count = len(jobs_to_delete)
+    statuses = ["done"] if keep_failed else ["done", "failed", "cancelled"]
     
-    for job in jobs_to_delete:
-        session.delete(job)
+    # Delete in chunks, committing in between, so live workers can grab the
+    # write lock while a large backlog is being purged
+    chunk = (
+        select(Job.id)
+        .where(
+            Job.finished_at != None,
+            Job.finished_at < cutoff,
+            Job.status.in_(statuses),
+        )
+        .limit(CLEANUP_CHUNK_SIZE)
+    )
+    stmt = (
+        delete(Job)
+        .where(Job.id.in_(chunk))
+        .execution_options(synchronize_session=False)
+    )
     
-    session.commit()
+    count = 0
+    while True:
+        deleted = session.execute(stmt).rowcount or 0
+        session.commit()
+        count += deleted
+        if deleted < CLEANUP_CHUNK_SIZE:
+            break
+        time.sleep(CLEANUP_CHUNK_PAUSE)
     
     logger.info(f"Cleaned up {count} old jobs (older than {days_old} days)")
     return count
\ No newline at end of file
@@ -15,12 +15,18 @@ Task types:
 - sync_artist: Check artist for new releases
 """
 from __future__ import annotations
+import functools
+import inspect
 import logging
-from typing import Any, Dict, Optional
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 from pathlib import Path
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import OperationalError
 
 from ..models import Job, Track, Album, Artist
 from ..services import albums as albums_svc
@@ -34,41 +40,18 @@ logger = logging.getLogger("jobs.tasks")
 
 
 # ============================================================================
-# HELPER: DATABASE OPERATION WITH RETRY
+# HELPER: YTCOOKIES MANAGEMENT FOR RATE LIMITING
 # ============================================================================
 
-def _db_operation_with_retry(operation, max_retries=3, delay=0.1):
-    """
-    Execute a database operation with automatic retry on lock errors.
-    
-    Args:
-        operation: Callable that performs the database operation
-        max_retries: Maximum number of retry attempts
-        delay: Base delay between retries (exponential backoff)
-    
-    Returns:
-        Result from the operation
-    
-    Raises:
-        OperationalError: If operation fails after all retries
-    """
-    import time
-    
-    for attempt in range(max_retries):
-        try:
-            return operation()
-        except OperationalError as e:
-            if "database is locked" in str(e).lower():
-                if attempt < max_retries - 1:
-                    sleep_time = delay * (2 ** attempt)
-                    logger.warning(f"Database locked, retry {attempt + 1}/{max_retries} after {sleep_time}s")
-                    time.sleep(sleep_time)
-                    continue
-            raise
+# One case-insensitive pass over the message instead of lower() + several scans
+_RATE_LIMIT_RE = re.compile(
+    r"rate-limited by youtube"
+    r"|current session has been rate-limited"
+    r"|this content isn't available.*try again later"
+    r"|try again later.*this content isn't available",
+    re.IGNORECASE | re.DOTALL,
+)
 
-# ============================================================================
-# HELPER: YTCOOKIES MANAGEMENT FOR RATE LIMITING
-# ============================================================================
 
 def _is_youtube_rate_limit_error(error_msg: str) -> bool:
     """
@@ -76,13 +59,7 @@ def _is_youtube_rate_limit_error(error_msg: str) -> bool:
     """
     if not error_msg:
         return False
-    
-    error_lower = str(error_msg).lower()
-    return (
-        "rate-limited by youtube" in error_lower or
-        "current session has been rate-limited" in error_lower or
-        ("this content isn't available" in error_lower and "try again later" in error_lower)
-    )
+    return _RATE_LIMIT_RE.search(str(error_msg)) is not None
 
 
 def _reset_youtube_cookies() -> bool:
@@ -103,10 +80,335 @@ def _reset_youtube_cookies() -> bool:
     except Exception as e:
         logger.exception(f"Failed to delete YouTube cookies: {e}")
         return False
+
+# ============================================================================
+# HELPER: SHARED LRCLIB HTTP SESSION
+# ============================================================================
+
+@functools.lru_cache(maxsize=1)
+def _lrclib_session():
+    """
+    One keep-alive session for every lyrics job, so lrclib.net connections
+    (and their TLS handshakes) are reused. Built on first use to keep
+    requests out of the worker's import path.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    sess = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504), allowed_methods=("GET",))
+    sess.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=8, max_retries=retry))
+    return sess
+
+
+def _lrclib_get(url: str, timeout: float = 15) -> Tuple[int, Optional[dict]]:
+    """GET an LRCLIB URL and return (status_code, json body or None)."""
+    response = _lrclib_session().get(url, timeout=timeout)
+    body = response.json() if response.status_code == 200 else None
+    return response.status_code, body
+
+
+# ============================================================================
+# HELPER: PER-WORKER ALBUM METADATA CACHE
+# ============================================================================
+
+class AlbumMeta(NamedTuple):
+    """Detached snapshot of the Album/Artist fields download_track tags with."""
+    id: str
+    title: Optional[str]
+    year: Optional[int]
+    image_local: Optional[str]
+    artist_id: Optional[str]
+    artist_name: Optional[str]
+
+
+ALBUM_META_CACHE_TTL = 300  # seconds
+ALBUM_META_CACHE_MAXSIZE = 256
+
+_album_meta_cache: Dict[str, Tuple[float, AlbumMeta]] = {}
+_album_meta_lock = threading.Lock()
+
+
+def _get_album_meta(session: Session, album_id: str) -> Optional[AlbumMeta]:
+    """
+    Return an AlbumMeta snapshot for album_id, hitting the DB only on a miss.
+    
+    Consecutive tracks of an album share one entry, so an N-track import
+    does a single SELECT instead of 2N. Call _invalidate_album_meta() when the
+    album's cover changes.
+    """
+    now = time.monotonic()
+    with _album_meta_lock:
+        entry = _album_meta_cache.get(album_id)
+        if entry and entry[0] > now:
+            return entry[1]
+    
+    # Album and artist name in one round-trip
+    row = session.execute(
+        select(
+            Album.id,
+            Album.title,
+            Album.year,
+            Album.image_local,
+            Album.artist_id,
+            Artist.name,
+        )
+        .outerjoin(Artist, Artist.id == Album.artist_id)
+        .where(Album.id == album_id)
+    ).first()
+    if row is None:
+        return None
+    
+    meta = AlbumMeta(
+        id=row[0],
+        title=row[1],
+        year=int(row[2]) if row[2] else None,
+        image_local=row[3],
+        artist_id=row[4],
+        artist_name=row[5],
+    )
+    with _album_meta_lock:
+        if len(_album_meta_cache) >= ALBUM_META_CACHE_MAXSIZE:
+            _album_meta_cache.clear()
+        _album_meta_cache[album_id] = (now + ALBUM_META_CACHE_TTL, meta)
+    return meta
+
+
+def _invalidate_album_meta(album_id: Optional[str] = None) -> None:
+    """Drop the cached snapshot for album_id (or the whole cache if None)."""
+    with _album_meta_lock:
+        if album_id is None:
+            _album_meta_cache.clear()
+        else:
+            _album_meta_cache.pop(album_id, None)
+
+
+LRCLIB_MISS_TTL = 3600  # seconds a definitive miss is remembered
+
+# Task results for definitive LRCLIB misses
+_LRCLIB_MISS_RESULTS: Dict[str, Dict[str, Any]] = {
+    "not_found": {
+        "ok": False,
+        "error": "Lyrics not found",
+        "retry_delay_seconds": 86400,  # Retry in 24 hours
+    },
+    "plain_only": {
+        "ok": False,
+        "error": "Only plain lyrics available (synced lyrics required)",
+        "retry_delay_seconds": 86400,  # Retry in 24 hours
+    },
+}
+
+_lrclib_misses: Dict[Tuple[str, str, str, int], Tuple[float, str]] = {}
+_lrclib_misses_lock = threading.Lock()
+
+
+def _lrclib_cached_miss(key: Tuple[str, str, str, int]) -> Optional[str]:
+    """Return the miss kind recorded for key within LRCLIB_MISS_TTL, else None."""
+    now = time.monotonic()
+    with _lrclib_misses_lock:
+        entry = _lrclib_misses.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+        _lrclib_misses.pop(key, None)
+    return None
+
+
+def _lrclib_remember_miss(key: Tuple[str, str, str, int], kind: str) -> None:
+    now = time.monotonic()
+    with _lrclib_misses_lock:
+        # drop expired entries so the map stays bounded by an hour of misses
+        for k in [k for k, (exp, _) in _lrclib_misses.items() if exp <= now]:
+            del _lrclib_misses[k]
+        _lrclib_misses[key] = (now + LRCLIB_MISS_TTL, kind)
+
+
 # ============================================================================
 # TASK: DOWNLOAD TRACK
 # ============================================================================
 
+def _prepare_download(
+    session: Session,
+    track_id: str,
+    album_id: Optional[str] = None,
+    artist_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Load what the downloader needs for one track and COMMIT it as "downloading".
+    
+    Returns {"ok": False, "error": ...} if the track is unknown, else a context
+    dict whose "kwargs" are the downloader's keyword arguments.
+    """
+    track = session.get(Track, str(track_id))
+    if not track:
+        return {"ok": False, "error": f"Track {track_id} not found in database"}
+    
+    # Get album/artist info for metadata (cached across an album's tracks)
+    album = None
+    if track.album_id:
+        album = _get_album_meta(session, track.album_id)
+    elif album_id:
+        album = _get_album_meta(session, album_id)
+    
+    artist_name = album.artist_name if album else None
+    if not (album and album.artist_id) and artist_id:
+        artist = session.get(Artist, artist_id)
+        artist_name = artist.name if artist else None
+    
+    # Update status to "downloading"
+    track.status = "downloading"
+    session.add(track)
+    
+    session.commit()
+    
+    return {
+        "ok": True,
+        "track": track,
+        "track_id": track_id,
+        "album_id": album.id if album else None,
+        "track_album_id": track.album_id,
+        "kwargs": {
+            "video_id": track_id,
+            "artist_name": artist_name,
+            "album_name": album.title if album else None,
+            "track_title": track.title,
+            "track_number": track.track_number,
+            "year": album.year if album else None,
+            "cover_path_override": album.image_local if album else None,
+            "skip_metadata": True,
+        },
+    }
+
+
+def _finish_download(session: Session, prep: Dict[str, Any], result: Any) -> Dict[str, Any]:
+    """
+    Record a finished download: Track file_path/status, Album cover, album
+    download status and the lyrics job, then COMMIT once.
+    """
+    track_id = prep["track_id"]
+    track = prep["track"]
+    album_id_final = prep["album_id"]
+    track_album_id = prep["track_album_id"]
+    
+    # Handle tuple return (file_path, cover_path)
+    file_path = None
+    new_cover_path = None
+    
+    if isinstance(result, tuple) and len(result) == 2:
+        file_path, new_cover_path = result
+    elif isinstance(result, str):
+        file_path = result
+    elif isinstance(result, dict):
+        file_path = result.get("file_path")
+    else:
+        raise ValueError(f"Downloader returned unexpected type: {type(result)}")
+    
+    if not file_path:
+        raise ValueError("Downloader did not return a valid file_path")
+    
+    # Everything below is written in a single transaction
+    # SessionLocal does not expire on commit, so `track` is still loaded
+    track.status = "done"
+    track.file_path = str(file_path)
+    session.add(track)
+    
+    # Optional steps below each run in a SAVEPOINT: a failure rolls back only
+    # that step, never the track update. begin_nested() flushes first, so the
+    # track UPDATE has already opened the transaction the savepoint lives in.
+    
+    # Update album cover
+    if new_cover_path and album_id_final:
+        try:
+            with session.begin_nested():
+                album = session.get(Album, album_id_final)  # Re-fetch
+                if album:
+                    from ..services.albums import ensure_album_cover
+                    ensure_album_cover(
+                        session=session,
+                        album_obj=album,
+                        final_cover_path=new_cover_path
+                    )
+            _invalidate_album_meta(album_id_final)
+        except Exception as e:
+            logger.warning(f"Failed to update album cover: {e}")
+    
+    # Update album download status (sees the track as done via the flush)
+    new_status = None
+    if track_album_id:
+        try:
+            from ..services import subscriptions as subs_svc
+            with session.begin_nested():
+                new_status = subs_svc.check_and_update_album_download_status(
+                    session,
+                    track_album_id
+                )
+        except Exception as e:
+            logger.warning(f"Failed to update album download status: {e}")
+    
+    # Queue lyrics download job
+    try:
+        from .jobqueue import enqueue_job
+        enqueue_job(
+            session,
+            job_type="download_lyrics",
+            payload={"track_id": track_id},
+            priority=5,
+            commit=False,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to queue lyrics job for track {track_id}: {e}")
+    
+    session.commit()
+    
+    logger.info(f"Successfully downloaded track {track_id} to {file_path}")
+    if new_status:
+        logger.debug(f"Album {track_album_id} download status updated to: {new_status}")
+    logger.debug(f"Queued lyrics download for track {track_id}")
+    
+    return {
+        "ok": True,
+        "file_path": str(file_path),
+        "track_id": track_id,
+        "cover_path": new_cover_path,
+    }
+
+
+def _download_failed(session: Session, track_id: str, e: Exception) -> Dict[str, Any]:
+    """Mark the track failed and build the job result for a failed download."""
+    # Update track status to failed
+    try:
+        # discard whatever the failed step left behind (a failed flush or
+        # commit would otherwise raise PendingRollbackError below)
+        session.rollback()
+        track = session.get(Track, str(track_id))  # Re-fetch
+        if not track:
+            logger.error(f"Track {track_id} not found when marking failed")
+        else:
+            track.status = "failed"
+            session.add(track)
+            
+            session.commit()
+    except Exception as commit_error:
+        logger.exception(f"Failed to update track status to failed: {commit_error}")
+        session.rollback()
+    
+    # Check if this is a rate limit error for retry logic
+    error_msg = str(e)
+    if _is_youtube_rate_limit_error(error_msg):
+        return {
+            "ok": False,
+            "error": f"Download failed: {error_msg}",
+            "retry_delay_seconds": 600,  # Retry in 10 minutes if still rate-limited
+        }
+    else:
+        return {
+            "ok": False,
+            "error": f"Download failed: {error_msg}",
+            "retry_delay_seconds": 300,  # Standard retry delay
+        }
+
+
 def download_track(
     session: Session,
     track_id: str,
@@ -122,8 +424,8 @@ def download_track(
     3. Update status to "downloading" and COMMIT
     4. Call downloader.core.download_track_by_videoid() (no transaction held)
     5. If rate-limited, delete cookies and retry
-    6. Update Track table with file_path and status, COMMIT
-    7. Update Album cover if new cover path returned, COMMIT
+    6. Update Track file_path/status, Album cover, album download status
+       and queue the lyrics job, then COMMIT once
     
     Args:
         session: SQLAlchemy session
@@ -138,73 +440,30 @@ def download_track(
         return {"ok": False, "error": "track_id required"}
     
     try:
-        # Get track info and update status
-        track = session.get(Track, str(track_id))
-        if not track:
-            return {"ok": False, "error": f"Track {track_id} not found in database"}
+        prep = _prepare_download(session, track_id, album_id, artist_id)
+        if not prep["ok"]:
+            return prep
         
-        # Get album info for metadata
-        album = None
-        if track.album_id:
-            album = session.get(Album, track.album_id)
-        elif album_id:
-            album = session.get(Album, album_id)
-        
-        # Get artist info for metadata
-        artist = None
-        if album and album.artist_id:
-            artist = session.get(Artist, album.artist_id)
-        elif artist_id:
-            artist = session.get(Artist, artist_id)
-        
-        # Extract metadata (before we detach objects)
-        artist_name = artist.name if artist else None
-        album_name = album.title if album else None
-        track_title = track.title
-        track_number = track.track_number
-        year = int(album.year) if album and album.year else None
-        cover_path = album.image_local if album else None
-        album_id_final = album.id if album else None
-        track_album_id = track.album_id
-        
-        # Update status to "downloading"
-        track.status = "downloading"
-        session.add(track)
-        
-        def commit_status():
-            session.commit()
-        
-        _db_operation_with_retry(commit_status)
-        
-        logger.info(f"Downloading track {track_id}: {track_title}")
+        logger.info(f"Downloading track {track_id}: {prep['kwargs']['track_title']}")
         
         # Perform download with retry on rate limit
         max_download_attempts = 2  # Try once, if rate-limited reset cookies and try once more
-        last_error = None
         result = None
         
+        # Resolved once per job, not per attempt; looked up at call time (not
+        # import) so the downloader package stays lazily imported
+        dl_func = getattr(downloader.core, "download_track_by_videoid", None)
+        if dl_func is None:
+            raise AttributeError("downloader.core.download_track_by_videoid not found")
+        
         for attempt in range(max_download_attempts):
             try:
-                dl_func = getattr(downloader.core, "download_track_by_videoid", None)
-                if dl_func is None:
-                    raise AttributeError("downloader.core.download_track_by_videoid not found")
-                
-                result = dl_func(
-                    video_id=track_id,
-                    artist_name=artist_name,
-                    album_name=album_name,
-                    track_title=track_title,
-                    track_number=track_number,
-                    year=year,
-                    cover_path_override=cover_path,
-                    skip_metadata=True,
-                )
+                result = dl_func(**prep["kwargs"])
                 
                 # Success! Break out of retry loop
                 break
                 
             except Exception as download_error:
-                last_error = download_error
                 error_msg = str(download_error)
                 
                 # Check if this is a YouTube rate limit error
@@ -220,7 +479,6 @@ def download_track(
                         
                         if cookies_deleted:
                             logger.info(f"Retrying download for track {track_id} after cookie reset")
-                            import time
                             time.sleep(2)  # Brief pause before retry
                             continue
                         else:
@@ -235,130 +493,63 @@ def download_track(
                 # Re-raise the error (either not a rate limit, or exhausted retries)
                 raise
         
-        # Handle tuple return (file_path, cover_path)
-        file_path = None
-        new_cover_path = None
-        
-        if isinstance(result, tuple) and len(result) == 2:
-            file_path, new_cover_path = result
-        elif isinstance(result, str):
-            file_path = result
-        elif isinstance(result, dict):
-            file_path = result.get("file_path")
-        else:
-            raise ValueError(f"Downloader returned unexpected type: {type(result)}")
-        
-        if not file_path:
-            raise ValueError("Downloader did not return a valid file_path")
+        return _finish_download(session, prep, result)
         
-        # Update track with success
-        track = session.get(Track, str(track_id))  # Re-fetch after commit
-        if not track:
-            raise RuntimeError(f"Track {track_id} disappeared after commit")
-        track.status = "done"
-        track.file_path = str(file_path)
-        session.add(track)
-        
-        def commit_track_update():
-            session.commit()
-        
-        _db_operation_with_retry(commit_track_update)
-        
-        logger.info(f"Successfully downloaded track {track_id} to {file_path}")
-        
-        # Update album cover
-        if new_cover_path and album_id_final:
-            try:
-                album = session.get(Album, album_id_final)  # Re-fetch
-                if album:
-                    from ..services.albums import ensure_album_cover
-                    ensure_album_cover(
-                        session=session,
-                        album_obj=album,
-                        final_cover_path=new_cover_path
-                    )
-                    
-                    def commit_cover():
-                        session.commit()
-                    
-                    _db_operation_with_retry(commit_cover)
-                    logger.info(f"Updated album {album_id_final} cover to {new_cover_path}")
-            except Exception as e:
-                session.rollback()
-                logger.warning(f"Failed to update album cover: {e}")
+    except Exception as e:
+        logger.exception(f"Download failed for track {track_id}")
+        return _download_failed(session, track_id, e)
 
-        # Update album download status
-        if track_album_id:
-            try:
-                from ..services import subscriptions as subs_svc
-                new_status = subs_svc.check_and_update_album_download_status(
-                    session,
-                    track_album_id
-                )
-                
-                def commit_album_status():
-                    session.commit()
-                
-                _db_operation_with_retry(commit_album_status)
-                logger.debug(f"Album {track_album_id} download status updated to: {new_status}")
-            except Exception as e:
-                session.rollback()
-                logger.warning(f"Failed to update album download status: {e}")
-        
-        # Queue lyrics download job
+
+def download_tracks_batch(session: Session, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Run several download_track payloads through downloader.core's pipelined
+    batch path: the next track's network download overlaps the previous
+    track's ffmpeg extraction. DB work stays on the calling thread, before
+    and after the downloads.
+    
+    Returns one download_track-style result per payload, in order. A
+    rate-limited track is not retried in place; its job is rescheduled and
+    the cookies are reset once for the whole batch.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(payloads)
+    preps: List[Tuple[int, Dict[str, Any]]] = []
+    
+    for idx, payload in enumerate(payloads):
+        track_id = payload.get("track_id")
+        if not track_id:
+            results[idx] = {"ok": False, "error": "track_id required"}
+            continue
         try:
-            from .jobqueue import enqueue_job
-            enqueue_job(
-                session,
-                job_type="download_lyrics",
-                payload={"track_id": track_id},
-                priority=5
-            )
-            logger.debug(f"Queued lyrics download for track {track_id}")
+            prep = _prepare_download(session, track_id, payload.get("album_id"), payload.get("artist_id"))
         except Exception as e:
-            logger.warning(f"Failed to queue lyrics job for track {track_id}: {e}")
-        
-        return {
-            "ok": True,
-            "file_path": str(file_path),
-            "track_id": track_id,
-            "cover_path": new_cover_path,
-        }
-        
-    except Exception as e:
-        logger.exception(f"Download failed for track {track_id}")
+            logger.exception(f"Download failed for track {track_id}")
+            results[idx] = _download_failed(session, track_id, e)
+            continue
+        if not prep["ok"]:
+            results[idx] = prep
+            continue
+        preps.append((idx, prep))
+    
+    if preps:
+        logger.info(f"Downloading {len(preps)} tracks through the pipelined batch path")
+        dl_results = downloader.core.download_tracks_pipelined([prep["kwargs"] for _, prep in preps])
         
-        # Update track status to failed
-        try:
-            track = session.get(Track, str(track_id))  # Re-fetch
-            if not track:
-                logger.error(f"Track {track_id} not found when marking failed")
-            else:
-                track.status = "failed"
-                session.add(track)
-                
-                def commit_failed_status():
-                    session.commit()
-                
-                _db_operation_with_retry(commit_failed_status)
-        except Exception as commit_error:
-            logger.exception(f"Failed to update track status to failed: {commit_error}")
-            session.rollback()
+        rate_limited = False
+        for (idx, prep), res in zip(preps, dl_results):
+            track_id = prep["track_id"]
+            try:
+                if not res.get("ok"):
+                    raise RuntimeError(res.get("error") or "download failed")
+                results[idx] = _finish_download(session, prep, (res["file_path"], res["cover_path"]))
+            except Exception as e:
+                logger.exception(f"Download failed for track {track_id}")
+                rate_limited = rate_limited or _is_youtube_rate_limit_error(str(e))
+                results[idx] = _download_failed(session, track_id, e)
         
-        # Check if this is a rate limit error for retry logic
-        error_msg = str(e)
-        if _is_youtube_rate_limit_error(error_msg):
-            return {
-                "ok": False,
-                "error": f"Download failed: {error_msg}",
-                "retry_delay_seconds": 600,  # Retry in 10 minutes if still rate-limited
-            }
-        else:
-            return {
-                "ok": False,
-                "error": f"Download failed: {error_msg}",
-                "retry_delay_seconds": 300,  # Standard retry delay
-            }
+        if rate_limited:
+            _reset_youtube_cookies()
+    
+    return [r or {"ok": False, "error": "not processed"} for r in results]
 
 
 # ============================================================================
@@ -374,7 +565,7 @@ def download_lyrics(
     
     Flow:
     1. Get track info from DB
-    2. Query LRCLIB API (cached first, then full)
+    2. Query the LRCLIB /api/get endpoint
     3. Save .lrc file next to audio file
     4. Update Track.has_lyrics and Track.lyrics_local
     
@@ -391,8 +582,6 @@ def download_lyrics(
         return {"ok": False, "error": "track_id required"}
     
     try:
-        import requests
-        from pathlib import Path
         from urllib.parse import urlencode
         
         # ===== TRANSACTION 1: Get track info =====
@@ -420,7 +609,7 @@ def download_lyrics(
         album_name = ""
         album = None
         if track.album_id:
-            album = session.get(Album, track.album_id)
+            album = _get_album_meta(session, track.album_id)
             if album:
                 album_name = album.title or ""
         
@@ -441,63 +630,58 @@ def download_lyrics(
             "duration": duration,
         }
         
-        # Try cached endpoint first
+        # Recent definitive misses for the same query skip the network
+        neg_key = (track_name.lower(), artist_name.lower(), album_name.lower(), int(duration))
+        miss = _lrclib_cached_miss(neg_key)
+        if miss is not None:
+            logger.info(f"Skipping LRCLIB for track {track_id}: recent miss ({miss})")
+            return dict(_LRCLIB_MISS_RESULTS[miss])
+        
+        # One call to /api/get: LRCLIB consults its own cache before any
+        # external source, so a separate /api/get-cached probe only added a
+        # round-trip on every miss
         synced_lyrics = None
         try:
-            cached_url = f"https://lrclib.net/api/get-cached?{urlencode(params)}"
-            logger.debug(f"Trying cached LRCLIB: {cached_url}")
+            full_url = f"https://lrclib.net/api/get?{urlencode(params)}"
+            logger.debug(f"Fetching LRCLIB: {full_url}")
             
-            response = requests.get(cached_url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                synced_lyrics = data.get("syncedLyrics")
+            status_code, data = _lrclib_get(full_url, timeout=15)
+            if status_code == 200:
+                synced_lyrics = (data or {}).get("syncedLyrics")
                 if synced_lyrics:
-                    logger.info(f"Found synced lyrics in cache for track {track_id}")
+                    logger.info(f"Found synced lyrics for track {track_id}")
+                elif data is not None:
+                    _lrclib_remember_miss(neg_key, "plain_only")
+            elif status_code == 404:
+                logger.info(f"No lyrics found for track {track_id}")
+                _lrclib_remember_miss(neg_key, "not_found")
+                return dict(_LRCLIB_MISS_RESULTS["not_found"])
         except Exception as e:
-            logger.debug(f"Cached LRCLIB failed: {e}")
-        
-        # If not in cache, try full endpoint
-        if not synced_lyrics:
-            try:
-                full_url = f"https://lrclib.net/api/get?{urlencode(params)}"
-                logger.debug(f"Trying full LRCLIB: {full_url}")
-                
-                response = requests.get(full_url, timeout=15)
-                if response.status_code == 200:
-                    data = response.json()
-                    synced_lyrics = data.get("syncedLyrics")
-                    if synced_lyrics:
-                        logger.info(f"Found synced lyrics for track {track_id}")
-                elif response.status_code == 404:
-                    logger.info(f"No lyrics found for track {track_id}")
-                    return {
-                        "ok": False,
-                        "error": "Lyrics not found",
-                        "retry_delay_seconds": 86400,  # Retry in 24 hours
-                    }
-            except Exception as e:
-                logger.exception(f"Full LRCLIB request failed: {e}")
-                return {
-                    "ok": False,
-                    "error": f"LRCLIB request failed: {str(e)}",
-                    "retry_delay_seconds": 3600,  # Retry in 1 hour
-                }
+            logger.exception(f"LRCLIB request failed: {e}")
+            return {
+                "ok": False,
+                "error": f"LRCLIB request failed: {str(e)}",
+                "retry_delay_seconds": 3600,  # Retry in 1 hour
+            }
         
         # Check if we got synced lyrics
         if not synced_lyrics:
             # API returned data but only plainLyrics
             logger.info(f"Only plain lyrics available for track {track_id}, will retry later")
-            return {
-                "ok": False,
-                "error": "Only plain lyrics available (synced lyrics required)",
-                "retry_delay_seconds": 86400,  # Retry in 24 hours
-            }
+            return dict(_LRCLIB_MISS_RESULTS["plain_only"])
         
         # Save .lrc file next to audio file
         lrc_path = audio_path.with_suffix(".lrc")
         try:
-            with open(lrc_path, "w", encoding="utf-8") as f:
-                f.write(synced_lyrics)
+            # Single write of pre-encoded bytes, no TextIOWrapper for a tiny file
+            data = synced_lyrics.encode("utf-8")
+            fd = os.open(lrc_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
             logger.info(f"Saved lyrics to {lrc_path}")
         except Exception as e:
             logger.exception(f"Failed to save lyrics file: {e}")
@@ -508,17 +692,11 @@ def download_lyrics(
             }
         
         # ===== TRANSACTION 2: Update track with lyrics info =====
-        track = session.get(Track, str(track_id))  # Re-fetch to be safe
-        if not track:
-            raise RuntimeError(f"Track {track_id} disappeared after lyrics fetch")
         track.has_lyrics = True
         track.lyrics_local = str(lrc_path)
         session.add(track)
         
-        def commit_lyrics():
-            session.commit()
-        
-        _db_operation_with_retry(commit_lyrics)
+        session.commit()
         
         logger.info(f"Successfully downloaded lyrics for track {track_id}")
         
@@ -583,12 +761,10 @@ def import_album(
             artist_id=artist_id,
         )
         
-        def commit_album():
-            session.commit()
-        
-        _db_operation_with_retry(commit_album)
+        session.commit()
         
         album_id = result["album_id"]
+        _invalidate_album_meta(album_id)
         
         logger.info(
             f"Imported album {album_id}: "
@@ -598,28 +774,27 @@ def import_album(
         
         # ===== TRANSACTION 2: Queue download jobs for new tracks =====
         try:
-            from .jobqueue import enqueue_job
+            from .jobqueue import enqueue_jobs_bulk
             
             # Get tracks for this album
             tracks = tracks_svc.list_tracks_for_album_from_db(session, album_id)
             
-            queued = 0
-            for track in tracks:
-                if track.get("status") in ["new", "failed"]:
-                    try:
-                        enqueue_job(
-                            session,
-                            job_type="download_track",
-                            payload={
-                                "track_id": track["id"],
-                                "album_id": album_id,
-                                "artist_id": artist_id,
-                            },
-                            priority=10
-                        )
-                        queued += 1
-                    except Exception as e:
-                        logger.exception(f"Failed to queue download for track {track['id']}")
+            queued = enqueue_jobs_bulk(
+                session,
+                (
+                    {
+                        "type": "download_track",
+                        "payload": {
+                            "track_id": track["id"],
+                            "album_id": album_id,
+                            "artist_id": artist_id,
+                        },
+                        "priority": 10,
+                    }
+                    for track in tracks
+                    if track.get("status") in ["new", "failed"]
+                ),
+            )
             
             logger.info(f"Queued {queued} download jobs for album {album_id}")
         
@@ -689,7 +864,7 @@ def sync_artist(
     try:
         logger.info(f"Syncing artist {artist_id}")
         
-        # ===== TRANSACTION 1: Fetch and upsert artist =====
+        # ===== Fetch and upsert artist =====
         artist_data = artists_svc.fetch_and_upsert_artist(session, artist_id)
         
         # Check if banner needs updating
@@ -749,14 +924,11 @@ def sync_artist(
                 "retry_delay_seconds": 300,  # Retry in 5 minutes
             }
         
-        def commit_artist():
-            session.commit()
-        
-        _db_operation_with_retry(commit_artist)
+        # Flushed, not committed: everything below lands in one commit
+        session.flush()
         
-        # ===== TRANSACTION 2: Get current albums from DB =====
-        existing_albums = albums_svc.list_albums_for_artist_from_db(session, artist_id)
-        existing_album_ids = {a["id"] for a in existing_albums}
+        # ===== Get current albums from DB =====
+        existing_album_ids = albums_svc.list_album_ids_for_artist(session, artist_id)
         
         # Find new albums (no database operation)
         ytm_albums = artist_data.get("albums", []) + artist_data.get("singles", [])
@@ -765,14 +937,11 @@ def sync_artist(
         if not new_albums:
             logger.info(f"No new albums found for artist {artist_id}")
             
-            # ===== TRANSACTION 3: Update sync timestamp =====
+            # ===== Update sync timestamp and COMMIT (artist upsert included) =====
             from ..services import subscriptions as subs_svc
             subs_svc.mark_artist_synced(session, artist_id)
             
-            def commit_sync():
-                session.commit()
-            
-            _db_operation_with_retry(commit_sync)
+            session.commit()
             
             return {
                 "ok": True,
@@ -783,7 +952,7 @@ def sync_artist(
         
         logger.info(f"Found {len(new_albums)} new albums for artist {artist_id}")
         
-        # ===== TRANSACTION 3: Create album subscriptions for new albums =====
+        # ===== Create album subscriptions for new albums =====
         from ..services import subscriptions as subs_svc
         subscriptions_created = 0
         
@@ -803,46 +972,31 @@ def sync_artist(
             except Exception as e:
                 logger.exception(f"Failed to create album subscription for {album_id}")
         
-        def commit_subscriptions():
-            session.commit()
-        
-        _db_operation_with_retry(commit_subscriptions)
-        
-        logger.info(f"Created {subscriptions_created} album subscriptions for artist {artist_id}")
-        
-        # ===== TRANSACTION 4: Queue import_album jobs =====
-        from .jobqueue import enqueue_job
-        jobs_queued = 0
-        
-        for album_item in new_albums:
-            browse_id = album_item.get("id") or album_item.get("browseId")
-            if not browse_id:
-                continue
-            
-            try:
-                enqueue_job(
-                    session,
-                    job_type="import_album",
-                    payload={
+        # ===== Queue import_album jobs =====
+        from .jobqueue import enqueue_jobs_bulk
+        jobs_queued = enqueue_jobs_bulk(
+            session,
+            (
+                {
+                    "type": "import_album",
+                    "payload": {
                         "browse_id": browse_id,
                         "artist_id": artist_id,
                     },
-                    priority=20  # Medium priority (higher than downloads, lower than sync_artist)
-                )
-                jobs_queued += 1
-                logger.debug(f"Queued import_album job for {browse_id}")
-            except Exception as e:
-                logger.exception(f"Failed to queue import_album job for {browse_id}")
-        
-        logger.info(f"Queued {jobs_queued} import_album jobs for artist {artist_id}")
+                    "priority": 20,  # Medium priority (higher than downloads, lower than sync_artist)
+                }
+                for album_item in new_albums
+                if (browse_id := album_item.get("id") or album_item.get("browseId"))
+            ),
+            commit=False,
+        )
         
-        # ===== TRANSACTION 5: Update sync timestamp =====
+        # ===== Update sync timestamp and COMMIT everything once =====
         subs_svc.mark_artist_synced(session, artist_id)
         
-        def commit_final_sync():
-            session.commit()
-        
-        _db_operation_with_retry(commit_final_sync)
+        session.commit()
+        logger.info(f"Created {subscriptions_created} album subscriptions for artist {artist_id}")
+        logger.info(f"Queued {jobs_queued} import_album jobs for artist {artist_id}")
         
         logger.info(
             f"Synced artist {artist_id}: {len(new_albums)} new albums, "
@@ -861,15 +1015,13 @@ def sync_artist(
     except Exception as e:
         logger.exception(f"sync_artist failed for {artist_id}")
         
-        # Update sync timestamp with error
+        # Drop the half-done sync in one go, then record the error
+        session.rollback()
         try:
             from ..services import subscriptions as subs_svc
             subs_svc.mark_artist_synced(session, artist_id, error=str(e))
             
-            def commit_sync_error():
-                session.commit()
-            
-            _db_operation_with_retry(commit_sync_error)
+            session.commit()
         except Exception:
             session.rollback()
         
@@ -884,14 +1036,75 @@ def sync_artist(
 # TASK DISPATCHER
 # ============================================================================
 
-_TASK_MAP = {
-    "download_track": download_track,
-    "download_lyrics": download_lyrics,
-    "import_album": import_album,
-    "sync_artist": sync_artist,
+class TaskArgumentError(ValueError):
+    """Job payload does not fit the task's parameters."""
+
+
+TaskHandler = Callable[[Session, Dict[str, Any]], Dict[str, Any]]
+
+
+def _bind_task(func: Callable[..., Dict[str, Any]]) -> TaskHandler:
+    """
+    Wrap a task so it is called as handler(session, payload).
+    
+    The keyword names are read from the task's signature once, at import;
+    each dispatch then picks exactly those keys out of the payload. Keys the
+    task does not accept are ignored instead of raising TypeError, and a
+    missing required key is reported by name.
+    """
+    params = list(inspect.signature(func).parameters.values())[1:]  # skip session
+    names = tuple(p.name for p in params)
+    required = tuple(p.name for p in params if p.default is inspect.Parameter.empty)
+    
+    def handler(session: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+        missing = [n for n in required if n not in payload]
+        if missing:
+            raise TaskArgumentError(f"{func.__name__} missing payload keys: {', '.join(missing)}")
+        return func(session, **{n: payload[n] for n in names if n in payload})
+    
+    handler.__name__ = func.__name__
+    return handler
+
+
+_TASK_MAP: Dict[str, TaskHandler] = {
+    "download_track": _bind_task(download_track),
+    "download_lyrics": _bind_task(download_lyrics),
+    "import_album": _bind_task(import_album),
+    "sync_artist": _bind_task(sync_artist),
 }
 
 
+def _job_payload(job: Job) -> Dict[str, Any]:
+    # Payload is already decoded by the JSON column (orjson when available);
+    # a str here is a double-encoded legacy row
+    payload = job.payload or {}
+    if isinstance(payload, (str, bytes)):
+        try:
+            from ..db import _json_loads
+            payload = _json_loads(payload)
+        except Exception:
+            payload = {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def run_download_batch(session: Session, jobs: List[Job]) -> List[Dict[str, Any]]:
+    """
+    Dispatch several download_track jobs at once (see download_tracks_batch).
+    Called by the worker when pipelined downloads are enabled.
+    
+    Returns one task result dict per job, in order.
+    """
+    try:
+        return download_tracks_batch(session, [_job_payload(job) for job in jobs])
+    except Exception as e:
+        logger.exception(f"Unexpected error in run_download_batch for jobs {[job.id for job in jobs]}")
+        try:
+            session.rollback()
+        except Exception:
+            pass
+        return [{"ok": False, "error": f"Unexpected error: {str(e)}"} for _ in jobs]
+
+
 def run_job_task(session: Session, job: Job) -> Dict[str, Any]:
     """
     Dispatch job to appropriate task handler.
@@ -905,14 +1118,7 @@ def run_job_task(session: Session, job: Job) -> Dict[str, Any]:
         Task result dict with {"ok": bool, "error": str (optional), ...}
     """
     try:
-        # Parse payload
-        payload = job.payload or {}
-        if isinstance(payload, str):
-            try:
-                import json
-                payload = json.loads(payload)
-            except Exception:
-                payload = {}
+        payload = _job_payload(job)
         
         # Get task handler
         job_type = (job.type or "").strip()
@@ -924,12 +1130,12 @@ def run_job_task(session: Session, job: Job) -> Dict[str, Any]:
         
         # Execute task (task handles its own commits)
         logger.debug(f"Executing task {job_type} with payload: {payload}")
-        result = handler(session, **payload)
+        result = handler(session, payload)
         
         return result or {"ok": True}
     
-    except TypeError as e:
-        # Wrong arguments passed to handler
+    except TaskArgumentError as e:
+        # Payload is missing arguments the handler needs
         logger.exception(f"Task handler signature mismatch for job {job.id}")
         return {
             "ok": False,
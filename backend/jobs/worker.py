@@ -4,15 +4,17 @@ import os
 import signal
 import time
 import traceback
-from typing import Optional
+from collections import deque
+from typing import Callable, Deque, Optional
 
 from sqlalchemy.orm import Session
 
-from ..db import SessionLocal
+from ..db import SessionLocal, SideSessionLocal
 from ..deps import wait_for_db
-from .jobqueue import reserve_job, mark_job_done, mark_job_failed
-from .tasks import run_job_task
+from .jobqueue import JobCompletionBatcher, reserve_jobs, release_jobs, still_reserved, wait_for_jobs
+from .tasks import run_download_batch, run_job_task
 from ..logging_config import configure_logging
+from ..models import Job
 
 logger = logging.getLogger("jobs.worker")
 
@@ -22,16 +24,26 @@ class Worker:
     Simple DB-backed worker process.
 
     Behaviour:
-      - Reserve jobs using jobqueue.reserve_job(session, worker_name)
+      - Reserve jobs in batches using jobqueue.reserve_jobs(session, worker_name, batch_size)
+        and work through them from a local deque before hitting the DB again
       - Dispatch to tasks.run_job_task(session, job)
-      - Mark job done or failed using jobqueue helpers
+      - Mark job done or failed through a JobCompletionBatcher, which coalesces
+        completions into one write transaction per flush; flushes happen on this
+        thread between jobs, never while a task session is open
       - Graceful shutdown on SIGINT / SIGTERM
 
     Configuration (via env):
       WORKER_NAME           : name used when reserving jobs (default "worker-<pid>")
-      WORKER_POLL_INTERVAL  : seconds to sleep when no job found (default 2)
+      WORKER_POLL_INTERVAL  : max seconds to wait for an enqueue wakeup when no job found (default 2)
       WORKER_IDLE_SLEEP_SEC : seconds to sleep after an unexpected error (default 3)
       WORKER_MAX_JOBS       : optional int, stop after processing this many jobs (default: unlimited)
+      WORKER_BATCH_SIZE     : jobs reserved per round-trip (default 4; 1 restores one-at-a-time).
+                              Held jobs are not preempted: a higher-priority job enqueued
+                              meanwhile (e.g. sync_artist) waits until they have run, so
+                              use 1 where strict priority order matters more than round-trips
+      WORKER_COMPLETE_BATCH_DELAY_MS : max ms a completion waits before being flushed (default 10)
+      WORKER_DOWNLOAD_PIPELINE : 1 to run all reserved download_track jobs as one batch
+                            whose downloads overlap ffmpeg extraction (default 0)
     """
 
     def __init__(
@@ -40,6 +52,9 @@ class Worker:
         poll_interval: float = 2.0,
         idle_sleep: float = 3.0,
         max_jobs: Optional[int] = None,
+        batch_size: int = 4,
+        complete_batch_delay_ms: float = 10.0,
+        download_pipeline: bool = False,
     ) -> None:
         self.worker_name = worker_name or f"worker-{os.getpid()}"
         self.poll_interval = float(poll_interval)
@@ -47,6 +62,11 @@ class Worker:
         self.max_jobs = int(max_jobs) if max_jobs is not None else None
         self._stopped = False
         self._processed = 0
+        self.batch_size = max(1, int(batch_size))
+        self.download_pipeline = bool(download_pipeline)
+        # reserved jobs not yet dispatched (detached from their session)
+        self._local: Deque[Job] = deque()
+        self._completions = JobCompletionBatcher(SessionLocal, delay_ms=complete_batch_delay_ms)
 
         # install signal handlers
         signal.signal(signal.SIGINT, self._handle_signal)
@@ -59,6 +79,11 @@ class Worker:
     def _handle_signal(self, signum, frame) -> None:
         logger.info("Worker %s received signal %s — shutting down gracefully", self.worker_name, signum)
         self._stopped = True
+        # Hand back the jobs held locally right away: the current download may
+        # outlast supervisord's stop timeout, and a SIGKILL would otherwise
+        # leave them reserved for good. A connection of its own, since the
+        # interrupted task may have a transaction open on the shared one.
+        self._release_local(SideSessionLocal)
 
     def run(self) -> None:
         """
@@ -74,51 +99,68 @@ class Worker:
 
             session: Optional[Session] = None
             try:
-                session = SessionLocal()
-                job = reserve_job(session, self.worker_name)
-                if not job:
-                    # no job available
+                just_reserved = False
+                if not self._local:
+                    # report finished jobs before reserving or going idle
+                    self._completions.flush()
+                    session = SessionLocal()
+                    limit = self.batch_size
+                    if self.max_jobs is not None:
+                        limit = min(limit, self.max_jobs - self._processed)
+                    self._local.extend(reserve_jobs(session, self.worker_name, limit))
                     session.close()
-                    time.sleep(self.poll_interval)
-                    continue
+                    session = None
+                    just_reserved = True
+                    if not self._local:
+                        # no job available: sleep until one is enqueued
+                        # (poll_interval still bounds the wait for scheduled jobs)
+                        wait_for_jobs(self.poll_interval)
+                        continue
+
+                job = self._local.popleft()
+                batch = [job]
+                if self.download_pipeline and job.type == "download_track":
+                    # hand every reserved download to the pipelined batch path
+                    rest = [j for j in self._local if j.type == "download_track"]
+                    if rest:
+                        batch.extend(rest)
+                        self._local = deque(j for j in self._local if j.type != "download_track")
+                session = SessionLocal()
+
+                if not just_reserved:
+                    # held since an earlier reservation: skip jobs cancelled
+                    # (or released) in the meantime
+                    ours = still_reserved(session, [j.id for j in batch], self.worker_name)
+                    for j in batch:
+                        if j.id not in ours:
+                            logger.info("Job id=%s is no longer reserved by %s — skipping", j.id, self.worker_name)
+                    batch = [j for j in batch if j.id in ours]
+                    if not batch:
+                        session.close()
+                        session = None
+                        continue
 
-                logger.info("Worker %s reserved job id=%s type=%s attempts=%s",
-                            self.worker_name, getattr(job, "id", None), getattr(job, "type", None), getattr(job, "attempts", None))
+                for j in batch:
+                    logger.info("Worker %s reserved job id=%s type=%s attempts=%s",
+                                self.worker_name, getattr(j, "id", None), getattr(j, "type", None), getattr(j, "attempts", None))
 
                 # execute task
                 try:
-                    result = run_job_task(session, job)
-                    # result expected to be a dict with ok: bool
-                    if isinstance(result, dict) and result.get("ok", False):
-                        # mark done
-                        try:
-                            mark_job_done(session, getattr(job, "id"))
-                            logger.info("Job id=%s marked done", getattr(job, "id"))
-                        except Exception:
-                            # if marking done fails, log and continue
-                            logger.exception("Failed to mark job done id=%s", getattr(job, "id"))
+                    if len(batch) > 1:
+                        results = run_download_batch(session, batch)
                     else:
-                        # mark failed — allow task to suggest retry_delay_seconds
-                        err = None
-                        retry_delay = None
-                        if isinstance(result, dict):
-                            err = result.get("error") or result.get("message")
-                            retry_delay = result.get("retry_delay_seconds") or result.get("retry_after")
-                        err_msg = str(err) if err is not None else "task returned ok=False"
-                        try:
-                            mark_job_failed(session, getattr(job, "id"), error_message=err_msg, retry_delay_seconds=retry_delay)
-                            logger.warning("Job id=%s marked failed (retry_delay=%s) error=%s", getattr(job, "id"), retry_delay, err_msg)
-                        except Exception:
-                            logger.exception("Failed to mark job failed id=%s", getattr(job, "id"))
+                        results = [run_job_task(session, batch[0])]
+                    for j, result in zip(batch, results):
+                        self._report(j, result)
                 except Exception as e:
                     # Unhandled exception while running task -> mark failed with no retry_delay by default
-                    trace = traceback.format_exc()
-                    logger.exception("Unhandled exception executing job id=%s: %s", getattr(job, "id", None), e)
-                    try:
-                        mark_job_failed(session, getattr(job, "id"), error_message=str(e))
-                        logger.info("Marked job id=%s failed after exception", getattr(job, "id", None))
-                    except Exception:
-                        logger.exception("Failed to mark job failed after exception id=%s", getattr(job, "id", None))
+                    for j in batch:
+                        logger.exception("Unhandled exception executing job id=%s: %s", getattr(j, "id", None), e)
+                        try:
+                            self._completions.failed(getattr(j, "id"), error_message=str(e))
+                            logger.info("Marked job id=%s failed after exception", getattr(j, "id", None))
+                        except Exception:
+                            logger.exception("Failed to mark job failed after exception id=%s", getattr(j, "id", None))
                 finally:
                     # close session for this iteration (jobqueue functions commit)
                     try:
@@ -126,7 +168,8 @@ class Worker:
                     except Exception:
                         pass
 
-                self._processed += 1
+                self._processed += len(batch)
+                self._completions.maybe_flush()
 
             except Exception as outer_ex:
                 # catch any unexpected errors in the loop
@@ -139,8 +182,51 @@ class Worker:
                     pass
                 time.sleep(self.idle_sleep)
 
+        self._release_local()
+        self._completions.close()
         logger.info("Worker %s stopping (processed=%s)", self.worker_name, self._processed)
 
+    def _report(self, job: Job, result: object) -> None:
+        """Buffer the done/failed completion for one task result."""
+        # result expected to be a dict with ok: bool
+        if isinstance(result, dict) and result.get("ok", False):
+            # mark done
+            try:
+                self._completions.done(getattr(job, "id"))
+                logger.info("Job id=%s marked done", getattr(job, "id"))
+            except Exception:
+                # if marking done fails, log and continue
+                logger.exception("Failed to mark job done id=%s", getattr(job, "id"))
+        else:
+            # mark failed — allow task to suggest retry_delay_seconds
+            err = None
+            retry_delay = None
+            if isinstance(result, dict):
+                err = result.get("error") or result.get("message")
+                retry_delay = result.get("retry_delay_seconds") or result.get("retry_after")
+            err_msg = str(err) if err is not None else "task returned ok=False"
+            try:
+                self._completions.failed(getattr(job, "id"), error_message=err_msg, retry_delay_seconds=retry_delay)
+                logger.warning("Job id=%s marked failed (retry_delay=%s) error=%s", getattr(job, "id"), retry_delay, err_msg)
+            except Exception:
+                logger.exception("Failed to mark job failed id=%s", getattr(job, "id"))
+
+    def _release_local(self, session_factory: Optional[Callable[[], Session]] = None) -> None:
+        """Requeue reserved jobs this worker never started."""
+        if not self._local:
+            return
+        ids = [job.id for job in self._local]
+        session = (session_factory or SessionLocal)()
+        try:
+            release_jobs(session, ids, self.worker_name)
+            # only forget them once released, so a failed attempt (e.g. from
+            # the signal handler) is retried when run() exits
+            self._local.clear()
+        except Exception:
+            logger.exception("Failed to release reserved jobs %s", ids)
+        finally:
+            session.close()
+
 
 def _env_get(name: str, default: Optional[str] = None) -> Optional[str]:
     v = os.environ.get(name)
@@ -158,8 +244,19 @@ def main() -> None:
     idle_sleep = float(_env_get("WORKER_IDLE_SLEEP_SEC") or 3.0)
     max_jobs_env = _env_get("WORKER_MAX_JOBS")
     max_jobs = int(max_jobs_env) if max_jobs_env is not None else None
+    batch_size = int(_env_get("WORKER_BATCH_SIZE") or 4)
+    complete_delay = float(_env_get("WORKER_COMPLETE_BATCH_DELAY_MS") or 10.0)
+    download_pipeline = (_env_get("WORKER_DOWNLOAD_PIPELINE") or "0").strip().lower() in ("1", "true", "yes")
 
-    w = Worker(worker_name=worker_name, poll_interval=poll_interval, idle_sleep=idle_sleep, max_jobs=max_jobs)
+    w = Worker(
+        worker_name=worker_name,
+        poll_interval=poll_interval,
+        idle_sleep=idle_sleep,
+        max_jobs=max_jobs,
+        batch_size=batch_size,
+        complete_batch_delay_ms=complete_delay,
+        download_pipeline=download_pipeline,
+    )
     w.run()
 
 
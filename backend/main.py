@@ -20,6 +20,27 @@ from .scheduler import start_default_scheduler, stop_default_scheduler
 logger = logging.getLogger("backend.main")
 
 
+def _install_bearer_openapi(app: FastAPI) -> None:
+    """
+    Declare the bearer auth scheme in the OpenAPI schema.
+    Auth is read directly from the Authorization header (not via HTTPBearer),
+    so the scheme is added here to keep Swagger's Authorize button working.
+    """
+    from fastapi.openapi.utils import get_openapi
+
+    def custom_openapi() -> dict:
+        if app.openapi_schema:
+            return app.openapi_schema
+        schema = get_openapi(title=app.title, version=app.version, routes=app.routes)
+        components = schema.setdefault("components", {})
+        components.setdefault("securitySchemes", {})["HTTPBearer"] = {"type": "http", "scheme": "bearer"}
+        schema["security"] = [{"HTTPBearer": []}]
+        app.openapi_schema = schema
+        return schema
+
+    app.openapi = custom_openapi  # type: ignore[method-assign]
+
+
 def _include_router_safe(app: FastAPI, router_module_name: str) -> None:
     """
     Try to import backend.routers.<router_module_name> and include its `router` if present.
@@ -154,6 +175,7 @@ def create_app() -> FastAPI:
     ]
     for r in routers_to_try:
         _include_router_safe(app, r)
+    _install_bearer_openapi(app)
 
     # Provide a lightweight API root at /api returning version/service info
     @app.get("/api", tags=["root"])
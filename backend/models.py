@@ -3,7 +3,7 @@ from __future__ import annotations
 import datetime
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import String, Integer, Boolean, DateTime, Text, ForeignKey
+from sqlalchemy import String, Integer, Boolean, DateTime, Text, ForeignKey, Index, text
 from sqlalchemy.dialects.sqlite import JSON as SQLiteJSON
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -60,6 +60,10 @@ class Artist(Base):
 
 class Album(Base):
     __tablename__ = "albums"
+    __table_args__ = (
+        # list_albums_for_artist_from_db: WHERE artist_id ORDER BY year, title
+        Index("ix_album_artist_year_title", "artist_id", text("year DESC"), "title"),
+    )
 
     id: Mapped[str] = mapped_column(String(64), primary_key=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
@@ -102,6 +106,10 @@ class Album(Base):
 
 class Track(Base):
     __tablename__ = "tracks"
+    __table_args__ = (
+        # per-album listings and status filters / status counts
+        Index("ix_track_album_status", "album_id", "status"),
+    )
 
     id: Mapped[str] = mapped_column(String(128), primary_key=True)
     title: Mapped[str] = mapped_column(String(1024), nullable=False, index=True)
@@ -148,6 +156,25 @@ class Track(Base):
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # reserve_jobs: partial index over the queued set only, in dispatch
+        # order, carrying the remaining filter columns so the candidate
+        # SELECT never touches the table
+        Index(
+            "ix_job_ready",
+            "status",
+            text("priority DESC"),
+            "created_at",
+            "scheduled_at",
+            "attempts",
+            "max_attempts",
+            sqlite_where=text("status = 'queued'"),
+        ),
+        # get_job_stats: GROUP BY status with a scheduled_at aggregate
+        Index("ix_job_status_scheduled", "status", "scheduled_at"),
+        # list_jobs for non-admins: WHERE user_id ORDER BY created_at DESC
+        Index("ix_job_user_created", "user_id", text("created_at DESC")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     type: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
@@ -346,4 +373,30 @@ class Setting(Base):
             self.value = str(value)
 
     def __repr__(self) -> str:
-        return f"<Setting key={self.key!r} value={self.value!r}>"
\ No newline at end of file
+        return f"<Setting key={self.key!r} value={self.value!r}>"
+
+
+def index_ddl(index: Index) -> str:
+    """CREATE INDEX statement for index as SQLite would store it."""
+    from sqlalchemy.dialects import sqlite
+    from sqlalchemy.schema import CreateIndex
+    return str(CreateIndex(index).compile(dialect=sqlite.dialect())).strip()
+
+
+def _schema_fingerprint() -> int:
+    """
+    Stable 31-bit fingerprint of the declared tables, columns and indexes.
+    Stored in PRAGMA user_version so init_db can skip DDL when nothing changed.
+    """
+    import zlib
+    parts = []
+    for table in sorted(Base.metadata.tables.values(), key=lambda t: t.name):
+        parts.append(table.name)
+        parts.extend(f"{c.name}:{c.type!r}" for c in table.columns)
+        # full DDL, so changing an index's columns or WHERE clause counts too
+        parts.extend(sorted(index_ddl(i) for i in table.indexes))
+    return zlib.crc32("|".join(parts).encode("utf-8")) & 0x7FFFFFFF
+
+
+# Changes automatically whenever the models above change
+SCHEMA_VERSION = _schema_fingerprint()
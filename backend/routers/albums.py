@@ -19,10 +19,10 @@ from ..models import Album
 from ..services import albums as albums_svc
 from ..services import tracks as tracks_svc
 from ..services import subscriptions as subs_svc
-from ..jobs.jobqueue import enqueue_job
+from ..jobs.jobqueue import enqueue_jobs_bulk
 
 from backend.dependencies import require_auth, require_member_or_admin, require_admin
-from backend.models import User
+from backend.services.auth import CachedUser
 
 logger = logging.getLogger("routers.albums")
 
@@ -32,7 +32,7 @@ router = APIRouter(prefix="/api/albums", tags=["Albums"])
 @router.get("/{album_id}", status_code=status.HTTP_200_OK)
 def get_album(
     album_id: str,
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     db: Session = Depends(get_db),
 ) -> Dict[str, Any]:
     """
@@ -122,7 +122,7 @@ def get_album(
 @router.post("/{album_id}/follow", status_code=status.HTTP_200_OK)
 def follow_album(
     album_id: str,
-    current_user: User = Depends(require_member_or_admin),
+    current_user: CachedUser = Depends(require_member_or_admin),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     """
@@ -207,30 +207,24 @@ def follow_album(
         
         # Queue download jobs for all tracks
         tracks = album.get("tracks", [])
-        queued_count = 0
-
-        for track in tracks:
-            track_id = track.get("id")
-            if not track_id:
-                continue
-            
-            # Only queue if track is not already downloaded
-            if track.get("status") in ["new", "failed"]:
-                try:
-                    enqueue_job(
-                        db,
-                        job_type="download_track",
-                        payload={
-                            "track_id": track_id,
-                            "album_id": album_id,
-                        },
-                        priority=10,
-                        user_id=current_user.id,
-                        commit=False,  # Don't commit yet
-                    )
-                    queued_count += 1
-                except Exception as e:
-                    logger.exception(f"Failed to enqueue job for track {track_id}")
+        # Only queue tracks that are not already downloaded
+        queued_count = enqueue_jobs_bulk(
+            db,
+            (
+                {
+                    "type": "download_track",
+                    "payload": {
+                        "track_id": track["id"],
+                        "album_id": album_id,
+                    },
+                    "priority": 10,
+                    "user_id": current_user.id,
+                }
+                for track in tracks
+                if track.get("id") and track.get("status") in ["new", "failed"]
+            ),
+            commit=False,  # Don't commit yet
+        )
 
         # Commit everything once
         db.commit()
@@ -263,7 +257,7 @@ def follow_album(
 @router.delete("/{album_id}/follow", status_code=status.HTTP_200_OK)
 def unfollow_album(
     album_id: str,
-    current_user: User = Depends(require_member_or_admin),
+    current_user: CachedUser = Depends(require_member_or_admin),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     """
@@ -21,7 +21,7 @@ from ..services import tracks as tracks_svc
 from ..services import subscriptions as subs_svc
 from ..jobs.jobqueue import enqueue_job
 from backend.dependencies import require_auth, require_member_or_admin, require_admin
-from backend.models import User
+from backend.services.auth import CachedUser
 
 from ..models import Artist, AlbumSubscription
 
@@ -33,7 +33,7 @@ router = APIRouter(prefix="/api/artists", tags=["Artists"])
 @router.get("/{artist_id}", status_code=status.HTTP_200_OK)
 def get_artist(
     artist_id: str,
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     """
@@ -98,7 +98,7 @@ def get_artist(
 @router.post("/{artist_id}/follow", status_code=status.HTTP_200_OK)
 def follow_artist(
     artist_id: str,
-    current_user: User = Depends(require_member_or_admin),
+    current_user: CachedUser = Depends(require_member_or_admin),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     """
@@ -202,7 +202,7 @@ def follow_artist(
 @router.delete("/{artist_id}/follow", status_code=status.HTTP_200_OK)
 def unfollow_artist(
     artist_id: str,
-    current_user: User = Depends(require_member_or_admin),
+    current_user: CachedUser = Depends(require_member_or_admin),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     """
@@ -30,6 +30,7 @@ from backend.schemas import (
     MessageResponse,
 )
 from backend.models import User
+from backend.services.auth import CachedUser
 from .. import config
 
 logger = logging.getLogger("routers.auth")
@@ -44,7 +45,7 @@ router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 def register(
     data: RegisterRequest,
-    current_user: User = Depends(require_admin),
+    current_user: CachedUser = Depends(require_admin),
     session: Session = Depends(get_session),
 ):
     """
@@ -208,6 +209,7 @@ def change_password(
     current_user.password_hash = new_hash
     session.add(current_user)
     session.commit()
+    auth_svc.invalidate_user_cache(current_user.id)
     
     logger.info(f"Password changed for user {current_user.username}")
     
@@ -223,7 +225,7 @@ def list_users(
     include_inactive: bool = False,
     limit: int = 100,
     offset: int = 0,
-    current_user: User = Depends(require_admin),
+    current_user: CachedUser = Depends(require_admin),
     session: Session = Depends(get_session),
 ):
     """
@@ -243,7 +245,7 @@ def list_users(
 def update_user_role(
     user_id: int,
     role: str,
-    current_user: User = Depends(require_admin),
+    current_user: CachedUser = Depends(require_admin),
     session: Session = Depends(get_session),
 ):
     """
@@ -265,7 +267,7 @@ def update_user_role(
 @router.post("/users/{user_id}/deactivate", response_model=UserResponse)
 def deactivate_user(
     user_id: int,
-    current_user: User = Depends(require_admin),
+    current_user: CachedUser = Depends(require_admin),
     session: Session = Depends(get_session),
 ):
     """
@@ -294,7 +296,7 @@ def deactivate_user(
 @router.post("/users/{user_id}/activate", response_model=UserResponse)
 def activate_user(
     user_id: int,
-    current_user: User = Depends(require_admin),
+    current_user: CachedUser = Depends(require_admin),
     session: Session = Depends(get_session),
 ):
     """
@@ -312,6 +314,7 @@ def activate_user(
     session.add(user)
     session.commit()
     session.refresh(user)
+    auth_svc.invalidate_user_cache(user_id)
     
     logger.info(f"Activated user {user_id}")
     
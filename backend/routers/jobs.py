@@ -20,7 +20,8 @@ from sqlalchemy.orm import Session
 
 from ..db import get_session
 from ..dependencies import require_auth, require_admin
-from ..models import Job, User
+from ..models import Job
+from ..services.auth import CachedUser
 from ..jobs import jobqueue
 from ..schemas.jobs import (
     EnqueueRequest,
@@ -61,7 +62,7 @@ def _job_to_dict(job: Job) -> Dict[str, Any]:
     }
 
 
-def _user_can_access_job(user: User, job: Job) -> bool:
+def _user_can_access_job(user: CachedUser, job: Job) -> bool:
     """Check if user can access this job"""
     # Admins can access all jobs
     if user.role == config.ROLE_ADMINISTRATOR:
@@ -85,7 +86,7 @@ def list_jobs(
         description="Filter by status (queued, reserved, done, failed)"
     ),
     limit: int = Query(100, ge=1, le=1000, description="Max results"),
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     session: Session = Depends(get_session),
 ) -> List[JobOut]:
     """
@@ -125,7 +126,7 @@ def list_jobs(
 @router.post("/enqueue", response_model=EnqueueResponse, status_code=status.HTTP_201_CREATED)
 def enqueue_job_endpoint(
     req: EnqueueRequest,
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     session: Session = Depends(get_session),
 ) -> EnqueueResponse:
     """
@@ -173,7 +174,7 @@ def enqueue_job_endpoint(
 @router.get("/{job_id}", response_model=JobOut)
 def get_job(
     job_id: int,
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     session: Session = Depends(get_session),
 ) -> JobOut:
     """
@@ -215,7 +216,7 @@ def get_job(
 def cancel_job(
     job_id: int,
     body: CancelRequest,
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     session: Session = Depends(get_session),
 ) -> Dict[str, Any]:
     """
@@ -281,7 +282,7 @@ def cancel_job(
 def requeue_job(
     job_id: int,
     body: RequeueRequest,
-    current_user: User = Depends(require_admin),  # Admin only
+    current_user: CachedUser = Depends(require_admin),  # Admin only
     session: Session = Depends(get_session),
 ) -> Dict[str, Any]:
     """
@@ -335,7 +336,7 @@ def requeue_job(
 
 @router.get("/stats/summary")
 def get_job_stats(
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     session: Session = Depends(get_session),
 ) -> Dict[str, Any]:
     """
@@ -14,20 +14,26 @@ import logging
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, case
+from sqlalchemy.orm import Session, contains_eager, joinedload, load_only
+from sqlalchemy import func, and_, or_, case, select
 
 from ..deps import get_db
+from ..db import list_with_count
 from ..models import Artist, Album, Track, AlbumSubscription, ArtistSubscription
 from ..services import subscriptions as subs_svc
+from .. import simple_cache
 
 from backend.dependencies import require_auth, require_member_or_admin, require_admin
-from backend.models import User
+from backend.services.auth import CachedUser
 
 logger = logging.getLogger("routers.library")
 
 router = APIRouter(prefix="/api/library", tags=["Library"])
 
+# Library totals are aggregate scans; serve them from a short-lived cache
+LIBRARY_STATS_TTL = 15
+_LIBRARY_STATS_CACHE_KEY = "library:stats"
+
 def _safe_stats(stats_obj, fields):
     """Safely extract stats, returning 0 for missing fields."""
     if not stats_obj:
@@ -36,7 +42,7 @@ def _safe_stats(stats_obj, fields):
 
 @router.get("/artists", status_code=status.HTTP_200_OK)
 def list_followed_artists(
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     sort_by: str = Query("name", pattern="^(name|followed_at|albums_count)$"),
     order: str = Query("asc", pattern="^(asc|desc)$"),
     db: Session = Depends(get_db),
@@ -52,7 +58,11 @@ def list_followed_artists(
     """
     try:
         # Get all followed artists
-        query = db.query(Artist).filter(Artist.followed == True)
+        query = (
+            db.query(Artist)
+            .options(load_only(Artist.id, Artist.name, Artist.image_local, Artist.created_at))
+            .filter(Artist.followed == True)
+        )
         
         # Apply sorting
         if sort_by == "name":
@@ -122,7 +132,7 @@ def list_followed_artists(
 
 @router.get("/albums", status_code=status.HTTP_200_OK)
 def list_followed_albums(
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     artist_id: Optional[str] = Query(None, description="Filter by artist ID"),
     status_filter: Optional[str] = Query(None, pattern="^(completed|downloading|pending|failed)$", description="Filter by download status"),
     sort_by: str = Query("title", pattern="^(title|year|followed_at|download_progress)$"),
@@ -154,7 +164,11 @@ def list_followed_albums(
             return {"albums": [], "total": 0}
         
         # Get albums
-        albums_query = db.query(Album).filter(Album.id.in_(album_ids))
+        albums_query = (
+            db.query(Album)
+            .options(joinedload(Album.artist))
+            .filter(Album.id.in_(album_ids))
+        )
         albums = albums_query.all()
         
         result = []
@@ -162,10 +176,8 @@ def list_followed_albums(
             # Get subscription for this album
             subscription = next((s for s in subscriptions if s.album_id == album.id), None)
             
-            # Get artist info
-            artist = None
-            if album.artist_id:
-                artist = db.get(Artist, album.artist_id)
+            # Artist is eager-loaded with the album
+            artist = album.artist
             
             # Get tracks stats
             tracks_query = (
@@ -238,7 +250,7 @@ def list_followed_albums(
 
 @router.get("/tracks", status_code=status.HTTP_200_OK)
 def list_tracks(
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     artist_id: Optional[str] = Query(None, description="Filter by artist ID"),
     album_id: Optional[str] = Query(None, description="Filter by album ID"),
     status_filter: Optional[str] = Query(None, pattern="^(done|failed|downloading|new)$", description="Filter by track status"),
@@ -262,36 +274,45 @@ def list_tracks(
     """
     try:
         # Build query
-        query = db.query(Track).join(Album, Track.album_id == Album.id)
+        stmt = (
+            select(Track)
+            .join(Album, Track.album_id == Album.id)
+            .options(
+                # Only the columns the response exposes; skips JSON thumbnails
+                load_only(
+                    Track.id, Track.title, Track.artists, Track.album_id, Track.duration,
+                    Track.status, Track.file_path, Track.has_lyrics, Track.lyrics_local,
+                    Track.created_at,
+                ),
+                # Album is already inner-joined for filtering/sorting; reuse that join
+                contains_eager(Track.album)
+                .load_only(Album.id, Album.title, Album.image_local, Album.artist_id)
+                .joinedload(Album.artist)
+                .load_only(Artist.id, Artist.name),
+            )
+        )
         
         # Apply filters
         if album_id:
-            query = query.filter(Track.album_id == album_id)
+            stmt = stmt.where(Track.album_id == album_id)
         elif artist_id:
-            query = query.filter(Album.artist_id == artist_id)
+            stmt = stmt.where(Album.artist_id == artist_id)
         
         if status_filter:
-            query = query.filter(Track.status == status_filter)
+            stmt = stmt.where(Track.status == status_filter)
         
         if has_lyrics is not None:
-            query = query.filter(Track.has_lyrics == has_lyrics)
-        
-        # Get total count
-        total = query.count()
+            stmt = stmt.where(Track.has_lyrics == has_lyrics)
         
-        # Apply pagination and ordering
-        query = query.order_by(Album.title.asc(), Track.id.asc())
-        query = query.limit(limit).offset(offset)
-        
-        tracks = query.all()
+        # Fetch page and total count in a single query
+        stmt = stmt.order_by(Album.title.asc(), Track.id.asc())
+        tracks, total = list_with_count(db, stmt, limit=limit, offset=offset)
         
         result = []
         for track in tracks:
-            # Get album and artist info
-            album = db.get(Album, track.album_id) if track.album_id else None
-            artist = None
-            if album and album.artist_id:
-                artist = db.get(Artist, album.artist_id)
+            # Album and artist are eager-loaded with the track
+            album = track.album
+            artist = album.artist if album else None
             
             result.append({
                 "id": track.id,
@@ -328,44 +349,57 @@ def list_tracks(
 
 @router.get("/stats", status_code=status.HTTP_200_OK)
 def get_library_stats(
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Get overall library statistics.
     """
     try:
+        cached = simple_cache.get(_LIBRARY_STATS_CACHE_KEY)
+        if cached is not None:
+            return cached
+        
         # Artists stats
         artists_total = db.query(func.count(Artist.id)).filter(Artist.followed == True).scalar() or 0
         
-        # Albums stats
-        albums_total = db.query(func.count(AlbumSubscription.id)).scalar() or 0
-        albums_completed = db.query(func.count(AlbumSubscription.id)).filter(
-            AlbumSubscription.download_status == "completed"
-        ).scalar() or 0
-        albums_downloading = db.query(func.count(AlbumSubscription.id)).filter(
-            AlbumSubscription.download_status == "downloading"
-        ).scalar() or 0
-        albums_pending = db.query(func.count(AlbumSubscription.id)).filter(
-            AlbumSubscription.download_status == "pending"
-        ).scalar() or 0
-        albums_failed = db.query(func.count(AlbumSubscription.id)).filter(
-            AlbumSubscription.download_status == "failed"
-        ).scalar() or 0
+        # Albums stats (single pass over subscriptions)
+        albums_row = db.query(
+            func.count(AlbumSubscription.id).label("total"),
+            func.sum(case((AlbumSubscription.download_status == "completed", 1), else_=0)).label("completed"),
+            func.sum(case((AlbumSubscription.download_status == "downloading", 1), else_=0)).label("downloading"),
+            func.sum(case((AlbumSubscription.download_status == "pending", 1), else_=0)).label("pending"),
+            func.sum(case((AlbumSubscription.download_status == "failed", 1), else_=0)).label("failed"),
+        ).first()
+        albums = _safe_stats(albums_row, ['total', 'completed', 'downloading', 'pending', 'failed'])
+        albums_total = albums['total']
+        albums_completed = albums['completed']
+        albums_downloading = albums['downloading']
+        albums_pending = albums['pending']
+        albums_failed = albums['failed']
         
-        # Tracks stats
-        tracks_total = db.query(func.count(Track.id)).scalar() or 0
-        tracks_downloaded = db.query(func.count(Track.id)).filter(Track.status == "done").scalar() or 0
-        tracks_downloading = db.query(func.count(Track.id)).filter(Track.status == "downloading").scalar() or 0
-        tracks_failed = db.query(func.count(Track.id)).filter(Track.status == "failed").scalar() or 0
-        tracks_pending = db.query(func.count(Track.id)).filter(Track.status == "new").scalar() or 0
-        tracks_with_lyrics = db.query(func.count(Track.id)).filter(Track.has_lyrics == True).scalar() or 0
+        # Tracks stats (single pass over tracks)
+        tracks_row = db.query(
+            func.count(Track.id).label("total"),
+            func.sum(case((Track.status == "done", 1), else_=0)).label("downloaded"),
+            func.sum(case((Track.status == "downloading", 1), else_=0)).label("downloading"),
+            func.sum(case((Track.status == "failed", 1), else_=0)).label("failed"),
+            func.sum(case((Track.status == "new", 1), else_=0)).label("pending"),
+            func.sum(case((Track.has_lyrics == True, 1), else_=0)).label("with_lyrics"),
+        ).first()
+        tracks = _safe_stats(tracks_row, ['total', 'downloaded', 'downloading', 'failed', 'pending', 'with_lyrics'])
+        tracks_total = tracks['total']
+        tracks_downloaded = tracks['downloaded']
+        tracks_downloading = tracks['downloading']
+        tracks_failed = tracks['failed']
+        tracks_pending = tracks['pending']
+        tracks_with_lyrics = tracks['with_lyrics']
         
         # Calculate storage
         estimated_size_mb = int(tracks_downloaded) * 3
         estimated_size_gb = round(estimated_size_mb / 1024, 2)
         
-        return {
+        result = {
             "artists": {
                 "total": int(artists_total),
             },
@@ -389,6 +423,8 @@ def get_library_stats(
                 "estimated_gb": estimated_size_gb,
             }
         }
+        simple_cache.set(_LIBRARY_STATS_CACHE_KEY, result, ttl=LIBRARY_STATS_TTL)
+        return result
     
     except Exception as e:
         logger.exception("get_library_stats failed")
@@ -398,7 +434,7 @@ def get_library_stats(
 @router.get("/albums/{album_id}/progress", status_code=status.HTTP_200_OK)
 def get_album_download_progress(
     album_id: str,
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     """
@@ -24,7 +24,7 @@ from ..deps import get_db
 
 from ..config import THUMBNAIL_CACHE_DIR, THUMBNAIL_CACHE_TTL, MUSIC_DIR
 from ..dependencies import require_auth, require_admin
-from ..models import User
+from ..services.auth import CachedUser
 
 logger = logging.getLogger("routers.media")
 
@@ -112,7 +112,7 @@ def get_local_image(full_path: str):
 
 @router.get("/thumbnail/debug")
 async def debug_info(
-    current_user: User = Depends(require_admin),
+    current_user: CachedUser = Depends(require_admin),
 ) -> JSONResponse:
     """Cache status debug endpoint (admin only)."""
     return JSONResponse({
@@ -234,7 +234,7 @@ async def get_thumbnail(
 
 @router.delete("/cache/clear")
 async def clear_thumbnail_cache(
-    current_user: User = Depends(require_admin),
+    current_user: CachedUser = Depends(require_admin),
 ) -> dict:
     """Clear thumbnail cache (admin only)."""
     try:
@@ -11,7 +11,7 @@ from sqlalchemy.orm import Session
 
 from ..db import get_session
 from ..dependencies import require_auth
-from ..models import User
+from ..services.auth import CachedUser
 from ..ytm_service import adapter
 
 router = APIRouter(prefix="/api/playlists", tags=["Playlists"])
@@ -20,7 +20,7 @@ router = APIRouter(prefix="/api/playlists", tags=["Playlists"])
 @router.get("/{playlist_id}")
 def get_playlist(
     playlist_id: str,
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
 ):
     """
     Get playlist details with track/album info.
@@ -34,7 +34,7 @@ def get_playlist(
 @router.get("/{playlist_id}/albums")
 def extract_albums_from_playlist(
     playlist_id: str,
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     session: Session = Depends(get_session),
 ):
     """
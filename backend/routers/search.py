@@ -19,7 +19,7 @@ from fastapi import APIRouter, HTTPException, Query, Depends
 from ..services import search as search_service
 
 from backend.dependencies import require_auth, require_member_or_admin, require_admin
-from backend.models import User
+from backend.services.auth import CachedUser
 
 logger = logging.getLogger("routers.search")
 
@@ -28,7 +28,7 @@ router = APIRouter(prefix="/api/search", tags=["Search"])
 
 @router.get("", response_model=Dict[str, List[Dict[str, Any]]])
 def search(
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     q: str = Query(..., min_length=1, description="Query string to search for"),
     limit: int = Query(10, ge=1, le=50, description="Max results per type"),
 ) -> Dict[str, List[Dict[str, Any]]]:
@@ -60,7 +60,7 @@ def search(
 
 @router.get("/artists", response_model=List[Dict[str, Any]])
 def search_artists_only(
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     q: str = Query(..., min_length=1, description="Query string"),
     limit: int = Query(10, ge=1, le=50, description="Max results"),
 ) -> List[Dict[str, Any]]:
@@ -87,7 +87,7 @@ def search_artists_only(
 
 @router.get("/albums", response_model=List[Dict[str, Any]])
 def search_albums_only(
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     q: str = Query(..., min_length=1, description="Query string"),
     limit: int = Query(10, ge=1, le=50, description="Max results"),
 ) -> List[Dict[str, Any]]:
@@ -114,7 +114,7 @@ def search_albums_only(
 
 @router.get("/songs", response_model=List[Dict[str, Any]])
 def search_songs_only(
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     q: str = Query(..., min_length=1, description="Query string"),
     limit: int = Query(10, ge=1, le=50, description="Max results"),
 ) -> List[Dict[str, Any]]:
@@ -141,7 +141,7 @@ def search_songs_only(
 
 @router.get("/charts", response_model=Dict[str, Any])
 def get_charts(
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     country: Optional[str] = Query("US", description="Country code (e.g., 'US', 'FR')"),
 ) -> Dict[str, Any]:
     """
@@ -169,7 +169,7 @@ def get_charts(
 
 @router.delete("/cache", status_code=204)
 def clear_search_cache(
-    current_user: User = Depends(require_admin),
+    current_user: CachedUser = Depends(require_admin),
 ) -> None:
     """
     Clear the search cache.
@@ -22,8 +22,8 @@ from ..models import Track
 from ..jobs import jobqueue
 from ..services import tracks as tracks_svc
 
-from backend.dependencies import require_auth, require_member_or_admin, require_admin
-from backend.models import User
+from backend.dependencies import require_auth, require_member_or_admin, require_admin, get_track_by_path
+from backend.services.auth import CachedUser
 
 logger = logging.getLogger("routers.tracks")
 
@@ -56,8 +56,8 @@ def _track_to_dict(t: Track) -> Dict[str, Any]:
 @router.get("/{track_id}", status_code=status.HTTP_200_OK)
 def get_track(
     track_id: str,
-    current_user: User = Depends(require_auth),
-    db: Session = Depends(get_db)
+    current_user: CachedUser = Depends(require_auth),
+    t: Optional[Track] = Depends(get_track_by_path),
 ) -> Dict[str, Any]:
     """
     Return track info from DB (light representation).
@@ -65,7 +65,6 @@ def get_track(
     if not track_id:
         raise HTTPException(status_code=400, detail="track_id required")
     try:
-        t = tracks_svc.get_track_from_db(db, str(track_id))
         if not t:
             raise HTTPException(status_code=404, detail="track not found")
         return {"ok": True, "track": _track_to_dict(t)}
@@ -79,7 +78,7 @@ def get_track(
 @router.get("/album/{album_id}", status_code=status.HTTP_200_OK)
 def list_tracks_for_album(
     album_id: str,
-    current_user: User = Depends(require_auth),
+    current_user: CachedUser = Depends(require_auth),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     """
@@ -108,7 +107,7 @@ class DownloadRequestModel(dict):
 def download_track(
     track_id: str,
     body: Dict[str, Any] = Body(default_factory=dict),
-    current_user: User = Depends(require_member_or_admin),
+    current_user: CachedUser = Depends(require_member_or_admin),
     db: Session = Depends(get_db),
 ) -> Dict[str, Any]:
     """
@@ -134,7 +133,7 @@ def download_track(
 def ensure_lyrics(
     track_id: str,
     body: Dict[str, Any] = Body(default_factory=dict),
-    current_user: User = Depends(require_member_or_admin),
+    current_user: CachedUser = Depends(require_member_or_admin),
     db: Session = Depends(get_db),
 ) -> Dict[str, Any]:
     """
@@ -165,8 +164,9 @@ def ensure_lyrics(
 def mark_done(
     track_id: str,
     body: Optional[Dict[str, Any]] = Body(default_factory=dict),
-    current_user: User = Depends(require_member_or_admin),
+    current_user: CachedUser = Depends(require_member_or_admin),
     db: Session = Depends(get_db),
+    existing: Optional[Track] = Depends(get_track_by_path),
 ) -> Dict[str, Any]:
     """
     Mark a track as done and optionally provide file_path.
@@ -175,7 +175,10 @@ def mark_done(
     if not track_id:
         raise HTTPException(status_code=400, detail="track_id required")
     try:
+        if existing is None:
+            raise HTTPException(status_code=404, detail="track not found")
         file_path = body.get("file_path") if isinstance(body, dict) else None
+        # existing is already in db's identity map, so this does not re-SELECT
         t = tracks_svc.update_track_status(session=db, track_id=str(track_id), file_path=file_path, status="done")
         if t is None:
             raise HTTPException(status_code=404, detail="track not found")
@@ -197,8 +200,9 @@ def mark_done(
 def mark_failed(
     track_id: str,
     body: Optional[Dict[str, Any]] = Body(default_factory=dict),
-    current_user: User = Depends(require_member_or_admin),
+    current_user: CachedUser = Depends(require_member_or_admin),
     db: Session = Depends(get_db),
+    existing: Optional[Track] = Depends(get_track_by_path),
 ) -> Dict[str, Any]:
     """
     Mark a track as failed and optionally include an error message.
@@ -207,6 +211,8 @@ def mark_failed(
     if not track_id:
         raise HTTPException(status_code=400, detail="track_id required")
     try:
+        if existing is None:
+            raise HTTPException(status_code=404, detail="track not found")
         err_msg = body.get("error") if isinstance(body, dict) else None
         t = tracks_svc.update_track_status(session=db, track_id=str(track_id), status="failed")
         if t is None:
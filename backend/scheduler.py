@@ -17,7 +17,7 @@ from typing import Optional
 from sqlalchemy.orm import Session
 
 from .db import SessionLocal
-from .jobs.jobqueue import enqueue_job, cleanup_old_jobs
+from .jobs.jobqueue import enqueue_jobs_bulk, cleanup_old_jobs
 from .services import subscriptions as subs_svc, auth as auth_svc
 from . import settings as settings_module
 
@@ -240,31 +240,25 @@ class Scheduler:
 
             logger.info(f"Found {len(artists)} monitored artist(s) needing sync")
 
-            enqueued_count = 0
-            for artist in artists:
-                try:
-                    artist_id = getattr(artist, "id", None)
-                    if not artist_id:
-                        continue
-
-                    # Enqueue sync_artist job
-                    payload = {"artist_id": str(artist_id)}  # ← Fixed: was "channel_id"
-                    
-                    try:
-                        job = enqueue_job(
-                            session=session,
-                            job_type="sync_artist",
-                            payload=payload,
-                            priority=25,  # Higher priority for syncs
-                        )
-                        logger.info(f"Enqueued sync_artist job {job.id} for artist {artist_id}")
-                        enqueued_count += 1
-                    except Exception:
-                        logger.exception(f"Failed to enqueue sync job for artist {artist_id}")
-                        continue
-
-                except Exception:
-                    logger.exception(f"Error processing monitored artist {artist}")
+            # One sync_artist job per artist, inserted and committed together
+            artist_ids = [str(a.id) for a in artists if getattr(a, "id", None)]
+            try:
+                enqueued_count = enqueue_jobs_bulk(
+                    session,
+                    (
+                        {
+                            "type": "sync_artist",
+                            "payload": {"artist_id": artist_id},  # ← Fixed: was "channel_id"
+                            "priority": 25,  # Higher priority for syncs
+                        }
+                        for artist_id in artist_ids
+                    ),
+                )
+                logger.info(f"Enqueued sync_artist jobs for artists: {', '.join(artist_ids)}")
+            except Exception:
+                logger.exception("Failed to enqueue sync jobs for monitored artists")
+                session.rollback()
+                enqueued_count = 0
 
             logger.info(f"Processed {len(artists)} monitored artists (enqueued {enqueued_count} jobs)")
 
@@ -322,7 +316,7 @@ class Scheduler:
         try:
             session = SessionLocal()
             
-            deleted = auth_svc.cleanup_expired_tokens(session)
+            deleted = auth_svc.cleanup_expired_tokens_bulk(session)
             
             if deleted > 0:
                 logger.info(f"Cleaned up {deleted} expired refresh tokens")
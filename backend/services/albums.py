@@ -4,10 +4,11 @@ Album entity CRUD operations and album-specific business logic.
 """
 from __future__ import annotations
 import logging
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
 from pathlib import Path
 
 import requests
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
 
 from ..ytm_service import adapter as ytm_adapter
@@ -125,12 +126,12 @@ def get_album_from_db(
         }
         
         if include_tracks:
-            tracks = (
-                session.query(Track)
-                .filter(Track.album_id == album_id)
+            stmt = lambda_stmt(
+                lambda: select(Track)
+                .where(Track.album_id == album_id)
                 .order_by(Track.id.asc())
-                .all()
             )
+            tracks = session.execute(stmt).scalars().all()
             result["tracks"] = [track.to_dict() for track in tracks]
         
         return result
@@ -154,13 +155,13 @@ def list_albums_for_artist_from_db(
     
     result: List[Dict[str, Any]] = []
     try:
-        query = (
-            session.query(Album)
-            .filter(Album.artist_id == artist_id)
+        stmt = lambda_stmt(
+            lambda: select(Album)
+            .where(Album.artist_id == artist_id)
             .order_by(Album.year.desc().nullslast(), Album.title.asc())
         )
         
-        for album in query.all():
+        for album in session.execute(stmt).scalars():
             album_type = album.type or "Album"
             
             result.append({
@@ -177,6 +178,17 @@ def list_albums_for_artist_from_db(
     return result
 
 
+def list_album_ids_for_artist(session: Session, artist_id: str) -> Set[str]:
+    """
+    Return the ids of the artist's albums in the DB (id column only,
+    served from the artist_id index; no Album instances are built).
+    """
+    from ..models import Album
+    
+    stmt = select(Album.id).where(Album.artist_id == artist_id)
+    return set(session.execute(stmt).scalars())
+
+
 # ============================================================================
 # ALBUM COVER MANAGEMENT
 # ============================================================================
@@ -15,17 +15,26 @@ Functions:
 - get_user_by_id() - Fetch user by ID
 - refresh_access_token() - Exchange refresh token for new access token
 - revoke_refresh_token() - Invalidate refresh token (logout)
+- cleanup_expired_tokens_bulk() - Delete expired refresh tokens in batches
 - update_last_login() - Update user's last_login_at
+- get_cached_user() - Fetch a short-lived user snapshot for auth checks
+- invalidate_user_cache() - Drop a user's cached snapshot
 """
 from __future__ import annotations
+import base64
+import hashlib
+import hmac
+import json
 import logging
 import secrets
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, NamedTuple, Tuple
 
 import bcrypt
 import jwt
-from sqlalchemy import select
+from sqlalchemy import delete, lambda_stmt, select
 from sqlalchemy.orm import Session
 
 from ..models import User, RefreshToken
@@ -87,10 +96,68 @@ def create_access_token(user_id: int, username: str, role: str) -> str:
         "iat": now,
     }
     
-    token = jwt.encode(payload, config.JWT_SECRET_KEY, algorithm=config.JWT_ALGORITHM)
+    token = jwt.encode(payload, config.JWT_SECRET_BYTES, algorithm=config.JWT_ALGORITHM)
     return token
 
 
+# Pre-keyed HMAC-SHA256 state; each verify copies it and only hashes the message
+_JWT_HMAC_PROTO = hmac.new(config.JWT_SECRET_BYTES, digestmod=hashlib.sha256)
+
+
+def _b64url_decode(segment: bytes) -> bytes:
+    return base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+
+
+def _decode_hs256(token: str) -> Dict[str, Any]:
+    """
+    Verify an HS256 JWT against the cached HMAC state and return its claims.
+    Raises the same jwt.* exceptions as jwt.decode for bad/expired tokens.
+    """
+    try:
+        signing_input, _, sig_b64 = token.encode("ascii").rpartition(b".")
+        header_b64, _, payload_b64 = signing_input.partition(b".")
+        if not header_b64 or not payload_b64 or b"." in payload_b64:
+            raise jwt.DecodeError("Not enough or too many segments")
+        header = json.loads(_b64url_decode(header_b64))
+        signature = _b64url_decode(sig_b64)
+    except (ValueError, UnicodeError) as e:
+        raise jwt.DecodeError(f"Invalid token encoding: {e}") from e
+    
+    if not isinstance(header, dict) or header.get("alg") != config.JWT_ALGORITHM:
+        raise jwt.InvalidAlgorithmError("The specified alg value is not allowed")
+    
+    mac = _JWT_HMAC_PROTO.copy()
+    mac.update(signing_input)
+    if not hmac.compare_digest(mac.digest(), signature):
+        raise jwt.InvalidSignatureError("Signature verification failed")
+    
+    try:
+        payload = json.loads(_b64url_decode(payload_b64))
+    except ValueError as e:
+        raise jwt.DecodeError(f"Invalid payload: {e}") from e
+    if not isinstance(payload, dict):
+        raise jwt.DecodeError("Invalid payload: not a JSON object")
+    
+    now = time.time()
+    exp = payload.get("exp")
+    if exp is not None:
+        if not isinstance(exp, (int, float)):
+            raise jwt.DecodeError("Expiration Time claim (exp) must be a number")
+        if exp <= now:
+            raise jwt.ExpiredSignatureError("Signature has expired")
+    nbf = payload.get("nbf")
+    if nbf is not None and (not isinstance(nbf, (int, float)) or nbf > now):
+        raise jwt.ImmatureSignatureError("The token is not yet valid (nbf)")
+    iat = payload.get("iat")
+    if iat is not None:
+        if not isinstance(iat, (int, float)):
+            raise jwt.InvalidIssuedAtError("Issued At claim (iat) must be an integer.")
+        if iat > now:
+            raise jwt.ImmatureSignatureError("The token is not yet valid (iat)")
+    
+    return payload
+
+
 def verify_access_token(token: str) -> Optional[Dict[str, Any]]:
     """
     Decode and verify JWT access token.
@@ -100,11 +167,7 @@ def verify_access_token(token: str) -> Optional[Dict[str, Any]]:
         None if invalid/expired
     """
     try:
-        payload = jwt.decode(
-            token,
-            config.JWT_SECRET_KEY,
-            algorithms=[config.JWT_ALGORITHM]
-        )
+        payload = _decode_hs256(token)
         
         return {
             "user_id": int(payload["sub"]),
@@ -197,30 +260,50 @@ def revoke_refresh_token(session: Session, token: str) -> bool:
     return True
 
 
-def cleanup_expired_tokens(session: Session) -> int:
+def cleanup_expired_tokens_bulk(session: Session, batch_size: int = 1000) -> int:
     """
-    Delete expired refresh tokens from database.
+    Delete expired refresh tokens from database with set-based DELETEs.
     Call periodically to prevent bloat.
-    
+
+    Rows are removed in batches of `batch_size` (DELETE ... WHERE id IN
+    (SELECT id ... LIMIT n)), committing after each batch so the writer
+    lock is released between batches.
+
     Returns:
         Number of tokens deleted
     """
     now = now_utc()
-    stmt = select(RefreshToken).where(RefreshToken.expires_at < now)
-    expired_tokens = session.execute(stmt).scalars().all()
-    
-    count = len(expired_tokens)
-    for token in expired_tokens:
-        session.delete(token)
-    
-    session.commit()
-    
+    count = 0
+
+    while True:
+        expired_ids = (
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at < now)
+            .limit(batch_size)
+        )
+        stmt = (
+            delete(RefreshToken)
+            .where(RefreshToken.id.in_(expired_ids))
+            .execution_options(synchronize_session=False)
+        )
+        result = session.execute(stmt)
+        session.commit()
+
+        deleted = result.rowcount or 0
+        count += deleted
+        if deleted < batch_size:
+            break
+
     if count > 0:
         logger.info(f"Cleaned up {count} expired refresh tokens")
-    
+
     return count
 
 
+# alias kept for compatibility
+cleanup_expired_tokens = cleanup_expired_tokens_bulk
+
+
 # ============================================================================
 # USER MANAGEMENT
 # ============================================================================
@@ -248,10 +331,15 @@ def create_user(
     email: str,
     password: str,
     role: str = config.ROLE_MEMBER,
+    commit: bool = True,
 ) -> User:
     """
     Create a new user.
     
+    Args:
+        commit: Whether to commit immediately (default True); when False the
+            row is only flushed so the caller can batch it into its transaction.
+    
     Raises:
         ValueError if username/email already exists or invalid role
     """
@@ -259,7 +347,7 @@ def create_user(
     if not username or not email or not password:
         raise ValueError("Username, email, and password are required")
     
-    if role not in config.VALID_ROLES:
+    if role not in config.VALID_ROLES_SET:
         raise ValueError(f"Invalid role: {role}")
     
     # Check for existing username
@@ -284,8 +372,11 @@ def create_user(
     )
     
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    if commit:
+        session.commit()
+        session.refresh(user)
+    else:
+        session.flush()
     
     logger.info(f"Created user: {username} (role={role})")
     return user
@@ -333,7 +424,7 @@ def update_user_role(session: Session, user_id: int, new_role: str) -> User:
     Raises:
         ValueError if user not found or invalid role
     """
-    if new_role not in config.VALID_ROLES:
+    if new_role not in config.VALID_ROLES_SET:
         raise ValueError(f"Invalid role: {new_role}")
     
     user = session.get(User, user_id)
@@ -344,6 +435,7 @@ def update_user_role(session: Session, user_id: int, new_role: str) -> User:
     session.add(user)
     session.commit()
     session.refresh(user)
+    invalidate_user_cache(user_id)
     
     logger.info(f"Updated user {user_id} role to {new_role}")
     return user
@@ -370,6 +462,7 @@ def deactivate_user(session: Session, user_id: int) -> User:
     
     session.commit()
     session.refresh(user)
+    invalidate_user_cache(user_id)
     
     logger.info(f"Deactivated user {user_id}")
     return user
@@ -390,21 +483,80 @@ def list_users(
         limit: Max results
         offset: Pagination offset
     """
-    stmt = select(User)
-    
-    if not include_inactive:
-        stmt = stmt.where(User.is_active == True)
+    # Separate lambda statements per branch so each one caches its own SQL
+    if include_inactive:
+        stmt = lambda_stmt(lambda: select(User))
+    else:
+        stmt = lambda_stmt(lambda: select(User).where(User.is_active == True))
     
-    stmt = stmt.order_by(User.created_at.desc()).limit(limit).offset(offset)
+    stmt += lambda s: s.order_by(User.created_at.desc()).limit(limit).offset(offset)
     
-    return list(session.execute(stmt).scalars().all())
+    return session.execute(stmt).scalars().all()
+
+
+# ============================================================================
+# AUTHENTICATED USER CACHE
+# ============================================================================
+
+class CachedUser(NamedTuple):
+    """Detached snapshot of the User fields read by auth dependencies."""
+    id: int
+    username: str
+    role: str
+    is_active: bool
+
+
+USER_CACHE_TTL = 60  # seconds
+USER_CACHE_MAXSIZE = 4096
+
+_user_cache: Dict[int, Tuple[float, CachedUser]] = {}
+_user_cache_lock = threading.Lock()
+
+
+def get_cached_user(session: Session, user_id: int) -> Optional[CachedUser]:
+    """
+    Return a CachedUser snapshot for user_id, hitting the DB only on a miss.
+
+    Snapshots live for USER_CACHE_TTL seconds; call invalidate_user_cache()
+    whenever role, active flag or credentials change.
+    """
+    now = time.monotonic()
+    with _user_cache_lock:
+        entry = _user_cache.get(user_id)
+        if entry and entry[0] > now:
+            return entry[1]
+
+    user = get_user_by_id(session, user_id)
+    if not user:
+        return None
+
+    snapshot = CachedUser(
+        id=user.id,
+        username=user.username,
+        role=user.role,
+        is_active=bool(user.is_active),
+    )
+    with _user_cache_lock:
+        if len(_user_cache) >= USER_CACHE_MAXSIZE:
+            _user_cache.clear()
+        _user_cache[user_id] = (now + USER_CACHE_TTL, snapshot)
+    return snapshot
+
+
+def invalidate_user_cache(user_id: Optional[int] = None) -> None:
+    """Drop the cached snapshot for user_id (or the whole cache if None)."""
+    with _user_cache_lock:
+        if user_id is None:
+            _user_cache.clear()
+        else:
+            _user_cache.pop(user_id, None)
 
 
 # ============================================================================
 # FIRST-TIME SETUP
 # ============================================================================
 
-def ensure_first_admin(session: Session) -> None:
+def ensure_first_admin(session: Session, commit: bool = True) -> None:
     """
     Create first admin user if no users exist.
     Called on app startup.
@@ -425,6 +577,7 @@ def ensure_first_admin(session: Session) -> None:
             email=config.FIRST_ADMIN_EMAIL,
             password=config.FIRST_ADMIN_PASSWORD,
             role=config.ROLE_ADMINISTRATOR,
+            commit=commit,
         )
         logger.info(f"Created first admin user: {admin.username}")
         logger.warning(
@@ -5,7 +5,7 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import case, func, select, update
 
 from . import normalizers as N
 
@@ -132,7 +132,7 @@ def get_album_subscription(session: Session, album_id: str) -> Optional[AlbumSub
 def list_active_artist_subscriptions(session: Session) -> List[ArtistSubscription]:
     """Get all enabled artist subscriptions."""
     stmt = select(ArtistSubscription).where(ArtistSubscription.enabled == True)
-    return list(session.execute(stmt).scalars().all())
+    return session.execute(stmt).scalars().all()
 
 
 def list_pending_album_downloads(session: Session) -> List[AlbumSubscription]:
@@ -140,7 +140,7 @@ def list_pending_album_downloads(session: Session) -> List[AlbumSubscription]:
     stmt = select(AlbumSubscription).where(
         AlbumSubscription.download_status.in_(["pending", "failed"])
     )
-    return list(session.execute(stmt).scalars().all())
+    return session.execute(stmt).scalars().all()
 
 
 def get_due_album_subscriptions(session: Session) -> List[AlbumSubscription]:
@@ -171,7 +171,7 @@ def get_monitored_artists_needing_sync(
     
     # Get all followed artists
     stmt = select(Artist).where(Artist.followed == True)
-    followed_artists = list(session.execute(stmt).scalars().all())
+    followed_artists = session.execute(stmt).scalars().all()
     
     due_artists = []
     for artist in followed_artists:
@@ -240,34 +240,27 @@ def check_and_update_album_download_status(
     """
     from ..models import Track
     
-    # Get subscription
-    subscription = get_album_subscription(session, album_id)
-    if not subscription:
-        return "idle"
+    # Count track statuses in SQL (index-only over ix_track_album_status)
+    def _n(status: str):
+        return func.coalesce(func.sum(case((Track.status == status, 1), else_=0)), 0)
     
-    # Get all tracks for album
-    tracks = session.query(Track).filter(Track.album_id == album_id).all()
+    counts = session.execute(
+        select(
+            func.count(),
+            _n("done"),
+            _n("downloading"),
+            _n("failed"),
+            func.coalesce(func.sum(case(((Track.status == None) | (Track.status == "new"), 1), else_=0)), 0),
+        ).where(Track.album_id == album_id)
+    ).one()
+    total, done_count, downloading_count, failed_count, new_count = counts
     
-    if not tracks:
+    values: Dict[str, Any] = {}
+    if not total:
         # No tracks yet
-        subscription.download_status = "pending"
-        session.add(subscription)
-        return "pending"
-    
-    # Count track statuses
-    status_counts = {}
-    for track in tracks:
-        status = track.status or "new"
-        status_counts[status] = status_counts.get(status, 0) + 1
-    
-    total = len(tracks)
-    done_count = status_counts.get("done", 0)
-    downloading_count = status_counts.get("downloading", 0)
-    failed_count = status_counts.get("failed", 0)
-    new_count = status_counts.get("new", 0)
-    
+        new_status = "pending"
     # Determine overall status
-    if done_count == total:
+    elif done_count == total:
         new_status = "completed"
     elif done_count > 0 and (new_count + failed_count) == 0:
         new_status = "completed"  # Some might be in other states but main ones are done
@@ -279,11 +272,18 @@ def check_and_update_album_download_status(
         new_status = "pending"
     else:
         new_status = "completed"
+    if total:
+        values["last_synced_at"] = now_utc()
     
-    # Update subscription
-    subscription.download_status = new_status
-    subscription.last_synced_at = now_utc()
-    session.add(subscription)
+    # Update subscription in place; no row means no subscription
+    result = session.execute(
+        update(AlbumSubscription)
+        .where(AlbumSubscription.album_id == album_id)
+        .values(download_status=new_status, **values)
+        .execution_options(synchronize_session="fetch")
+    )
+    if not result.rowcount:
+        return "idle"
     
     logger.debug(
         f"Album {album_id} download status: {new_status} "
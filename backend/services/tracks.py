@@ -6,6 +6,7 @@ from __future__ import annotations
 import logging
 from typing import Any, Dict, List, Optional
 
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
 
 from ..models import Track
@@ -109,13 +110,13 @@ def list_tracks_for_album_from_db(
     """
     result: List[Dict[str, Any]] = []
     try:
-        query = (
-            session.query(Track)
-            .filter(Track.album_id == album_id)
+        stmt = lambda_stmt(
+            lambda: select(Track)
+            .where(Track.album_id == album_id)
             .order_by(Track.id.asc())  # TODO: Add track_number field and order by that
         )
         
-        for track in query.all():
+        for track in session.execute(stmt).scalars():
             result.append(track.to_dict())
     except Exception as e:
         logger.exception(f"list_tracks_for_album_from_db failed for {album_id}: {e}")
@@ -68,7 +68,7 @@ DEFAULT_SETTINGS = {
 }
 
 
-def ensure_defaults(session: Session) -> None:
+def ensure_defaults(session: Session, commit: bool = True) -> None:
     """
     Ensure all default settings exist in database.
     Call on startup.
@@ -86,7 +86,8 @@ def ensure_defaults(session: Session) -> None:
             session.add(setting)
             logger.debug(f"Created default setting: {key} = {config['value']}")
     
-    session.commit()
+    if commit:
+        session.commit()
 
 
 def get_setting(session: Session, key: str, default: Any = None) -> Any: